@@ -0,0 +1,74 @@
+"""Measures how many audit log events per second can be hashed for checkpoints with the old MD5
+hash and with the current `hash_event`, with each installed JSON backend.
+
+Usage:
+    python benchmarks/bench_hash_event.py [--events N]
+"""
+import argparse
+from datetime import datetime
+from datetime import timedelta
+from time import perf_counter
+
+import code42cli.json_backend as json_backend
+from code42cli.util import hash_event
+from code42cli.util import hash_event_v1
+
+
+def _create_event(index, timestamp):
+    # Some names have non-ASCII characters, which have to be escaped when serializing.
+    name = "tëster" if index % 20 == 0 else "tester"
+    return {
+        "type$": "audit_log::search_issued/1",
+        "actorId": f"{index % 500:018d}",
+        "actorName": f"{name}{index % 500}@example.com",
+        "actorAgent": "py42 1.11.1 python 3.9.1 code42cli/1.6.1 (Code42 Python CLI)",
+        "actorIpAddress": "203.0.113.10",
+        "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        "actorType": "USER",
+        "query": {
+            "groups": [
+                {
+                    "filterClause": "AND",
+                    "filters": [
+                        {
+                            "operator": "IS",
+                            "term": "md5Checksum",
+                            "value": f"{index:032x}",
+                        }
+                    ],
+                }
+            ],
+            "pgNum": 1,
+            "pgSize": 10000,
+        },
+    }
+
+
+def _run(hash_func, events):
+    start = perf_counter()
+    for event in events:
+        hash_func(event)
+    return perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200000)
+    args = parser.parse_args()
+
+    start = datetime(2020, 1, 1)
+    events = [
+        _create_event(i, start + timedelta(milliseconds=i)) for i in range(args.events)
+    ]
+    baseline = args.events / _run(hash_event_v1, events)
+    print(f"{'md5 (v1)':>16}: {baseline:12,.0f} events/sec  (1.00x)")
+    for backend in reversed(json_backend.get_available_backends()):
+        json_backend.set_backend(backend)
+        _run(hash_event, events[:1000])  # warm up
+        rate = args.events / _run(hash_event, events)
+        label = f"blake2b ({backend})"
+        print(f"{label:>16}: {rate:12,.0f} events/sec  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
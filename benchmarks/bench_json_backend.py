@@ -0,0 +1,110 @@
+"""Measures how many file events per second `security-data send-to` can output with each
+installed JSON backend.
+
+Synthetic pages of file events are passed through the same handlers and raw JSON formatter
+that `send-to` uses, with a logging handler that formats each record and discards it, so the
+numbers reflect the CLI's own per-event cost rather than the network or the receiving server.
+
+Usage:
+    python benchmarks/bench_json_backend.py [--events N] [--page-size N]
+"""
+import argparse
+import logging
+from datetime import datetime
+from datetime import timedelta
+from time import perf_counter
+from types import SimpleNamespace
+
+from c42eventextractor.extractors import FileEventExtractor
+
+import code42cli.json_backend as json_backend
+from code42cli.cmds.search.extraction import create_send_to_handlers
+from code42cli.logger.formatters import FileEventDictToRawJSONFormatter
+
+
+class _DiscardingHandler(logging.Handler):
+    def emit(self, record):
+        self.format(record)
+
+
+def _create_event(index, timestamp):
+    time_str = timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+    # Some usernames and paths have non-ASCII characters, which every backend has to escape.
+    owner = "téster" if index % 20 == 0 else "tester"
+    return {
+        "eventId": f"0_{index:016x}_{index:032x}_0",
+        "eventType": "MODIFIED",
+        "eventTimestamp": time_str,
+        "insertionTimestamp": time_str,
+        "filePath": f"C:/Users/{owner}/Documents/project-{index % 50}/",
+        "fileName": f"report-{index}.docx",
+        "fileType": "FILE",
+        "fileCategory": "DOCUMENT",
+        "fileSize": 1024 * (index % 4096),
+        "fileOwner": [owner],
+        "md5Checksum": f"{index:032x}",
+        "sha256Checksum": f"{index:064x}",
+        "deviceUserName": "tester@example.com",
+        "osHostName": "TEST-HOST",
+        "domainName": "192.168.0.10",
+        "publicIpAddress": "203.0.113.10",
+        "privateIpAddresses": ["192.168.0.10", "fe80::1%eth0"],
+        "deviceUid": "935873453596901068",
+        "userUid": "912098363086307495",
+        "exposure": ["RemovableMedia", "ApplicationRead"],
+        "processOwner": "tester",
+        "processName": "C:/Program Files/Microsoft Office/WINWORD.EXE",
+        "removableMediaVendor": None,
+        "syncDestination": None,
+        "outsideActiveHours": index % 7 == 0,
+        "mimeTypeMismatch": False,
+        "riskScore": index % 10,
+    }
+
+
+def _create_pages(event_count, page_size):
+    start = datetime(2020, 1, 1)
+    events = [
+        _create_event(i, start + timedelta(milliseconds=i)) for i in range(event_count)
+    ]
+    return [
+        {"fileEvents": events[i : i + page_size]}
+        for i in range(0, event_count, page_size)
+    ]
+
+
+def _run(pages):
+    logger = logging.getLogger("code42cli_bench_json_backend")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = _DiscardingHandler()
+    handler.setFormatter(FileEventDictToRawJSONFormatter())
+    logger.handlers = [handler]
+
+    sdk = SimpleNamespace(securitydata=SimpleNamespace(search_file_events=None))
+    handlers = create_send_to_handlers(sdk, FileEventExtractor, None, None, logger)
+    start = perf_counter()
+    for page in pages:
+        handlers.handle_response(page)
+    return perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--page-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    pages = _create_pages(args.events, args.page_size)
+    baseline = None
+    for backend in reversed(json_backend.get_available_backends()):
+        json_backend.set_backend(backend)
+        _run(pages[:1])  # warm up
+        elapsed = _run(pages)
+        rate = args.events / elapsed
+        baseline = baseline or rate
+        print(f"{backend:>8}: {rate:12,.0f} events/sec  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
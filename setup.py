@@ -47,7 +47,8 @@ setup(
             "pytest-cov==2.10.0",
             "pytest-mock==2.0.0",
             "tox>=3.17.1",
-        ]
+        ],
+        "fast-json": ["orjson"],
     },
     classifiers=[
         "Intended Audience :: Developers",
@@ -1,13 +1,28 @@
+import json
 import os
+from threading import Lock
 
 import click
 
+from code42cli.click_ext.types import WorkerCount
 from code42cli.errors import LoggedCLIError
+from code42cli.file_readers import RowStream
 from code42cli.logger import get_main_cli_logger
+from code42cli.options import CLIState
+from code42cli.sdk_client import ensure_max_connections
+from code42cli.util import get_user_project_path
+from code42cli.util import hash_event
+from code42cli.worker import RetryPolicy
 from code42cli.worker import Worker
 
 _logger = get_main_cli_logger()
 
+DEFAULT_WORKER_COUNT = 5
+# The most rows processed at once when concurrency is adjusted automatically (`--workers auto`).
+MAX_ADAPTIVE_WORKER_COUNT = 32
+# How many rows per worker thread can be read ahead of the rows being processed.
+QUEUED_ROWS_PER_WORKER = 4
+
 
 class BulkCommandType:
     ADD = "add"
@@ -68,22 +83,172 @@ def generate_template_cmd_factory(group_name, commands_dict, help_message=None):
     return generate_template
 
 
-def run_bulk_process(row_handler, rows, progress_label=None):
+def run_bulk_process(
+    row_handler,
+    rows,
+    progress_label=None,
+    is_success=None,
+    result_sink=None,
+    count_items=None,
+):
     """Runs a bulk process.
 
     Args:
         row_handler (callable): A callable that you define to process values from the row as
             either *args or **kwargs.
-        rows (iterable): the rows to process.
+        rows (list or RowStream): the rows to process.
         progress_label: a label that prints with the progress bar.
+        is_success (callable): For row handlers that catch their own errors, a callable that
+            takes a row's result and returns whether the row succeeded. By default, a row succeeds
+            if `row_handler` doesn't raise.
+        result_sink (ResultSink): Where to send each row's result as it completes. By default,
+            results are kept in memory and returned once all rows are processed.
+        count_items (callable): For rows that each stand for several items, such as a batch of
+            alerts, a callable that takes a row and returns how many items it stands for.
+            Progress and stats then count items instead of rows.
     """
-    processor = _create_bulk_processor(row_handler, rows, progress_label)
+    processor = _create_bulk_processor(
+        row_handler, rows, progress_label, is_success, result_sink, count_items
+    )
     return processor.run()
 
 
-def _create_bulk_processor(row_handler, rows, progress_label):
+def _create_bulk_processor(
+    row_handler,
+    rows,
+    progress_label,
+    is_success=None,
+    result_sink=None,
+    count_items=None,
+):
     """A factory method to create the bulk processor, useful for testing purposes."""
-    return BulkProcessor(row_handler, rows, progress_label=progress_label)
+    state = _get_cli_state()
+    return BulkProcessor(
+        row_handler,
+        rows,
+        progress_label=progress_label,
+        worker_count=_get_worker_count(state),
+        journal=_create_journal(state),
+        is_success=is_success,
+        result_sink=result_sink,
+        stats_file=state.stats_file if state else None,
+        count_items=count_items,
+    )
+
+
+def _get_cli_state():
+    ctx = click.get_current_context(silent=True)
+    return ctx.find_object(CLIState) if ctx else None
+
+
+def _get_worker_count(state):
+    """Returns the `--workers` value (or profile setting) of the current command, if any."""
+    workers = state.workers if state else None
+    return workers or DEFAULT_WORKER_COUNT
+
+
+def _create_journal(state):
+    """Returns the journal for the current command if it supports `--resume`, otherwise None."""
+    if state is None or state.resume is None:
+        return None
+    ctx = click.get_current_context()
+    # Drop the root command name, e.g. `code42 legal-hold bulk add` -> `legal-hold_bulk_add`.
+    command_name = "_".join(ctx.command_path.split()[1:]) or ctx.info_name
+    return BulkJournal.for_command(state.profile.name, command_name, state.resume)
+
+
+class BulkJournal:
+    """An append-only record of the outcome of each row of a bulk command, used to skip rows that
+    already succeeded when the command is run again with `--resume`.
+
+    Each line of the journal file is a JSON object with the hash of a row, whether processing it
+    succeeded, and its result.
+
+    Args:
+        location (str): The path to the journal file.
+        resume (bool): Whether to keep the outcomes recorded by a previous run. If False, the
+            journal is started over.
+    """
+
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __init__(self, location, resume=False):
+        self._location = location
+        self._succeeded = {}
+        self._failed_count = 0
+        if resume:
+            self._load()
+        self._file = open(location, "a" if resume else "w", encoding="utf-8")
+        self._lock = Lock()
+
+    @classmethod
+    def for_command(cls, profile_name, command_name, resume=False):
+        """Returns the journal for the given command, stored in the profile's `bulk_journals`
+        directory."""
+        dir_path = get_user_project_path("bulk_journals", profile_name)
+        return cls(os.path.join(dir_path, f"{command_name}.jsonl"), resume=resume)
+
+    @property
+    def location(self):
+        return self._location
+
+    @property
+    def failed_count(self):
+        """The number of rows recorded as failed during this run."""
+        return self._failed_count
+
+    def has_succeeded(self, row_hash):
+        """Whether the row with the given hash succeeded in a previous run."""
+        return row_hash in self._succeeded
+
+    def get_result(self, row_hash):
+        """The result recorded for the row with the given hash when it succeeded."""
+        return self._succeeded.get(row_hash)
+
+    def record(self, row_hash, succeeded, result=None):
+        """Appends the outcome of processing a row to the journal."""
+        entry = {
+            "row": row_hash,
+            "status": self.SUCCEEDED if succeeded else self.FAILED,
+            "result": result,
+        }
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            if not succeeded:
+                self._failed_count += 1
+            self._file.write(f"{line}\n")
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def delete(self):
+        """Closes and removes the journal file."""
+        self.close()
+        try:
+            os.remove(self._location)
+        except FileNotFoundError:
+            pass
+
+    def _load(self):
+        try:
+            with open(self._location, encoding="utf-8") as journal:
+                for line in journal:
+                    self._load_entry(line)
+        except FileNotFoundError:
+            pass
+
+    def _load_entry(self, line):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            # The last line may be incomplete if the previous run was killed mid-write.
+            return
+        if entry.get("status") == self.SUCCEEDED:
+            self._succeeded[entry["row"]] = entry.get("result")
+        else:
+            self._succeeded.pop(entry.get("row"), None)
 
 
 class BulkProcessor:
@@ -95,58 +260,214 @@ class BulkProcessor:
             and first row `1,test`, then `row_handler` should receive kwargs
             `prop_a: '1', prop_b: 'test'` when processing the first row. If it's a flat file, then
             `row_handler` only needs to take an extra arg.
+        rows (list or RowStream): The rows to process. When given a `RowStream`, rows are read
+            from the file only as fast as they are processed and progress is reported by how much
+            of the file has been processed.
+        worker_count (int or str): The number of rows to process concurrently, or `auto` to
+            adjust concurrency based on server latency and throttling. Ignored if `worker` is
+            provided.
+        journal (BulkJournal): An optional journal to record the outcome of each row in. Rows that
+            the journal says already succeeded are skipped and their recorded results are used.
+        is_success (callable): An optional callable that takes a row's result and returns whether
+            the row succeeded, for journaling. By default, a row succeeds if it doesn't raise.
+        result_sink (ResultSink): Where to send each row's result as it completes. Defaults to
+            keeping results in memory. Ignored if `worker` is provided.
+        stats_file (str): An optional path to write stats about the run to as JSON once it
+            finishes, such as latency percentiles, errors by type and HTTP status, and throughput.
+        count_items (callable): An optional callable that takes a row and returns how many items
+            it stands for, for rows that each process several items. Progress and stats then
+            count items instead of rows.
     """
 
-    def __init__(self, row_handler, rows, worker=None, progress_label=None):
-        total = len(rows)
+    def __init__(
+        self,
+        row_handler,
+        rows,
+        worker=None,
+        progress_label=None,
+        worker_count=DEFAULT_WORKER_COUNT,
+        journal=None,
+        is_success=None,
+        result_sink=None,
+        stats_file=None,
+        count_items=None,
+    ):
         self._rows = rows
+        self._count_items = count_items
+        self._stats_file = stats_file
         self._row_handler = row_handler
+        self._journal = journal
+        self._is_success = is_success
+        self._skipped = 0
+        self._streaming = isinstance(rows, RowStream)
+        # Keep the progress bar and messages out of results written to stdout.
+        self._echo_to_stderr = bool(result_sink and result_sink.writes_to_stdout)
+        total = None if self._streaming else self._get_total(rows)
         self._progress_bar = click.progressbar(
-            length=len(self._rows),
+            length=rows.size if self._streaming else total,
             item_show_func=self._show_stats,
             label=progress_label,
+            file=click.get_text_stream("stderr") if self._echo_to_stderr else None,
         )
-        self.__worker = worker or Worker(5, total, bar=self._progress_bar)
+        # When streaming, the bar tracks bytes processed rather than rows, so it is updated here
+        # instead of by the worker.
+        bar = None if self._streaming else self._progress_bar
+        self.__worker = worker or _create_worker(worker_count, total, bar, result_sink)
         self._stats = self.__worker.stats
 
+    def _get_total(self, rows):
+        if self._count_items:
+            return sum(self._count_items(row) for row in rows)
+        return len(rows)
+
     def run(self):
         """Processes the csv rows specified in the ctor, calling `self.row_handler` on each row."""
         self._stats.reset_results()
-        for row in self._rows:
-            self._process_row(row)
+        if self._streaming:
+            self._process_stream()
+        else:
+            for row in self._rows:
+                self._process_row(row)
         self.__worker.wait()
+        self.__worker.shutdown()
+        self._finish_progress()
+        self._finish_journal()
+        self._write_stats_file()
         self._print_results()
-        return self._stats._results
+        return self._stats.results
 
-    def _process_row(self, row):
+    def _process_stream(self):
+        position = 0
+        for row in self._rows:
+            self._process_row(row, progress=self._rows.position - position)
+            position = self._rows.position
+
+    def _process_row(self, row, progress=None):
+        item_count = self._count_items(row) if self._count_items else 1
         if isinstance(row, dict):
-            self._process_csv_row(row)
+            self._process_csv_row(row, progress, item_count)
         elif row:
-            self._process_flat_file_row(row.strip())
+            self._process_flat_file_row(row.strip(), progress, item_count)
 
-    def _process_csv_row(self, row):
+    def _process_csv_row(self, row, progress=None, item_count=1):
         # Removes problems from including extra columns. Error messages from out of order args
         # are more indicative this way too.
         row.pop(None, None)
 
         row_values = {key: val if val != "" else None for key, val in row.items()}
-        self.__worker.do_async(
-            lambda *args, **kwargs: self._handle_row(*args, **kwargs), **row_values
-        )
+        self._do_async(progress, item_count, **row_values)
 
-    def _process_flat_file_row(self, row):
+    def _process_flat_file_row(self, row, progress=None, item_count=1):
         if row:
-            self.__worker.do_async(
-                lambda *args, **kwargs: self._handle_row(*args, **kwargs), row
+            self._do_async(progress, item_count, row)
+
+    def _do_async(self, progress, item_count, *args, **kwargs):
+        row_hash = None
+        if self._journal:
+            row_hash = hash_event(kwargs or args[0])
+            if self._journal.has_succeeded(row_hash):
+                self._skip_row(row_hash, progress, item_count)
+                return
+        if row_hash is None and progress is None:
+            self.__worker.do_async_task(
+                lambda *args, **kwargs: self._handle_row(*args, **kwargs),
+                args,
+                kwargs,
+                item_count=item_count,
             )
+            return
+        # The row's outcome is journaled and its progress reported only once it is final, not for
+        # attempts that fail and are retried.
+        self.__worker.do_async_task(
+            lambda *args, **kwargs: self._handle_tracked_row(
+                row_hash, progress, *args, **kwargs
+            ),
+            args,
+            kwargs,
+            on_failure=lambda err: self._handle_failed_row(row_hash, progress),
+            item_count=item_count,
+        )
 
     def _handle_row(self, *args, **kwargs):
         return self._row_handler(*args, **kwargs)
 
+    def _handle_tracked_row(self, row_hash, progress, *args, **kwargs):
+        result = self._handle_row(*args, **kwargs)
+        if row_hash is not None:
+            succeeded = self._is_success(result) if self._is_success else True
+            self._journal.record(row_hash, succeeded, result)
+        if progress is not None:
+            self._progress_bar.update(progress)
+        return result
+
+    def _handle_failed_row(self, row_hash, progress):
+        if row_hash is not None:
+            self._journal.record(row_hash, False)
+        if progress is not None:
+            self._progress_bar.update(progress)
+
+    def _skip_row(self, row_hash, progress, item_count=1):
+        self._skipped += 1
+        # The row succeeded in a previous run, so it counts toward this run's successes.
+        self._stats.increment_total_processed(item_count)
+        result = self._journal.get_result(row_hash)
+        if result is not None:
+            self._stats.add_result(result)
+        self._progress_bar.update(item_count if progress is None else progress)
+
+    def _finish_journal(self):
+        if not self._journal:
+            return
+        if self._skipped:
+            click.echo(
+                f"\nSkipped {self._skipped} rows that succeeded in a previous run.",
+                nl=False,
+                err=self._echo_to_stderr,
+            )
+        if self._journal.failed_count:
+            self._journal.close()
+            click.echo(
+                "\nRun the command again with `--resume` to retry only the rows that did not "
+                "succeed.",
+                nl=False,
+                err=self._echo_to_stderr,
+            )
+        else:
+            self._journal.delete()
+
+    def _finish_progress(self):
+        # Byte positions are estimated from the decoded text, so make sure the bar ends up full.
+        if self._streaming and self._progress_bar.pos < self._progress_bar.length:
+            self._progress_bar.update(
+                self._progress_bar.length - self._progress_bar.pos
+            )
+
     def _show_stats(self, _):
-        return str(self._stats)
+        performance = self._stats.describe_performance()
+        return f"{self._stats} ({performance})" if performance else str(self._stats)
+
+    def _write_stats_file(self):
+        if not self._stats_file:
+            return
+        with open(self._stats_file, "w", encoding="utf-8") as stats_file:
+            json.dump(self._stats.to_dict(), stats_file, indent=4)
 
     def _print_results(self):
-        click.echo("")
+        click.echo("", err=self._echo_to_stderr)
         if self._stats.total_errors:
             raise LoggedCLIError("Some problems occurred during bulk processing.")
+
+
+def _create_worker(worker_count, total, bar, result_sink=None):
+    adaptive = worker_count == WorkerCount.AUTO
+    thread_count = MAX_ADAPTIVE_WORKER_COUNT if adaptive else worker_count
+    ensure_max_connections(thread_count)
+    return Worker(
+        thread_count,
+        total,
+        bar=bar,
+        adaptive=adaptive,
+        max_queued=thread_count * QUEUED_ROWS_PER_WORKER,
+        result_sink=result_sink,
+        retry_policy=RetryPolicy(),
+    )
@@ -9,14 +9,15 @@ from click.exceptions import BadParameter
 
 from code42cli.logger import CliLogger
 
+_ENCODING_DETECTION_CHUNK_SIZE = 64 * 1024
+
 
 class AutoDecodedFile(click.File):
     """Attempts to autodetect file's encoding prior to normal click.File processing."""
 
     def convert(self, value, param, ctx):
         try:
-            with open(value, "rb") as file:
-                self.encoding = chardet.detect(file.read())["encoding"]
+            self.encoding = _detect_encoding(value)
             if self.encoding is None:
                 CliLogger().log_error(f"Failed to detect encoding of file: {value}")
         except Exception:
@@ -25,6 +26,19 @@ class AutoDecodedFile(click.File):
         return super().convert(value, param, ctx)
 
 
+def _detect_encoding(path):
+    # Feeds the file to the detector a chunk at a time so that large files aren't read into
+    # memory all at once just to detect their encoding.
+    detector = chardet.UniversalDetector()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(_ENCODING_DETECTION_CHUNK_SIZE), b""):
+            detector.feed(chunk)
+            if detector.done:
+                break
+    detector.close()
+    return detector.result["encoding"]
+
+
 class FileOrString(AutoDecodedFile):
     """Declares a parameter to be a file (if the argument begins with `@`), otherwise accepts it as
     a string.
@@ -136,6 +150,37 @@ class MagicDate(click.ParamType):
             return dt
 
 
+class WorkerCount(click.ParamType):
+    """Declares a parameter to be a number of concurrent workers. Accepts a positive integer or
+    `auto`, which lets the worker adjust its concurrency based on how the server is responding.
+    """
+
+    AUTO = "auto"
+    name = "workers"
+
+    def get_metavar(self, param):
+        return "[INTEGER|auto]"
+
+    def __repr__(self):
+        return "WorkerCount"
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, int) and not isinstance(value, bool):
+            count = value
+        elif str(value).strip().lower() == self.AUTO:
+            return self.AUTO
+        else:
+            try:
+                count = int(value)
+            except ValueError:
+                self.fail(
+                    f"{value} is not a valid integer or '{self.AUTO}'.", param=param
+                )
+        if count < 1:
+            self.fail("must be at least 1.", param=param)
+        return count
+
+
 class MapChoice(click.Choice):
     """Choice subclass that takes an extra map of additional 'valid' keys to map to correct
     choices list, allowing backward compatible choice changes. The extra keys don't show up
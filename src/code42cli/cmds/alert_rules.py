@@ -10,9 +10,12 @@ from code42cli.bulk import generate_template_cmd_factory
 from code42cli.bulk import run_bulk_process
 from code42cli.click_ext.groups import OrderedGroup
 from code42cli.cmds.shared import get_user_id
+from code42cli.cmds.shared import prefetch_user_ids_if_needed
 from code42cli.errors import Code42CLIError
 from code42cli.file_readers import read_csv_arg
+from code42cli.options import bulk_options
 from code42cli.options import format_option
+from code42cli.options import prefetch_users_option
 from code42cli.options import sdk_options
 from code42cli.output_formats import OutputFormatter
 
@@ -123,6 +126,8 @@ bulk.add_command(alert_rules_generate_template)
     )
 )
 @read_csv_arg(headers=ALERT_RULES_CSV_HEADERS)
+@bulk_options
+@prefetch_users_option
 @sdk_options()
 def add(state, csv_rows):
     sdk = state.sdk
@@ -130,6 +135,7 @@ def add(state, csv_rows):
     def handle_row(rule_id, username):
         _add_user(sdk, rule_id, username)
 
+    prefetch_user_ids_if_needed(state, csv_rows)
     run_bulk_process(
         handle_row, csv_rows, progress_label="Adding users to alert-rules:"
     )
@@ -141,6 +147,8 @@ def add(state, csv_rows):
     )
 )
 @read_csv_arg(headers=ALERT_RULES_CSV_HEADERS)
+@bulk_options
+@prefetch_users_option
 @sdk_options()
 def remove(state, csv_rows):
     sdk = state.sdk
@@ -148,6 +156,7 @@ def remove(state, csv_rows):
     def handle_row(rule_id, username):
         _remove_user(sdk, rule_id, username)
 
+    prefetch_user_ids_if_needed(state, csv_rows)
     run_bulk_process(
         handle_row, csv_rows, progress_label="Removing users from alert-rules:"
     )
@@ -1,6 +1,9 @@
+from collections import OrderedDict
+
 import click
 import py42.sdk.queries.alerts.filters as f
 from c42eventextractor.extractors import AlertExtractor
+from py42.exceptions import Py42BadRequestError
 from py42.exceptions import Py42NotFoundError
 from py42.sdk.queries.alerts.filters import AlertState
 from py42.sdk.queries.alerts.filters import RuleType
@@ -17,10 +20,13 @@ from code42cli.click_ext.groups import OrderedGroup
 from code42cli.cmds.search import SendToCommand
 from code42cli.cmds.search.cursor_store import AlertCursorStore
 from code42cli.cmds.search.extraction import handle_no_events
+from code42cli.cmds.search.follow import create_follower
+from code42cli.cmds.search.options import follow_options
 from code42cli.cmds.search.options import server_options
 from code42cli.date_helper import convert_datetime_to_timestamp
 from code42cli.date_helper import limit_date_range
 from code42cli.file_readers import read_csv_arg
+from code42cli.file_readers import RowStream
 from code42cli.options import format_option
 from code42cli.output_formats import JsonOutputFormat
 from code42cli.output_formats import OutputFormat
@@ -147,6 +153,12 @@ update_state_option = click.option(
     help="The state to give to the alert.",
     type=click.Choice(AlertState.choices()),
 )
+details_batch_size_option = click.option(
+    "--details-batch-size",
+    type=click.IntRange(min=1),
+    help="How many alerts to get the details of in each request. Batches are requested "
+    "concurrently. Defaults to 100.",
+)
 
 
 def _get_default_output_header():
@@ -203,17 +215,28 @@ def clear_checkpoint(state, checkpoint_name):
 
 
 def _call_extractor(
-    cli_state, handlers, begin, end, or_query, advanced_query, **kwargs
+    cli_state, handlers, begin, end, or_query, advanced_query, follower=None, **kwargs,
 ):
-    extractor = _get_alert_extractor(cli_state.sdk, handlers)
-    extractor.use_or_query = or_query
     if advanced_query:
         cli_state.search_filters = advanced_query
+    filters = list(cli_state.search_filters)
     if begin or end:
-        cli_state.search_filters.append(
-            ext.create_time_range_filter(f.DateObserved, begin, end)
-        )
-    extractor.extract(*cli_state.search_filters)
+        filters.append(ext.create_time_range_filter(f.DateObserved, begin, end))
+
+    def extract(extractor_handlers):
+        extractor = _get_alert_extractor(cli_state.sdk, extractor_handlers)
+        extractor.use_or_query = or_query
+        if follower and extractor_handlers.get_cursor_position():
+            # Later polls start from the cursor, which is also a `DateObserved` filter.
+            extractor.extract(*cli_state.search_filters)
+        else:
+            extractor.extract(*filters)
+
+    if follower:
+        follower.stop_after_each_page(handlers)
+        follower.run(lambda: ext.extract_with_prefetch(extract, handlers))
+    else:
+        ext.extract_with_prefetch(extract, handlers)
 
 
 @alerts.command()
@@ -230,6 +253,7 @@ def _call_extractor(
     help="Display simple properties of the primary level of the nested response.",
 )
 @format_option
+@details_batch_size_option
 def search(
     cli_state,
     format,
@@ -239,6 +263,7 @@ def search(
     use_checkpoint,
     or_query,
     include_all,
+    details_batch_size,
     **kwargs,
 ):
     """Search for alerts."""
@@ -254,6 +279,7 @@ def search(
         use_checkpoint,
         formatter=formatter,
         force_pager=include_all,
+        alert_details_batch_size=details_batch_size,
     )
     _call_extractor(cli_state, handlers, begin, end, or_query, advanced_query, **kwargs)
     handle_no_events(not handlers.TOTAL_EVENTS and not errors.ERRORED)
@@ -274,16 +300,43 @@ def search(
     help="Display simple properties of the primary level of the nested response.",
 )
 @send_to_format_options
-def send_to(cli_state, begin, end, advanced_query, use_checkpoint, or_query, **kwargs):
+@details_batch_size_option
+@follow_options
+def send_to(
+    cli_state,
+    begin,
+    end,
+    advanced_query,
+    use_checkpoint,
+    or_query,
+    details_batch_size,
+    follow,
+    interval,
+    **kwargs,
+):
     """Send alerts to the given server address.
 
     HOSTNAME format: address:port where port is optional and defaults to 514.
     """
     cursor = _get_cursor(cli_state, use_checkpoint)
     handlers = ext.create_send_to_handlers(
-        cli_state.sdk, AlertExtractor, cursor, use_checkpoint, cli_state.logger,
+        cli_state.sdk,
+        AlertExtractor,
+        cursor,
+        use_checkpoint,
+        cli_state.logger,
+        alert_details_batch_size=details_batch_size,
+    )
+    _call_extractor(
+        cli_state,
+        handlers,
+        begin,
+        end,
+        or_query,
+        advanced_query,
+        follower=create_follower(follow, interval),
+        **kwargs,
     )
-    _call_extractor(cli_state, handlers, begin, end, or_query, advanced_query, **kwargs)
     handle_no_events(not handlers.TOTAL_EVENTS and not errors.ERRORED)
 
 
@@ -339,7 +392,7 @@ def show(state, alert_id, include_observations):
 @note_option
 def update(cli_state, alert_id, state, note):
     """Update alert information."""
-    _update_alert(cli_state.sdk, alert_id, state, note)
+    _update_alerts(cli_state.sdk, [alert_id], state, note)
 
 
 @alerts.group(cls=OrderedGroup)
@@ -350,6 +403,10 @@ def bulk(state):
 
 
 UPDATE_ALERT_CSV_HEADERS = ["id", "state", "note"]
+# The most alerts the server accepts in one state update request.
+MAX_ALERTS_PER_UPDATE = 100
+# The most distinct (state, note) batches held back while waiting for more matching rows.
+MAX_PENDING_ALERT_BATCHES = 1000
 update_alerts_generate_template = generate_template_cmd_factory(
     group_name=ALERTS_KEYWORD,
     commands_dict={"update": UPDATE_ALERT_CSV_HEADERS},
@@ -364,20 +421,77 @@ bulk.add_command(update_alerts_generate_template)
 )
 @opt.sdk_options()
 @read_csv_arg(headers=UPDATE_ALERT_CSV_HEADERS)
+@opt.bulk_options
 def bulk_update(cli_state, csv_rows):
     """Bulk update alerts."""
     sdk = cli_state.sdk
 
-    def handle_row(id, state, note):
-        _update_alert(sdk, id, state, note)
+    def handle_row(ids, state, note):
+        _update_alerts(sdk, ids, state, note)
 
+    if isinstance(csv_rows, RowStream):
+        batches = csv_rows.regroup(_batch_alert_updates)
+    else:
+        batches = list(_batch_alert_updates(csv_rows))
     run_bulk_process(
-        handle_row, csv_rows, progress_label="Updating alerts:",
+        handle_row,
+        batches,
+        progress_label="Updating alerts:",
+        count_items=lambda batch: len(batch["ids"]),
     )
 
 
-def _update_alert(sdk, alert_id, alert_state, note):
-    if alert_state:
-        sdk.alerts.update_state(alert_state, [alert_id], note=note)
-    elif note:
-        sdk.alerts.update_note(alert_id, note)
+def _batch_alert_updates(rows):
+    """Combines rows that set the same state with the same note so that each batch of alerts is
+    updated with a single request. Rows that only add a note are yielded on their own."""
+    pending = OrderedDict()
+    for row in rows:
+        state = row.get("state") or None
+        note = row.get("note") or None
+        if not state:
+            if note:
+                yield {"ids": [row["id"]], "state": None, "note": note}
+            continue
+
+        key = (state, note)
+        ids = pending.setdefault(key, [])
+        ids.append(row["id"])
+        if len(ids) >= MAX_ALERTS_PER_UPDATE:
+            del pending[key]
+            yield {"ids": ids, "state": state, "note": note}
+        elif len(pending) > MAX_PENDING_ALERT_BATCHES:
+            # Rows with unique notes can't be combined, so don't hold on to them forever.
+            (old_state, old_note), old_ids = pending.popitem(last=False)
+            yield {"ids": old_ids, "state": old_state, "note": old_note}
+
+    for (state, note), ids in pending.items():
+        yield {"ids": ids, "state": state, "note": note}
+
+
+def _update_alerts(sdk, alert_ids, alert_state, note):
+    if not alert_state:
+        if note:
+            for alert_id in alert_ids:
+                sdk.alerts.update_note(alert_id, note)
+        return
+    try:
+        sdk.alerts.update_state(alert_state, alert_ids, note=note)
+    except Py42BadRequestError:
+        if len(alert_ids) == 1:
+            raise
+        # One bad alert ID fails the whole batch, so update the rest individually.
+        _update_alerts_individually(sdk, alert_ids, alert_state, note)
+
+
+def _update_alerts_individually(sdk, alert_ids, alert_state, note):
+    failed_ids = []
+    for alert_id in alert_ids:
+        try:
+            sdk.alerts.update_state(alert_state, [alert_id], note=note)
+        except Py42BadRequestError:
+            failed_ids.append(alert_id)
+    if failed_ids:
+        raise errors.PartialFailureError(
+            "Failed to update alerts: {}".format(", ".join(failed_ids)),
+            len(failed_ids),
+        )
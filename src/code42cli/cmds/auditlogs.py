@@ -1,5 +1,10 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from datetime import timezone
+from itertools import chain
+from time import monotonic
+from time import time
 
 import click
 
@@ -7,18 +12,38 @@ import code42cli.options as opt
 from code42cli.click_ext.groups import OrderedGroup
 from code42cli.cmds.search import SendToCommand
 from code42cli.cmds.search.cursor_store import AuditLogCursorStore
+from code42cli.cmds.search.cursor_store import MemoryCursorStore
+from code42cli.cmds.search.follow import create_follower
+from code42cli.cmds.search.options import follow_options
+from code42cli.cmds.search.options import parallel_option
 from code42cli.cmds.search.options import server_options
+from code42cli.cmds.search.parallel import MAX_WINDOWS_AHEAD_PER_WORKER
+from code42cli.cmds.search.parallel import TimeWindow
+from code42cli.cmds.search.parallel import WINDOWS_PER_WORKER
+from code42cli.cmds.search.sorting import read_spilled
+from code42cli.cmds.search.sorting import sort_pages
+from code42cli.cmds.search.sorting import spill
 from code42cli.date_helper import convert_datetime_to_timestamp
+from code42cli.logger import flush_handlers
 from code42cli.options import checkpoint_option
 from code42cli.options import format_option
 from code42cli.options import sdk_options
 from code42cli.output_formats import OutputFormatter
+from code42cli.sdk_client import ensure_max_connections
 from code42cli.util import hash_event
+from code42cli.util import hash_event_v1
+from code42cli.util import is_current_event_hash
 from code42cli.util import warn_interrupt
 
 EVENT_KEY = "events"
 AUDIT_LOGS_KEYWORD = "audit-logs"
 AUDIT_LOG_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+# The checkpoint is committed after this many events have been processed...
+CHECKPOINT_COMMIT_EVENT_COUNT = 1000
+# ...or this many seconds after the last commit, whichever comes first.
+CHECKPOINT_COMMIT_INTERVAL_SECONDS = 5
+# The name of the in-memory cursor used by `--follow` without `--use-checkpoint`.
+FOLLOW_CURSOR_NAME = "follow"
 
 
 def _get_audit_logs_default_header():
@@ -111,6 +136,7 @@ def clear_checkpoint(state, checkpoint_name):
 @filter_options
 @format_option
 @checkpoint_option(AUDIT_LOGS_KEYWORD)
+@parallel_option
 @sdk_options()
 def search(
     state,
@@ -124,6 +150,7 @@ def search(
     affected_username,
     format,
     use_checkpoint,
+    parallel,
 ):
     """Search audit log events."""
     formatter = OutputFormatter(format, _get_audit_logs_default_header())
@@ -134,8 +161,9 @@ def search(
         if checkpoint is not None:
             begin = checkpoint
 
-    events = _get_all_audit_log_events(
+    events = _get_audit_log_events(
         state.sdk,
+        parallel=parallel,
         begin_time=begin,
         end_time=end,
         event_types=event_type,
@@ -147,21 +175,22 @@ def search(
     )
     if use_checkpoint:
         checkpoint_name = use_checkpoint
-        events = list(
-            _dedupe_checkpointed_events_and_store_updated_checkpoint(
-                cursor, checkpoint_name, events
-            )
+        events = _dedupe_checkpointed_events_and_store_updated_checkpoint(
+            cursor, checkpoint_name, events
         )
-    if not events:
+    first_event = next(events, None)
+    if first_event is None:
         click.echo("No results found.")
         return
-    formatter.echo_formatted_list(events)
+    formatter.echo_formatted_stream(chain([first_event], events))
 
 
 @audit_logs.command(cls=SendToCommand)
 @filter_options
 @checkpoint_option(AUDIT_LOGS_KEYWORD)
 @server_options
+@parallel_option
+@follow_options
 @sdk_options()
 def send_to(
     state,
@@ -174,6 +203,9 @@ def send_to(
     affected_user_id,
     affected_username,
     use_checkpoint,
+    parallel,
+    follow,
+    interval,
     **kwargs,
 ):
     """Send audit log events to the given server address in JSON format.
@@ -181,59 +213,181 @@ def send_to(
     HOSTNAME format: address:port where port is optional and defaults to 514.
     """
     cursor = _get_audit_log_cursor_store(state.profile.name)
-    if use_checkpoint:
-        checkpoint_name = use_checkpoint
-        checkpoint = cursor.get(checkpoint_name)
-        if checkpoint is not None:
-            begin = checkpoint
+    checkpoint_name = use_checkpoint
+    follower = create_follower(follow, interval)
+    if follower and not use_checkpoint:
+        # Keep the position between polls without storing it.
+        cursor = MemoryCursorStore()
+        checkpoint_name = FOLLOW_CURSOR_NAME
+    sent_count = 0
+
+    def send_events():
+        nonlocal sent_count
+        checkpoint = cursor.get(checkpoint_name) if checkpoint_name else None
+        events = _get_audit_log_events(
+            state.sdk,
+            parallel=parallel,
+            begin_time=begin if checkpoint is None else checkpoint,
+            end_time=end,
+            event_types=event_type,
+            usernames=actor_username,
+            user_ids=actor_user_id,
+            user_ip_addresses=actor_ip,
+            affected_user_ids=affected_user_id,
+            affected_usernames=affected_username,
+        )
+        if checkpoint_name:
+            events = _dedupe_checkpointed_events_and_store_updated_checkpoint(
+                cursor,
+                checkpoint_name,
+                events,
+                before_commit=lambda: flush_handlers(state.logger),
+            )
+        with warn_interrupt() as interrupt:
+            try:
+                for event in events:
+                    if interrupt.interrupted or (follower and follower.stopped):
+                        break
+                    state.logger.info(event)
+                    sent_count += 1
+            finally:
+                # Commits the checkpoint up to the last event that was sent and removes any
+                # temporary files used to sort the events.
+                events.close()
+
+    if follower:
+        follower.run(send_events)
+    else:
+        send_events()
+    if not sent_count:
+        click.echo("No results found.")
 
-    events = _get_all_audit_log_events(
-        state.sdk,
-        begin_time=begin,
-        end_time=end,
-        event_types=event_type,
-        usernames=actor_username,
-        user_ids=actor_user_id,
-        user_ip_addresses=actor_ip,
-        affected_user_ids=affected_user_id,
-        affected_usernames=affected_username,
-    )
-    if use_checkpoint:
-        checkpoint_name = use_checkpoint
-        events = list(
-            _dedupe_checkpointed_events_and_store_updated_checkpoint(
-                cursor, checkpoint_name, events
+
+def _get_audit_log_events(
+    sdk, parallel=1, begin_time=None, end_time=None, **filter_args
+):
+    """Yields audit log events in timestamp order. If `parallel` is more than 1, the time range
+    is split into windows and up to `parallel` windows are fetched at once."""
+    if parallel > 1 and begin_time:
+        windows = TimeWindow(begin_time, end_time or time()).split(
+            parallel * WINDOWS_PER_WORKER
+        )
+        if len(windows) > 1:
+            return _get_audit_log_events_in_parallel(
+                sdk, windows, end_time, parallel, filter_args
             )
+    return _get_all_audit_log_events(
+        sdk, begin_time=begin_time, end_time=end_time, **filter_args
+    )
+
+
+def _get_audit_log_events_in_parallel(
+    sdk, windows, end_time, worker_count, filter_args
+):
+    """Fetches `windows` with `worker_count` concurrent workers. Each worker sorts its window's
+    events into a temporary file. Outputting the windows one after another keeps every event in
+    timestamp order, which the checkpoint relies on.
+
+    Queries only have millisecond precision while event timestamps have microseconds, so each
+    window ends on the millisecond the next one begins on rather than one millisecond before it.
+    Events in that millisecond that both windows return are output once."""
+    ensure_max_connections(worker_count)
+    last_window = windows[-1]
+    pending = deque(windows)
+    running = deque()
+    max_running = worker_count * MAX_WINDOWS_AHEAD_PER_WORKER
+
+    def fetch_window(window):
+        events = _get_all_audit_log_events(
+            sdk,
+            begin_time=window.begin,
+            end_time=end_time if window is last_window else window.end,
+            **filter_args,
         )
-    with warn_interrupt():
-        event = None
-        for event in events:
-            state.logger.info(event)
-        if event is None:  # generator was empty
-            click.echo("No results found.")
+        return spill(events)
+
+    boundary_hashes = set()
+    with ThreadPoolExecutor(worker_count) as executor:
+        try:
+            while pending or running:
+                while pending and len(running) < max_running:
+                    window = pending.popleft()
+                    running.append((window, executor.submit(fetch_window, window)))
+                window, future = running.popleft()
+                events = read_spilled(future.result())
+                try:
+                    yield from _skip_boundary_duplicates(
+                        events, window, boundary_hashes
+                    )
+                finally:
+                    events.close()
+        finally:
+            for _, future in running:
+                if not future.cancel() and not future.exception():
+                    # Remove the temporary file of a window that won't be output.
+                    future.result().close()
+
+
+def _skip_boundary_duplicates(events, window, boundary_hashes):
+    """Yields the events of `window` except those whose hashes are in `boundary_hashes`, the
+    events already output in the millisecond it shares with the window before it. Leaves
+    `boundary_hashes` holding the hashes of the events in the window's last millisecond."""
+    begin = _format_millisecond(window.begin)
+    end = _format_millisecond(window.end)
+    previous_hashes = set(boundary_hashes)
+    boundary_hashes.clear()
+    for event in events:
+        millisecond = _get_event_millisecond(event)
+        if millisecond == begin or millisecond == end:
+            event_hash = hash_event(event)
+            if millisecond == begin and event_hash in previous_hashes:
+                continue
+            if millisecond == end:
+                boundary_hashes.add(event_hash)
+        yield event
+
+
+def _format_millisecond(timestamp):
+    date = datetime.fromtimestamp(timestamp, timezone.utc)
+    return date.strftime(AUDIT_LOG_TIMESTAMP_FORMAT)[:-3]
+
+
+def _get_event_millisecond(event):
+    # example: "2020-11-23T17:13:26.239647Z", or "2020-11-23T17:13:26Z" without a fraction.
+    timestamp = event["timestamp"][:-1]
+    if "." not in timestamp:
+        return f"{timestamp}.000"
+    return timestamp[:23]
 
 
 def _get_all_audit_log_events(sdk, **filter_args):
+    """Yields audit log events in timestamp order once every page has arrived, without holding
+    every event in memory (see `sort_pages`)."""
     response_gen = sdk.auditlogs.get_all(**filter_args)
-    events = []
+    return sort_pages(
+        _get_audit_log_event_pages(response_gen), key=lambda x: x.get("timestamp")
+    )
+
+
+def _get_audit_log_event_pages(response_gen):
     try:
-        responses = list(response_gen)
+        for response in response_gen:
+            if EVENT_KEY in response.data:
+                yield response.data.get(EVENT_KEY)
     except KeyError:
         # API endpoint (get_page) returns a response without events key when no records are found
         # e.g {"paginationRangeStartIndex": 10000, "paginationRangeEndIndex": 10000, "totalResultCount": 1593}
         # we can remove this check once PL-93211 is resolved and deployed.
-        return events
-
-    for response in responses:
-        if EVENT_KEY in response.data:
-            response_events = response.data.get(EVENT_KEY)
-            events.extend(response_events)
-
-    return sorted(events, key=lambda x: x.get("timestamp"))
+        return
 
 
 def _dedupe_checkpointed_events_and_store_updated_checkpoint(
-    cursor, checkpoint_name, events
+    cursor,
+    checkpoint_name,
+    events,
+    commit_event_count=CHECKPOINT_COMMIT_EVENT_COUNT,
+    commit_interval=CHECKPOINT_COMMIT_INTERVAL_SECONDS,
+    before_commit=None,
 ):
     """De-duplicates events across checkpointed runs. Since using the timestamp of the last event
     processed as the `--begin` time of the next run causes the last event to show up again in the
@@ -241,22 +395,58 @@ def _dedupe_checkpointed_events_and_store_updated_checkpoint(
     filter out on the next run. It's also possible that two events have the exact same timestamp, so
     `checkpoint_events` needs to be a list of hashes so we can filter out everything that's actually
     been processed.
+
+    An event counts as processed once the caller asks for the next one. The checkpoint is committed
+    every `commit_event_count` processed events, at least every `commit_interval` seconds, and when
+    the generator finishes or is closed. `before_commit`, if given, is called before each commit,
+    for example to wait for the processed events to be delivered; if it raises, the checkpoint
+    is not committed.
     """
 
-    checkpoint_events = cursor.get_events(checkpoint_name)
+    checkpoint_events = set(cursor.get_events(checkpoint_name))
+    # Checkpoints saved before event hashes were versioned hold MD5 hashes.
+    legacy_checkpoint_events = {
+        event_hash
+        for event_hash in checkpoint_events
+        if not is_current_event_hash(event_hash)
+    }
     new_timestamp = None
     new_events = []
-    for event in events:
-        event_hash = hash_event(event)
-        if event_hash not in checkpoint_events:
+    uncommitted_count = 0
+    last_commit_time = monotonic()
+
+    def commit():
+        if before_commit:
+            before_commit()
+        ts = _parse_audit_log_timestamp_string_to_timestamp(new_timestamp)
+        cursor.replace_checkpoint(checkpoint_name, ts, list(new_events))
+
+    try:
+        for event in events:
+            event_hash = hash_event(event)
+            if event_hash in checkpoint_events or (
+                legacy_checkpoint_events
+                and hash_event_v1(event) in legacy_checkpoint_events
+            ):
+                continue
+
+            yield event
+
             if event["timestamp"] != new_timestamp:
                 new_timestamp = event["timestamp"]
                 new_events.clear()
             new_events.append(event_hash)
-            yield event
-            ts = _parse_audit_log_timestamp_string_to_timestamp(new_timestamp)
-            cursor.replace(checkpoint_name, ts)
-            cursor.replace_events(checkpoint_name, new_events)
+            uncommitted_count += 1
+            if (
+                uncommitted_count >= commit_event_count
+                or monotonic() - last_commit_time >= commit_interval
+            ):
+                commit()
+                uncommitted_count = 0
+                last_commit_time = monotonic()
+    finally:
+        if uncommitted_count:
+            commit()
 
 
 def _get_audit_log_cursor_store(profile_name):
@@ -0,0 +1,31 @@
+import click
+
+from code42cli.click_ext.groups import OrderedGroup
+from code42cli.cmds.shared import get_all_users
+from code42cli.options import sdk_options
+from code42cli.user_cache import UserCache
+
+
+@click.group(cls=OrderedGroup)
+@sdk_options(hidden=True)
+def cache(state):
+    """Manage the local cache of Code42 user data."""
+    pass
+
+
+@cache.command()
+@sdk_options()
+def refresh(state):
+    """Download all users into the profile's user cache now instead of waiting for it to expire."""
+    users = get_all_users(state.sdk, refresh=True)
+    click.echo(f"Cached {len(users)} users for profile '{state.profile.name}'.")
+
+
+@cache.command()
+@sdk_options()
+def clear(state):
+    """Remove all users from the profile's user cache."""
+    user_cache = UserCache.for_profile(state.profile.name)
+    user_cache.clear()
+    user_cache.close()
+    click.echo(f"Cleared the user cache for profile '{state.profile.name}'.")
@@ -13,6 +13,7 @@ from code42cli.bulk import run_bulk_process
 from code42cli.click_ext.groups import OrderedGroup
 from code42cli.errors import Code42CLIError
 from code42cli.file_readers import read_csv_arg
+from code42cli.options import bulk_options
 from code42cli.options import format_option
 from code42cli.options import sdk_options
 from code42cli.options import set_begin_default_dict
@@ -291,6 +292,7 @@ bulk.add_command(case_file_events_generate_template)
     f"format: {','.join(FILE_EVENTS_HEADERS)}.",
 )
 @read_csv_arg(headers=FILE_EVENTS_HEADERS)
+@bulk_options
 @sdk_options()
 def bulk_add(state, csv_rows):
     sdk = state.sdk
@@ -309,6 +311,7 @@ def bulk_add(state, csv_rows):
     f"format: {','.join(FILE_EVENTS_HEADERS)}.",
 )
 @read_csv_arg(headers=FILE_EVENTS_HEADERS)
+@bulk_options
 @sdk_options()
 def bulk_remove(state, csv_rows):
     sdk = state.sdk
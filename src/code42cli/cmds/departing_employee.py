@@ -13,10 +13,13 @@ from code42cli.cmds.detectionlists.options import cloud_alias_option
 from code42cli.cmds.detectionlists.options import notes_option
 from code42cli.cmds.detectionlists.options import username_arg
 from code42cli.cmds.shared import get_user_id
+from code42cli.cmds.shared import prefetch_user_ids_if_needed
 from code42cli.errors import Code42CLIError
 from code42cli.file_readers import read_csv_arg
 from code42cli.file_readers import read_flat_file_arg
+from code42cli.options import bulk_options
 from code42cli.options import format_option
+from code42cli.options import prefetch_users_option
 from code42cli.options import sdk_options
 
 
@@ -99,6 +102,8 @@ bulk.add_command(departing_employee_generate_template)
     "format: {}.".format(",".join(DEPARTING_EMPLOYEE_CSV_HEADERS)),
 )
 @read_csv_arg(headers=DEPARTING_EMPLOYEE_CSV_HEADERS)
+@bulk_options
+@prefetch_users_option
 @sdk_options()
 def bulk_add(state, csv_rows):
     sdk = state.sdk  # Force initialization of py42 to only happen once.
@@ -116,6 +121,7 @@ def bulk_add(state, csv_rows):
                 raise Code42CLIError(message)
         _add_departing_employee(sdk, username, cloud_alias, departure_date, notes)
 
+    prefetch_user_ids_if_needed(state, csv_rows)
     run_bulk_process(
         handle_row,
         csv_rows,
@@ -129,6 +135,8 @@ def bulk_add(state, csv_rows):
     "file of usernames.",
 )
 @read_flat_file_arg
+@bulk_options
+@prefetch_users_option
 @sdk_options()
 def bulk_remove(state, file_rows):
     sdk = state.sdk
@@ -136,6 +144,7 @@ def bulk_remove(state, file_rows):
     def handle_row(username):
         _remove_departing_employee(sdk, username)
 
+    prefetch_user_ids_if_needed(state, file_rows)
     run_bulk_process(
         handle_row,
         file_rows,
@@ -15,15 +15,20 @@ from code42cli.bulk import run_bulk_process
 from code42cli.click_ext.groups import OrderedGroup
 from code42cli.click_ext.options import incompatible_with
 from code42cli.click_ext.types import MagicDate
+from code42cli.cmds.shared import get_all_users
 from code42cli.date_helper import round_datetime_to_day_end
 from code42cli.date_helper import round_datetime_to_day_start
 from code42cli.errors import Code42CLIError
 from code42cli.file_readers import read_csv_arg
+from code42cli.options import bulk_options
 from code42cli.options import format_option
+from code42cli.options import results_file_option
 from code42cli.options import sdk_options
+from code42cli.options import workers_option
 from code42cli.output_formats import DataFrameOutputFormatter
 from code42cli.output_formats import OutputFormat
 from code42cli.output_formats import OutputFormatter
+from code42cli.result_sinks import create_result_sink
 
 
 @click.group(cls=OrderedGroup)
@@ -296,6 +301,7 @@ include_usernames_option = click.option(
     "Argument format options are the same as --last-connected-before.",
 )
 @format_option
+@workers_option()
 @sdk_options()
 def list_devices(
     state,
@@ -448,12 +454,8 @@ def _add_settings_to_dataframe(sdk, device_dataframe):
 
 
 def _add_usernames_to_device_dataframe(sdk, device_dataframe):
-    users_generator = sdk.users.get_all()
-    users_list = []
-    for page in users_generator:
-        users_list.extend(page["users"])
     users_dataframe = DataFrame.from_records(
-        users_list, columns=["username", "userUid"]
+        get_all_users(sdk), columns=["username", "userUid"]
     )
     return device_dataframe.merge(users_dataframe, how="left", on="userUid")
 
@@ -484,9 +486,11 @@ def _break_backup_usage_into_total_storage(backup_usage):
 @org_uid_option
 @include_usernames_option
 @format_option
+@results_file_option
+@workers_option()
 @sdk_options()
 def list_backup_sets(
-    state, active, inactive, org_uid, include_usernames, format,
+    state, active, inactive, org_uid, include_usernames, format, results_file,
 ):
     """Get information about many devices and their backup sets."""
     if inactive:
@@ -495,6 +499,9 @@ def list_backup_sets(
     df = _get_device_dataframe(state.sdk, columns, active, org_uid)
     if include_usernames:
         df = _add_usernames_to_device_dataframe(state.sdk, df)
+    if results_file:
+        _write_backup_set_settings(state.sdk, df, create_result_sink(results_file))
+        return
     df = _add_backup_set_settings_to_dataframe(state.sdk, df)
     if df.empty:
         click.echo("No results found.")
@@ -507,36 +514,7 @@ def _add_backup_set_settings_to_dataframe(sdk, devices_dataframe):
     rows = [{"guid": guid} for guid in devices_dataframe["guid"].values]
 
     def handle_row(guid):
-        try:
-            current_device_settings = sdk.devices.get_settings(guid)
-        except Exception as e:
-            return DataFrame.from_records(
-                [
-                    {
-                        "guid": guid,
-                        "ERROR": "Unable to retrieve device settings for {}: {}".format(
-                            guid, e
-                        ),
-                    }
-                ]
-            )
-        current_result_dataframe = DataFrame.from_records(
-            [
-                {
-                    "guid": current_device_settings.guid,
-                    "backup set name": backup_set["name"],
-                    "destinations": [
-                        destination for destination in backup_set.destinations.values()
-                    ],
-                    "included files": backup_set.included_files,
-                    "excluded files": backup_set.excluded_files,
-                    "filename exclusions": backup_set.filename_exclusions,
-                    "locked": backup_set.locked,
-                }
-                for backup_set in current_device_settings.backup_sets
-            ]
-        )
-        return current_result_dataframe
+        return _get_backup_set_settings_dataframe(sdk, guid)
 
     result_list = run_bulk_process(
         handle_row, rows, progress_label="Getting device settings"
@@ -547,6 +525,59 @@ def _add_backup_set_settings_to_dataframe(sdk, devices_dataframe):
         return devices_dataframe
 
 
+def _write_backup_set_settings(sdk, devices_dataframe, result_sink):
+    """Writes a row per backup set, merged with its device's row from `devices_dataframe`, to
+    `result_sink` as each device's settings are retrieved."""
+    devices_by_guid = {
+        device["guid"]: device for device in devices_dataframe.to_dict("records")
+    }
+    rows = [{"guid": guid} for guid in devices_by_guid]
+
+    def handle_row(guid):
+        settings_dataframe = _get_backup_set_settings_dataframe(sdk, guid)
+        device_dataframe = DataFrame.from_records([devices_by_guid[guid]])
+        return device_dataframe.merge(settings_dataframe, how="left", on="guid")
+
+    run_bulk_process(
+        handle_row,
+        rows,
+        progress_label="Getting device settings",
+        result_sink=result_sink,
+    )
+
+
+def _get_backup_set_settings_dataframe(sdk, guid):
+    try:
+        current_device_settings = sdk.devices.get_settings(guid)
+    except Exception as e:
+        return DataFrame.from_records(
+            [
+                {
+                    "guid": guid,
+                    "ERROR": "Unable to retrieve device settings for {}: {}".format(
+                        guid, e
+                    ),
+                }
+            ]
+        )
+    return DataFrame.from_records(
+        [
+            {
+                "guid": current_device_settings.guid,
+                "backup set name": backup_set["name"],
+                "destinations": [
+                    destination for destination in backup_set.destinations.values()
+                ],
+                "included files": backup_set.included_files,
+                "excluded files": backup_set.excluded_files,
+                "filename exclusions": backup_set.filename_exclusions,
+                "locked": backup_set.locked,
+            }
+            for backup_set in current_device_settings.backup_sets
+        ]
+    )
+
+
 @devices.group(cls=OrderedGroup)
 @sdk_options(hidden=True)
 def bulk(state):
@@ -569,14 +600,18 @@ bulk.add_command(devices_generate_template)
 
 
 @bulk.command(name="deactivate")
-@read_csv_arg(headers=_bulk_device_activation_headers)
+@read_csv_arg(headers=_bulk_device_activation_headers, stream=False)
+@bulk_options
 @change_device_name_option(
     "Prepend 'deactivated_<current_date>' to the name of any successfully deactivated devices."
 )
 @purge_date_option
 @format_option
+@results_file_option
 @sdk_options()
-def bulk_deactivate(state, csv_rows, change_device_name, purge_date, format):
+def bulk_deactivate(
+    state, csv_rows, change_device_name, purge_date, format, results_file
+):
     """Deactivate all devices from the provided CSV containing a 'guid' column."""
     sdk = state.sdk
     csv_rows[0]["deactivated"] = False
@@ -595,17 +630,25 @@ def bulk_deactivate(state, csv_rows, change_device_name, purge_date, format):
             row["deactivated"] = "False: {}".format(e)
         return row
 
+    result_sink = create_result_sink(results_file) if results_file else None
     result_rows = run_bulk_process(
-        handle_row, csv_rows, progress_label="Deactivating devices:"
+        handle_row,
+        csv_rows,
+        progress_label="Deactivating devices:",
+        is_success=lambda row: row["deactivated"] == "True",
+        result_sink=result_sink,
     )
-    formatter.echo_formatted_list(result_rows)
+    if not result_sink:
+        formatter.echo_formatted_list(result_rows)
 
 
 @bulk.command(name="reactivate")
-@read_csv_arg(headers=_bulk_device_activation_headers)
+@read_csv_arg(headers=_bulk_device_activation_headers, stream=False)
+@bulk_options
 @format_option
+@results_file_option
 @sdk_options()
-def bulk_reactivate(state, csv_rows, format):
+def bulk_reactivate(state, csv_rows, format, results_file):
     """Reactivate all devices from the provided CSV containing a 'guid' column."""
     sdk = state.sdk
     csv_rows[0]["reactivated"] = False
@@ -619,7 +662,13 @@ def bulk_reactivate(state, csv_rows, format):
             row["reactivated"] = "False: {}".format(e)
         return row
 
+    result_sink = create_result_sink(results_file) if results_file else None
     result_rows = run_bulk_process(
-        handle_row, csv_rows, progress_label="Reactivating devices:"
+        handle_row,
+        csv_rows,
+        progress_label="Reactivating devices:",
+        is_success=lambda row: row["reactivated"] == "True",
+        result_sink=result_sink,
     )
-    formatter.echo_formatted_list(result_rows)
+    if not result_sink:
+        formatter.echo_formatted_list(result_rows)
@@ -17,9 +17,12 @@ from code42cli.cmds.detectionlists.options import cloud_alias_option
 from code42cli.cmds.detectionlists.options import notes_option
 from code42cli.cmds.detectionlists.options import username_arg
 from code42cli.cmds.shared import get_user_id
+from code42cli.cmds.shared import prefetch_user_ids_if_needed
 from code42cli.file_readers import read_csv_arg
 from code42cli.file_readers import read_flat_file_arg
+from code42cli.options import bulk_options
 from code42cli.options import format_option
+from code42cli.options import prefetch_users_option
 from code42cli.options import sdk_options
 
 
@@ -129,6 +132,8 @@ bulk.add_command(high_risk_employee_generate_template)
     "format: {}.".format(",".join(HIGH_RISK_EMPLOYEE_CSV_HEADERS)),
 )
 @read_csv_arg(headers=HIGH_RISK_EMPLOYEE_CSV_HEADERS)
+@bulk_options
+@prefetch_users_option
 @sdk_options()
 def bulk_add(state, csv_rows):
     sdk = state.sdk
@@ -136,6 +141,7 @@ def bulk_add(state, csv_rows):
     def handle_row(username, cloud_alias, risk_tag, notes):
         _add_high_risk_employee(sdk, username, cloud_alias, risk_tag, notes)
 
+    prefetch_user_ids_if_needed(state, csv_rows)
     run_bulk_process(
         handle_row,
         csv_rows,
@@ -149,6 +155,8 @@ def bulk_add(state, csv_rows):
     "of usernames.",
 )
 @read_flat_file_arg
+@bulk_options
+@prefetch_users_option
 @sdk_options()
 def bulk_remove(state, file_rows):
     sdk = state.sdk
@@ -156,6 +164,7 @@ def bulk_remove(state, file_rows):
     def handle_row(username):
         _remove_high_risk_employee(sdk, username)
 
+    prefetch_user_ids_if_needed(state, file_rows)
     run_bulk_process(
         handle_row,
         file_rows,
@@ -170,6 +179,8 @@ def bulk_remove(state, file_rows):
     ),
 )
 @read_csv_arg(headers=RISK_TAG_CSV_HEADERS)
+@bulk_options
+@prefetch_users_option
 @sdk_options()
 def bulk_add_risk_tags(state, csv_rows):
     sdk = state.sdk
@@ -177,6 +188,7 @@ def bulk_add_risk_tags(state, csv_rows):
     def handle_row(username, tag):
         _add_risk_tags(sdk, username, tag)
 
+    prefetch_user_ids_if_needed(state, csv_rows)
     run_bulk_process(
         handle_row, csv_rows, progress_label="Adding risk tags to users:",
     )
@@ -189,6 +201,8 @@ def bulk_add_risk_tags(state, csv_rows):
     ),
 )
 @read_csv_arg(headers=RISK_TAG_CSV_HEADERS)
+@bulk_options
+@prefetch_users_option
 @sdk_options()
 def bulk_remove_risk_tags(state, csv_rows):
     sdk = state.sdk
@@ -196,6 +210,7 @@ def bulk_remove_risk_tags(state, csv_rows):
     def handle_row(username, tag):
         _remove_risk_tags(sdk, username, tag)
 
+    prefetch_user_ids_if_needed(state, csv_rows)
     run_bulk_process(
         handle_row, csv_rows, progress_label="Removing risk tags from users:",
     )
@@ -9,9 +9,12 @@ from code42cli.bulk import generate_template_cmd_factory
 from code42cli.bulk import run_bulk_process
 from code42cli.click_ext.groups import OrderedGroup
 from code42cli.cmds.shared import get_user_id
+from code42cli.cmds.shared import prefetch_user_ids_if_needed
 from code42cli.errors import UserNotInLegalHoldError
 from code42cli.file_readers import read_csv_arg
+from code42cli.options import bulk_options
 from code42cli.options import format_option
+from code42cli.options import prefetch_users_option
 from code42cli.options import sdk_options
 from code42cli.options import set_begin_default_dict
 from code42cli.options import set_end_default_dict
@@ -195,6 +198,8 @@ bulk.add_command(legal_hold_generate_template)
     ),
 )
 @read_csv_arg(headers=LEGAL_HOLD_CSV_HEADERS)
+@bulk_options
+@prefetch_users_option
 @sdk_options()
 def bulk_add(state, csv_rows):
     sdk = state.sdk
@@ -202,6 +207,7 @@ def bulk_add(state, csv_rows):
     def handle_row(matter_id, username):
         _add_user_to_legal_hold(sdk, matter_id, username)
 
+    prefetch_user_ids_if_needed(state, csv_rows)
     run_bulk_process(handle_row, csv_rows, progress_label="Adding users to legal hold:")
 
 
@@ -211,6 +217,8 @@ def bulk_add(state, csv_rows):
     )
 )
 @read_csv_arg(headers=LEGAL_HOLD_CSV_HEADERS)
+@bulk_options
+@prefetch_users_option
 @sdk_options()
 def remove(state, csv_rows):
     sdk = state.sdk
@@ -218,6 +226,7 @@ def remove(state, csv_rows):
     def handle_row(matter_id, username):
         _remove_user_from_legal_hold(sdk, matter_id, username)
 
+    prefetch_user_ids_if_needed(state, csv_rows)
     run_bulk_process(
         handle_row, csv_rows, progress_label="Removing users from legal hold:"
     )
@@ -6,6 +6,7 @@ from click import secho
 from py42.exceptions import Py42MFARequiredError
 
 import code42cli.profile as cliprofile
+from code42cli.click_ext.types import WorkerCount
 from code42cli.errors import Code42CLIError
 from code42cli.options import yes_option
 from code42cli.profile import CREATE_PROFILE_HELP
@@ -64,6 +65,27 @@ disable_ssl_option = click.option(
     default=None,
 )
 
+bulk_workers_option = click.option(
+    "--workers",
+    type=WorkerCount(),
+    help="The number of rows bulk commands process concurrently when `--workers` is not passed, "
+    "or 'auto' to adjust concurrency based on server latency and throttling.",
+)
+
+rate_limit_option = click.option(
+    "--rate-limit",
+    type=click.FloatRange(min=0),
+    help="The most requests per second to make to Code42 with this profile, across all "
+    "commands and threads in a single run. Use 0 to remove the limit.",
+)
+
+rate_limit_burst_option = click.option(
+    "--rate-limit-burst",
+    type=click.IntRange(min=0),
+    help="The most requests to make at once before `--rate-limit` applies. Defaults to one "
+    "second's worth of requests. Use 0 to restore the default.",
+)
+
 
 @profile.command()
 @profile_name_arg()
@@ -74,6 +96,12 @@ def show(profile_name):
     echo("\t* username = {}".format(c42profile.username))
     echo("\t* authority url = {}".format(c42profile.authority_url))
     echo("\t* ignore-ssl-errors = {}".format(c42profile.ignore_ssl_errors))
+    if c42profile.bulk_workers:
+        echo("\t* bulk-workers = {}".format(c42profile.bulk_workers))
+    if c42profile.rate_limit:
+        echo("\t* rate-limit = {}".format(c42profile.rate_limit))
+    if c42profile.rate_limit_burst:
+        echo("\t* rate-limit-burst = {}".format(c42profile.rate_limit_burst))
     if cliprofile.get_stored_password(c42profile.name) is not None:
         echo("\t* A password is set.")
     echo("")
@@ -103,17 +131,46 @@ def create(name, server, username, password, disable_ssl_errors):
 @username_option()
 @password_option
 @disable_ssl_option
-def update(name, server, username, password, disable_ssl_errors):
+@bulk_workers_option
+@rate_limit_option
+@rate_limit_burst_option
+def update(
+    name,
+    server,
+    username,
+    password,
+    disable_ssl_errors,
+    workers,
+    rate_limit,
+    rate_limit_burst,
+):
     """Update an existing profile."""
     c42profile = cliprofile.get_profile(name)
 
-    if not server and not username and not password and disable_ssl_errors is None:
+    if (
+        not server
+        and not username
+        and not password
+        and disable_ssl_errors is None
+        and workers is None
+        and rate_limit is None
+        and rate_limit_burst is None
+    ):
         raise click.UsageError(
-            "Must provide at least one of `--username`, `--server`, `--password`, or "
-            "`--disable-ssl-errors` when updating a profile."
+            "Must provide at least one of `--username`, `--server`, `--password`, "
+            "`--disable-ssl-errors`, `--workers`, `--rate-limit`, or `--rate-limit-burst` "
+            "when updating a profile."
         )
 
-    cliprofile.update_profile(c42profile.name, server, username, disable_ssl_errors)
+    cliprofile.update_profile(
+        c42profile.name,
+        server,
+        username,
+        disable_ssl_errors,
+        workers,
+        rate_limit,
+        rate_limit_burst,
+    )
     if password:
         _set_pw(name, password)
     elif not c42profile.has_stored_password:
@@ -1,14 +1,19 @@
 import click
 
 from code42cli.errors import Code42CLIError
+from code42cli.logger import flush_handlers
 from code42cli.logger import get_logger_for_server
 from code42cli.logger.enums import ServerProtocol
 from code42cli.output_formats import OutputFormat
 
 
-def _try_get_logger_for_server(hostname, protocol, output_format, certs):
+def _try_get_logger_for_server(
+    hostname, protocol, output_format, certs, queue_size=None
+):
     try:
-        return get_logger_for_server(hostname, protocol, output_format, certs)
+        return get_logger_for_server(
+            hostname, protocol, output_format, certs, queue_size=queue_size
+        )
     except Exception as err:
         raise Code42CLIError(
             "Unable to connect to {}. Failed with error: {}.".format(hostname, str(err))
@@ -22,15 +27,19 @@ class SendToCommand(click.Command):
         protocol = ctx.params.get("protocol")
         output_format = ctx.params.get("format", OutputFormat.RAW)
         ignore_cert_validation = ctx.params.get("ignore_cert_validation")
+        queue_size = ctx.params.get("queue_size")
         _handle_incompatible_args(protocol, ignore_cert_validation, certs)
 
         if ignore_cert_validation:
             certs = "ignore"
 
         ctx.obj.logger = _try_get_logger_for_server(
-            hostname, protocol, output_format, certs
+            hostname, protocol, output_format, certs, queue_size=queue_size
         )
-        return super().invoke(ctx)
+        result = super().invoke(ctx)
+        # Wait for records still queued to be sent, so that send errors fail the command.
+        flush_handlers(ctx.obj.logger)
+        return result
 
 
 def _handle_incompatible_args(protocol, ignore_cert_validation, certs):
@@ -1,15 +1,23 @@
-import json
 import os
+import sqlite3
+from contextlib import contextmanager
 from os import path
+from threading import Lock
 
+import code42cli.json_backend as json_backend
 from code42cli.errors import Code42CLIError
 from code42cli.util import get_user_project_path
 
+# How long to wait for another process (such as a concurrent cron job) to finish writing before
+# giving up.
+_LOCK_TIMEOUT_SECONDS = 30
+_EVENTS_FILE_SUFFIX = "_events"
+
 
 class Cursor:
-    def __init__(self, location):
-        self._location = location
-        self._name = path.basename(location)
+    def __init__(self, name, value):
+        self._name = name
+        self._value = value
 
     @property
     def name(self):
@@ -17,85 +25,287 @@ class Cursor:
 
     @property
     def value(self):
-        with open(self._location) as checkpoint:
-            return checkpoint.read()
+        return self._value
 
 
 class BaseCursorStore:
-    def __init__(self, dir_path):
-        self._dir_path = dir_path
+    """Stores checkpoints of one kind for a profile in a SQLite database shared by every kind,
+    `~/.code42cli/checkpoints/<profile>.db`.
+
+    The database uses write-ahead logging so that commands running at the same time under the
+    same profile don't block each other's reads, and every update is a single transaction so a
+    crash can't leave a checkpoint half written.
+
+    Checkpoints used to be stored as one file per checkpoint in `legacy_dir_path`. They are
+    moved into the database the first time the store is used.
+
+    Args:
+        db_path (str): The path to the SQLite database file.
+        kind (str): The kind of checkpoints in this store, such as `file_events`.
+        legacy_dir_path (str): The directory checkpoint files were stored in before, if any.
+    """
+
+    def __init__(self, db_path, kind, legacy_dir_path=None):
+        self._db_path = db_path
+        self._kind = kind
+        self._legacy_dir_path = legacy_dir_path
+        self._connection = None
+        self._lock = Lock()
 
     def get(self, cursor_name):
         """Gets the last stored date observed timestamp."""
-        try:
-            location = path.join(self._dir_path, cursor_name)
-            with open(location) as checkpoint:
-                return float(checkpoint.read())
-        except FileNotFoundError:
-            return None
+        row = self._fetch_one(
+            "SELECT value FROM cursors WHERE kind = ? AND name = ?", cursor_name
+        )
+        return row[0] if row else None
 
     def replace(self, cursor_name, new_timestamp):
         """Replaces the last stored date observed timestamp with the given one."""
-        location = path.join(self._dir_path, cursor_name)
-        with open(location, "w") as checkpoint:
-            checkpoint.write(str(new_timestamp))
+        with self._transaction() as connection:
+            _upsert(connection, self._kind, cursor_name, "value", float(new_timestamp))
+
+    def get_events(self, cursor_name):
+        """Gets the hashes of the events stored with the cursor, or an empty list."""
+        row = self._fetch_one(
+            "SELECT events FROM cursors WHERE kind = ? AND name = ?", cursor_name
+        )
+        return _load_events(row[0]) if row else []
+
+    def replace_events(self, cursor_name, new_events):
+        """Replaces the event hashes stored with the cursor."""
+        with self._transaction() as connection:
+            _upsert(
+                connection,
+                self._kind,
+                cursor_name,
+                "events",
+                json_backend.dumps(new_events),
+            )
+
+    def replace_checkpoint(self, cursor_name, new_timestamp, new_events):
+        """Replaces the timestamp and the event hashes of the cursor in a single transaction."""
+        with self._transaction() as connection:
+            _upsert(connection, self._kind, cursor_name, "value", float(new_timestamp))
+            _upsert(
+                connection,
+                self._kind,
+                cursor_name,
+                "events",
+                json_backend.dumps(new_events),
+            )
 
     def delete(self, cursor_name):
         """Removes a single cursor from the store."""
-        try:
-            location = path.join(self._dir_path, cursor_name)
-            os.remove(location)
-        except FileNotFoundError:
+        with self._transaction() as connection:
+            deleted = connection.execute(
+                "DELETE FROM cursors WHERE kind = ? AND name = ?",
+                (self._kind, cursor_name),
+            ).rowcount
+        if not deleted:
             msg = "No checkpoint named {} exists for this profile.".format(cursor_name)
             raise Code42CLIError(msg)
 
     def clean(self):
         """Removes all cursors from this store."""
-        cursors = self.get_all_cursors()
-        for cursor in cursors:
-            self.delete(cursor.name)
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM cursors WHERE kind = ?", (self._kind,))
 
     def get_all_cursors(self):
-        """Returns a list of all cursors stored in this directory (which is typically scoped to a profile)."""
-        dir_contents = os.listdir(self._dir_path)
-        return [Cursor(f) for f in dir_contents if self._is_file(f)]
+        """Returns a list of all cursors in this store (which is typically scoped to a profile)."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT name, value FROM cursors WHERE kind = ? ORDER BY name",
+                (self._kind,),
+            )
+            return [Cursor(name, value) for name, value in rows]
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _fetch_one(self, query, cursor_name):
+        with self._lock:
+            return self._connect().execute(query, (self._kind, cursor_name)).fetchone()
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            connection = self._connect()
+            # Take the write lock up front so that concurrent writers wait for each other instead
+            # of failing when they try to upgrade a read transaction.
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _connect(self):
+        if self._connection is None:
+            # Transactions are managed explicitly (see `_transaction`). The store may be used
+            # from a background extraction thread.
+            connection = sqlite3.connect(
+                self._db_path,
+                timeout=_LOCK_TIMEOUT_SECONDS,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cursors (kind TEXT, name TEXT, value REAL, "
+                "events TEXT, PRIMARY KEY (kind, name))"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS migrations (kind TEXT PRIMARY KEY)"
+            )
+            self._connection = connection
+            self._migrate_legacy_files()
+        return self._connection
+
+    def _migrate_legacy_files(self):
+        if not self._legacy_dir_path or not path.isdir(self._legacy_dir_path):
+            return
+
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            migrated = connection.execute(
+                "SELECT 1 FROM migrations WHERE kind = ?", (self._kind,)
+            ).fetchone()
+            if migrated:
+                # Files written back by an older version after the migration are left alone;
+                # only the pass that read the files may remove them.
+                connection.execute("ROLLBACK")
+                return
+            checkpoints = self._read_legacy_files()
+            connection.executemany(
+                "INSERT OR IGNORE INTO cursors VALUES (?, ?, ?, ?)",
+                [(self._kind, *checkpoint) for checkpoint in checkpoints],
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO migrations VALUES (?)", (self._kind,)
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+        # Files that couldn't be read are left where they are rather than lost.
+        for file_name, _, _ in checkpoints:
+            location = path.join(self._legacy_dir_path, file_name)
+            for migrated_location in (location, location + _EVENTS_FILE_SUFFIX):
+                try:
+                    os.remove(migrated_location)
+                except OSError:
+                    pass
+        try:
+            os.rmdir(self._legacy_dir_path)
+        except OSError:
+            pass
 
-    def _is_file(self, node_name):
-        return path.isfile(path.join(self._dir_path, node_name))
+    def _read_legacy_files(self):
+        checkpoints = []
+        for file_name in os.listdir(self._legacy_dir_path):
+            location = path.join(self._legacy_dir_path, file_name)
+            if file_name.endswith(_EVENTS_FILE_SUFFIX) or not path.isfile(location):
+                continue
+            try:
+                with open(location) as checkpoint:
+                    value = float(checkpoint.read())
+            except ValueError:
+                continue
+            events = None
+            events_location = location + _EVENTS_FILE_SUFFIX
+            if path.isfile(events_location):
+                with open(events_location) as checkpoint:
+                    events = checkpoint.read()
+            checkpoints.append((file_name, value, events))
+        return checkpoints
 
 
 class FileEventCursorStore(BaseCursorStore):
     def __init__(self, profile_name):
-        dir_path = get_user_project_path("file_event_checkpoints", profile_name)
-        super().__init__(dir_path)
+        super().__init__(
+            _get_db_path(profile_name),
+            "file_events",
+            _get_legacy_dir_path("file_event_checkpoints", profile_name),
+        )
 
 
 class AlertCursorStore(BaseCursorStore):
     def __init__(self, profile_name):
-        dir_path = get_user_project_path("alert_checkpoints", profile_name)
-        super().__init__(dir_path)
+        super().__init__(
+            _get_db_path(profile_name),
+            "alerts",
+            _get_legacy_dir_path("alert_checkpoints", profile_name),
+        )
 
 
 class AuditLogCursorStore(BaseCursorStore):
     def __init__(self, profile_name):
-        dir_path = get_user_project_path("audit_log_checkpoints", profile_name)
-        super().__init__(dir_path)
+        super().__init__(
+            _get_db_path(profile_name),
+            "audit_logs",
+            _get_legacy_dir_path("audit_log_checkpoints", profile_name),
+        )
+
+
+class MemoryCursorStore:
+    """Keeps checkpoints in memory for the life of the process, such as the position of a
+    `--follow` run that doesn't use `--use-checkpoint`."""
+
+    def __init__(self):
+        self._timestamps = {}
+        self._events = {}
+
+    def get(self, cursor_name):
+        return self._timestamps.get(cursor_name)
+
+    def replace(self, cursor_name, new_timestamp):
+        self._timestamps[cursor_name] = float(new_timestamp)
 
     def get_events(self, cursor_name):
-        try:
-            location = path.join(self._dir_path, cursor_name) + "_events"
-            with open(location) as checkpoint:
-                try:
-                    return json.loads(checkpoint.read())
-                except json.JSONDecodeError:
-                    return []
-        except FileNotFoundError:
-            return []
+        return list(self._events.get(cursor_name, []))
 
     def replace_events(self, cursor_name, new_events):
-        location = path.join(self._dir_path, cursor_name) + "_events"
-        with open(location, "w") as checkpoint:
-            checkpoint.write(json.dumps(new_events))
+        self._events[cursor_name] = list(new_events)
+
+    def replace_checkpoint(self, cursor_name, new_timestamp, new_events):
+        self.replace(cursor_name, new_timestamp)
+        self.replace_events(cursor_name, new_events)
+
+
+def _get_db_path(profile_name):
+    return path.join(get_user_project_path("checkpoints"), f"{profile_name}.db")
+
+
+def _get_legacy_dir_path(dir_name, profile_name):
+    # Don't create the directory like `get_user_project_path` would; it only exists if there are
+    # checkpoint files left to migrate.
+    return path.join(get_user_project_path(), dir_name, profile_name)
+
+
+def _upsert(connection, kind, cursor_name, column, value):
+    # `INSERT ... ON CONFLICT` isn't available in the SQLite versions of some older platforms.
+    connection.execute(
+        "INSERT OR IGNORE INTO cursors (kind, name) VALUES (?, ?)", (kind, cursor_name)
+    )
+    connection.execute(
+        f"UPDATE cursors SET {column} = ? WHERE kind = ? AND name = ?",
+        (value, kind, cursor_name),
+    )
+
+
+def _load_events(events):
+    if not events:
+        return []
+    try:
+        return json_backend.loads(events)
+    except ValueError:
+        return []
 
 
 def get_all_cursor_stores_for_profile(profile_name):
@@ -1,4 +1,9 @@
-import json
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from threading import Event
+from threading import Semaphore
+from threading import Thread
 
 import click
 from c42eventextractor import ExtractionHandlers
@@ -7,13 +12,21 @@ from py42.sdk.queries.query_filter import QueryFilterTimestampField
 
 import code42cli.errors as errors
 from code42cli.date_helper import verify_timestamp_order
+from code42cli.logger import flush_handlers
 from code42cli.logger import get_main_cli_logger
 from code42cli.output_formats import OutputFormat
+from code42cli.sdk_client import ensure_max_connections
 from code42cli.util import warn_interrupt
 
 logger = get_main_cli_logger()
 
 _ALERT_DETAIL_BATCH_SIZE = 100
+# The most alert detail batches requested at once.
+_ALERT_DETAIL_MAX_WORKERS = 4
+# How many fetched pages may wait while the page before them is output.
+PREFETCH_DEPTH = 2
+# The key of the unique ID of each kind of event, by the extractor's key.
+_EVENT_ID_KEYS = {"fileEvents": "eventId", "alerts": "id"}
 INTERRUPT_WARNING = (
     "Attempting to cancel cleanly to keep checkpoint data accurate. One moment..."
 )
@@ -30,27 +43,39 @@ def try_get_default_header(include_all, default_header, output_format):
     return output_header
 
 
-def _get_alert_details(sdk, alert_summary_list):
+def _get_alert_details(sdk, alert_summary_list, batch_size=None):
+    batch_size = batch_size or _ALERT_DETAIL_BATCH_SIZE
     alert_ids = [alert["id"] for alert in alert_summary_list]
     batches = [
-        alert_ids[i : i + _ALERT_DETAIL_BATCH_SIZE]
-        for i in range(0, len(alert_ids), _ALERT_DETAIL_BATCH_SIZE)
+        alert_ids[i : i + batch_size] for i in range(0, len(alert_ids), batch_size)
     ]
-    results = []
-    for batch in batches:
-        r = sdk.alerts.get_details(batch)
-        results.extend(r["alerts"])
-    results = sorted(results, key=lambda x: x["createdAt"], reverse=True)
-    return results
 
+    def get_batch_details(batch):
+        details = sdk.alerts.get_details(batch)["alerts"]
+        return sorted(details, key=_get_created_at, reverse=True)
 
-def _set_handlers(cursor_store, checkpoint_name):
+    if len(batches) > 1:
+        worker_count = min(len(batches), _ALERT_DETAIL_MAX_WORKERS)
+        ensure_max_connections(worker_count)
+        with ThreadPoolExecutor(worker_count) as executor:
+            sorted_batches = list(executor.map(get_batch_details, batches))
+    else:
+        sorted_batches = [get_batch_details(batch) for batch in batches]
+    return list(heapq.merge(*sorted_batches, key=_get_created_at, reverse=True))
+
+
+def _get_created_at(alert):
+    return alert["createdAt"]
+
+
+def _set_handlers(cursor_store, checkpoint_name, event_id_key=None):
     handlers = ExtractionHandlers()
     handlers.TOTAL_EVENTS = 0
 
     def handle_error(exception):
         if isinstance(exception, OSError):  # let click handle it
-            raise
+            # Errors from a background extractor are handled outside of an `except` block.
+            raise exception
 
         errors.ERRORED = True
         if hasattr(exception, "response") and hasattr(exception.response, "text"):
@@ -66,46 +91,117 @@ def _set_handlers(cursor_store, checkpoint_name):
         secho(message, err=True, fg="red")
 
     handlers.handle_error = handle_error
+    handlers.filter_checkpointed_events = lambda events: events
+    handlers.record_checkpoint = lambda timestamp, event_ids: (
+        handlers.record_cursor_position(timestamp)
+    )
     if cursor_store:
         handlers.record_cursor_position = lambda value: cursor_store.replace(
             checkpoint_name, value
         )
         handlers.get_cursor_position = lambda: cursor_store.get(checkpoint_name)
+        if event_id_key:
+            boundary = _CheckpointBoundary(cursor_store, checkpoint_name, event_id_key)
+            handlers.filter_checkpointed_events = boundary.filter_events
+            handlers.record_checkpoint = boundary.record
     return handlers
 
 
-def _get_events(sdk, handlers, extractor_key, response):
-    response_dict = json.loads(response.text)
-    events = response_dict.get(extractor_key)
+class _CheckpointBoundary:
+    """Keeps the IDs of the events output at the latest cursor timestamp with the checkpoint.
+
+    A checkpointed run starts from the stored timestamp, so events at that timestamp can be
+    returned again; those whose IDs were stored are filtered out. Only the IDs at the single
+    latest timestamp are kept, which keeps the stored set small."""
+
+    def __init__(self, cursor_store, checkpoint_name, event_id_key):
+        self._cursor_store = cursor_store
+        self._checkpoint_name = checkpoint_name
+        self._event_id_key = event_id_key
+        self._timestamp = cursor_store.get(checkpoint_name)
+        self._event_ids = list(cursor_store.get_events(checkpoint_name))
+        self._checkpointed_ids = set(self._event_ids)
+
+    def filter_events(self, events):
+        if not events or not self._checkpointed_ids:
+            return events
+        key = self._event_id_key
+        return [
+            event for event in events if event.get(key) not in self._checkpointed_ids
+        ]
+
+    def record(self, timestamp, event_ids):
+        if timestamp == self._timestamp:
+            self._event_ids.extend(event_ids)
+        else:
+            self._timestamp = timestamp
+            self._event_ids = list(event_ids)
+        # A `--follow` poll starts again from this timestamp without creating new handlers.
+        self._checkpointed_ids = set(self._event_ids)
+        self._cursor_store.replace_checkpoint(
+            self._checkpoint_name, timestamp, self._event_ids
+        )
+
+
+def _get_events(sdk, handlers, extractor_key, response, alert_details_batch_size=None):
+    # py42 has already parsed the response (and the extractor may have truncated its events), so
+    # use the parsed events rather than dumping and re-parsing `response.text`.
+    try:
+        events = response[extractor_key]
+    except KeyError:
+        events = None
     if extractor_key == "alerts":
         try:
-            events = _get_alert_details(sdk, events)
+            events = _get_alert_details(sdk, events, alert_details_batch_size)
         except Exception as ex:
             handlers.handle_error(ex)
     return events
 
 
-def _record_timestamp(extractor, handlers, event):
-    last_event_timestamp = extractor._get_timestamp_from_item(event)
-    handlers.record_cursor_position(last_event_timestamp)
+def _record_timestamp(extractor, handlers, events):
+    # File events are sorted oldest first and alert details newest first, so the latest cursor
+    # timestamp is at one end or the other.
+    latest_event = events[-1]
+    timestamp = extractor._get_timestamp_from_item(latest_event)
+    if len(events) > 1:
+        first_timestamp = extractor._get_timestamp_from_item(events[0])
+        if first_timestamp > timestamp:
+            latest_event, timestamp = events[0], first_timestamp
+
+    term = extractor._timestamp_filter._term
+    latest = latest_event.get(term)
+    id_key = _EVENT_ID_KEYS.get(extractor._key)
+    event_ids = [event.get(id_key) for event in events if event.get(term) == latest]
+    handlers.record_checkpoint(timestamp, event_ids)
 
 
 def create_handlers(
-    sdk, extractor_class, cursor_store, checkpoint_name, formatter, force_pager
+    sdk,
+    extractor_class,
+    cursor_store,
+    checkpoint_name,
+    formatter,
+    force_pager,
+    alert_details_batch_size=None,
 ):
     extractor = extractor_class(sdk, ExtractionHandlers())
-    handlers = _set_handlers(cursor_store, checkpoint_name)
+    handlers = _set_handlers(
+        cursor_store, checkpoint_name, _EVENT_ID_KEYS.get(extractor._key)
+    )
 
     @warn_interrupt(warning=INTERRUPT_WARNING)
     def handle_response(response):
-        events = _get_events(sdk, handlers, extractor._key, response)
+        events = _get_events(
+            sdk, handlers, extractor._key, response, alert_details_batch_size
+        )
+        events = handlers.filter_checkpointed_events(events)
         total_events = len(events)
         handlers.TOTAL_EVENTS += total_events
         formatter.echo_formatted_list(events, force_pager=force_pager)
 
         # To make sure the extractor records correct timestamp event when `CTRL-C` is pressed.
         if total_events:
-            _record_timestamp(extractor, handlers, events[-1])
+            _record_timestamp(extractor, handlers, events)
 
     handlers.handle_response = handle_response
     return handlers
@@ -137,14 +233,24 @@ def create_time_range_filter(filter_cls, begin_date=None, end_date=None):
 
 
 def create_send_to_handlers(
-    sdk, extractor_class, cursor_store, checkpoint_name, logger
+    sdk,
+    extractor_class,
+    cursor_store,
+    checkpoint_name,
+    logger,
+    alert_details_batch_size=None,
 ):
     extractor = extractor_class(sdk, ExtractionHandlers())
-    handlers = _set_handlers(cursor_store, checkpoint_name)
+    handlers = _set_handlers(
+        cursor_store, checkpoint_name, _EVENT_ID_KEYS.get(extractor._key)
+    )
 
     @warn_interrupt(warning=INTERRUPT_WARNING)
     def handle_response(response):
-        events = _get_events(sdk, handlers, extractor._key, response)
+        events = _get_events(
+            sdk, handlers, extractor._key, response, alert_details_batch_size
+        )
+        events = handlers.filter_checkpointed_events(events)
 
         total_events = len(events)
         handlers.TOTAL_EVENTS += total_events
@@ -154,12 +260,115 @@ def create_send_to_handlers(
 
         # To make sure the extractor records correct timestamp event when `CTRL-C` is pressed.
         if total_events:
-            _record_timestamp(extractor, handlers, events[-1])
+            # Only move the cursor past events once they have been sent.
+            flush_handlers(logger)
+            _record_timestamp(extractor, handlers, events)
 
     handlers.handle_response = handle_response
     return handlers
 
 
+class _StopPrefetching(Exception):
+    pass
+
+
+class _PrefetchHandlers(ExtractionHandlers):
+    """Handlers for an extractor running in a background thread. Pages, cursor positions and
+    errors are queued in order for the main thread to pass on to the real handlers. The
+    extractor's own cursor is kept in memory so that it can query for the next page before the
+    previous one has been output. Queuing a page takes one of `page_slots`, which the main thread
+    releases once it takes the page off the queue."""
+
+    def __init__(self, handlers, queue, page_slots, stopped):
+        self._handlers = handlers
+        self._queue = queue
+        self._page_slots = page_slots
+        self._stopped = stopped
+        self._cursor_position = None
+
+    def handle_response(self, response):
+        self._put("response", response)
+
+    def handle_error(self, exception):
+        if not self._stopped.is_set():
+            self._put("error", exception)
+
+    def get_cursor_position(self):
+        if self._cursor_position is None:
+            return self._handlers.get_cursor_position()
+        return self._cursor_position
+
+    def record_cursor_position(self, cursor):
+        self._cursor_position = cursor
+        self._put("cursor", cursor)
+
+    def _put(self, kind, value):
+        if kind == "response":
+            self._wait_for_page_slot()
+        elif self._stopped.is_set():
+            raise _StopPrefetching()
+        self._queue.put((kind, value))
+
+    def _wait_for_page_slot(self):
+        while not self._stopped.is_set():
+            if self._page_slots.acquire(timeout=0.1):
+                return
+        raise _StopPrefetching()
+
+
+def extract_with_prefetch(extract, handlers, depth=PREFETCH_DEPTH):
+    """Calls `extract` with handlers of its own in a background thread so that the next page is
+    fetched while the current one is output by `handlers`. At most `depth` pages wait to be
+    output, and the extractor may be holding one more that it fetched while waiting for room to
+    queue it. Pages, errors and cursor positions reach `handlers` in the order the extractor
+    produced them, so the cursor only advances after the page before it has been output.
+
+    Args:
+        extract (callable): Takes handlers and runs an extractor with them.
+        handlers (ExtractionHandlers): The handlers to output pages and errors to.
+        depth (int): The most fetched pages to queue for output.
+    """
+    # Cursor positions and errors follow the pages they belong to, so only pages are limited.
+    queue = Queue()
+    page_slots = Semaphore(depth)
+    stopped = Event()
+    prefetch_handlers = _PrefetchHandlers(handlers, queue, page_slots, stopped)
+
+    def run():
+        try:
+            try:
+                extract(prefetch_handlers)
+            except _StopPrefetching:
+                raise
+            except BaseException as ex:
+                prefetch_handlers._put("raise", ex)
+                return
+            prefetch_handlers._put("done", None)
+        except _StopPrefetching:
+            pass
+
+    thread = Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            kind, value = queue.get()
+            if kind == "response":
+                page_slots.release()
+                handlers.handle_response(value)
+            elif kind == "cursor":
+                handlers.record_cursor_position(value)
+            elif kind == "error":
+                handlers.handle_error(value)
+            elif kind == "raise":
+                raise value
+            else:
+                break
+    finally:
+        # Unblocks the background thread if output stopped early.
+        stopped.set()
+    thread.join()
+
+
 def handle_no_events(no_events):
     if no_events:
         click.echo("No results found.")
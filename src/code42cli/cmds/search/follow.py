@@ -0,0 +1,87 @@
+from signal import getsignal
+from signal import signal
+from signal import SIGTERM
+from time import monotonic
+from time import sleep
+
+import click
+
+DEFAULT_FOLLOW_INTERVAL_SECONDS = 60
+# How often to check whether to stop while waiting for the next poll.
+_SLEEP_STEP_SECONDS = 1
+
+
+class FollowStopped(Exception):
+    """Raised to stop following once the current page of results has been output."""
+
+
+class Follower:
+    """Polls for new results every `interval` seconds, reusing the same SDK session, server
+    connection and cursor, until the process receives SIGTERM.
+
+    SIGTERM stops following once the page of results being output has been output (and its
+    checkpoint recorded), or right away if it arrives between polls.
+
+    Args:
+        interval (int): How many seconds to wait after a poll before starting the next one.
+    """
+
+    def __init__(self, interval=DEFAULT_FOLLOW_INTERVAL_SECONDS):
+        self.interval = interval
+        self._stopped = False
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    def stop(self):
+        self._stopped = True
+
+    def run(self, poll):
+        """Calls `poll` until stopped, waiting `interval` seconds between calls."""
+        old_handler = getsignal(SIGTERM)
+        signal(SIGTERM, self._handle_sigterm)
+        try:
+            while not self._stopped:
+                try:
+                    poll()
+                except FollowStopped:
+                    break
+                self._wait()
+        finally:
+            signal(SIGTERM, old_handler)
+
+    def stop_after_each_page(self, handlers):
+        """Makes `handlers` stop following after outputting a page once stopped."""
+        handle_response = handlers.handle_response
+
+        def handle_response_and_check_stopped(response):
+            handle_response(response)
+            if self._stopped:
+                raise FollowStopped()
+
+        handlers.handle_response = handle_response_and_check_stopped
+        return handlers
+
+    def _handle_sigterm(self, signum, frame):
+        if not self._stopped:
+            click.echo(
+                "Received SIGTERM, stopping after the current page of results.",
+                err=True,
+            )
+        self.stop()
+
+    def _wait(self):
+        # Sleep in short steps rather than waiting on a lock, which a signal handler can't safely
+        # interrupt.
+        deadline = monotonic() + self.interval
+        while not self._stopped:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return
+            sleep(min(remaining, _SLEEP_STEP_SECONDS))
+
+
+def create_follower(follow, interval):
+    """Returns a `Follower` if `--follow` was passed, otherwise `None`."""
+    return Follower(interval) if follow else None
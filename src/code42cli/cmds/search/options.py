@@ -7,7 +7,9 @@ from py42.sdk.queries.query_filter import FilterGroup
 
 from code42cli.click_ext.options import incompatible_with
 from code42cli.click_ext.types import FileOrString
+from code42cli.cmds.search.follow import DEFAULT_FOLLOW_INTERVAL_SECONDS
 from code42cli.logger.enums import ServerProtocol
+from code42cli.logger.handlers import DEFAULT_SEND_QUEUE_SIZE
 from code42cli.output_formats import SendToFileEventsOutputFormat
 
 
@@ -167,10 +169,19 @@ def server_options(f):
         default=None,
         cls=incompatible_with(["certs"]),
     )
+    queue_size_option = click.option(
+        "--queue-size",
+        type=click.IntRange(min=0),
+        default=DEFAULT_SEND_QUEUE_SIZE,
+        help="How many events to hold for sending from a background thread, which sends them "
+        "to the server in batches while the next events are prepared. Use 0 to send each event "
+        f"before preparing the next. Defaults to {DEFAULT_SEND_QUEUE_SIZE}.",
+    )
     f = hostname_arg(f)
     f = protocol_option(f)
     f = certs_option(f)
     f = ignore_cert_validation(f)
+    f = queue_size_option(f)
     return f
 
 
@@ -181,3 +192,35 @@ send_to_format_options = click.option(
     help="The output format of the result. Defaults to RAW-JSON format.",
     default=SendToFileEventsOutputFormat.RAW,
 )
+
+
+parallel_option = click.option(
+    "--parallel",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Split the time range into windows and search up to this many windows at once. Results "
+    "are still output (and checkpointed) in order. Requires --begin or an existing checkpoint. "
+    "Defaults to 1.",
+)
+
+
+def follow_options(f):
+    follow_option = click.option(
+        "--follow",
+        is_flag=True,
+        default=False,
+        cls=incompatible_with(["end"]),
+        help="Keep running and send new results every --interval seconds, reusing the same "
+        "session and server connection, until stopped with SIGTERM. The cursor is kept in "
+        "memory between polls, and stored as it goes when --use-checkpoint is passed.",
+    )
+    interval_option = click.option(
+        "--interval",
+        type=click.IntRange(min=1),
+        default=DEFAULT_FOLLOW_INTERVAL_SECONDS,
+        help="With --follow, how many seconds to wait after each poll for new results before "
+        f"the next one. Defaults to {DEFAULT_FOLLOW_INTERVAL_SECONDS}.",
+    )
+    f = follow_option(f)
+    f = interval_option(f)
+    return f
@@ -0,0 +1,183 @@
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+
+from c42eventextractor import ExtractionHandlers
+
+from code42cli.sdk_client import ensure_max_connections
+
+# How many windows the time range is split into per worker before any are fetched.
+WINDOWS_PER_WORKER = 4
+# A window whose first page reports more matching events than this is split in two.
+SPLIT_EVENT_COUNT = 30000
+# Windows are never split smaller than this many seconds.
+MIN_WINDOW_SECONDS = 60
+# How many windows per worker may be fetched ahead of the one being output.
+MAX_WINDOWS_AHEAD_PER_WORKER = 2
+
+_PRECISION = 0.001
+
+
+class TimeWindow:
+    """A range of cursor timestamps, from `begin` up to but not including `end`."""
+
+    def __init__(self, begin, end):
+        self.begin = begin
+        self.end = end
+
+    def split(self, count):
+        """Splits the window into `count` consecutive windows of (nearly) equal length. Bounds
+        are rounded down to the millisecond, so the first window never starts after `begin`."""
+        step = (self.end - self.begin) / count
+        bounds = [_round_down(self.begin + step * i) for i in range(count)] + [self.end]
+        return [
+            TimeWindow(begin, end)
+            for begin, end in zip(bounds, bounds[1:])
+            if begin < end
+        ]
+
+    def can_split(self):
+        return self.end - self.begin >= MIN_WINDOW_SECONDS * 2
+
+    @property
+    def inclusive_end(self):
+        # Both bounds are inclusive in queries, so stop one unit of precision short of `end` to
+        # keep neighboring windows from overlapping.
+        return _round(self.end - _PRECISION)
+
+    def create_filter(self, timestamp_filter):
+        return timestamp_filter.in_range(self.begin, self.inclusive_end)
+
+    def __repr__(self):
+        return f"TimeWindow({self.begin}, {self.end})"
+
+
+class _WindowResult:
+    def __init__(self):
+        self.responses = []
+        self.errors = []
+        self.split_at = None
+        self.cursor = None
+
+
+class _SplitWindow(Exception):
+    pass
+
+
+class _WindowHandlers(ExtractionHandlers):
+    """Collects the pages of a single window instead of outputting them, so that windows fetched
+    concurrently can be output in order. Stops the window after the first page if there are too
+    many events left in it for one worker."""
+
+    def __init__(self, window, result):
+        self._window = window
+        self._result = result
+        self._cursor_position = None
+        self._total_count = 0
+
+    def handle_response(self, response):
+        self._result.responses.append(response)
+        self._total_count = response._data_root.get("totalCount", 0)
+
+    def handle_error(self, exception):
+        if isinstance(exception, _SplitWindow):
+            return
+        self._result.errors.append(exception)
+
+    def record_cursor_position(self, cursor):
+        first_page = self._cursor_position is None
+        self._cursor_position = cursor
+        self._result.cursor = cursor
+        if (
+            first_page
+            and self._total_count > SPLIT_EVENT_COUNT
+            and TimeWindow(cursor, self._window.end).can_split()
+        ):
+            self._result.split_at = cursor
+            raise _SplitWindow()
+
+
+def get_time_range(handlers, begin):
+    """Returns the window of cursor timestamps to search, starting from the cursor checkpoint if
+    one exists, otherwise from `begin`, and ending now. Returns `None` if there is no start.
+
+    Events can't be stored before they happen, so cursor timestamps (when an event was stored)
+    are never earlier than `begin` (when it happened)."""
+    start = handlers.get_cursor_position() or begin
+    if not start:
+        return None
+    return TimeWindow(_round(start), _round(time() + _PRECISION))
+
+
+def extract_in_parallel(create_extractor, handlers, filters, time_range, worker_count):
+    """Splits `time_range` into windows and extracts them with `worker_count` concurrent
+    extractors, passing each page to `handlers` in cursor order, the same as a single extractor
+    would. The cursor is recorded once each window has been output in full.
+
+    Windows with many events are split further as soon as their first page shows how many
+    events they hold. If a window fails, the windows after it are not output so that the
+    checkpoint never skips events.
+
+    Args:
+        create_extractor (callable): Takes handlers and returns a configured extractor.
+        handlers (ExtractionHandlers): The handlers to output pages and errors to.
+        filters (list): The filter groups to query with.
+        time_range (TimeWindow): The range of cursor timestamps to extract.
+        worker_count (int): How many windows to extract at once.
+    """
+    ensure_max_connections(worker_count)
+    pending = deque(time_range.split(worker_count * WINDOWS_PER_WORKER))
+    running = deque()
+    max_running = worker_count * MAX_WINDOWS_AHEAD_PER_WORKER
+
+    def extract_window(window):
+        result = _WindowResult()
+        extractor = create_extractor(_WindowHandlers(window, result))
+        extractor.extract(*filters, window.create_filter(extractor._timestamp_filter))
+        return result
+
+    with ThreadPoolExecutor(worker_count) as executor:
+
+        def submit(window):
+            return window, executor.submit(extract_window, window)
+
+        try:
+            while pending or running:
+                while pending and len(running) < max_running:
+                    running.append(submit(pending.popleft()))
+
+                window, future = running.popleft()
+                result = future.result()
+                for response in result.responses:
+                    handlers.handle_response(response)
+                if result.errors:
+                    for error in result.errors:
+                        handlers.handle_error(error)
+                    return
+
+                if result.split_at is not None:
+                    remainder = TimeWindow(result.split_at, window.end)
+                    # The rest of this window comes before every window already running.
+                    running.extendleft(
+                        submit(part) for part in reversed(remainder.split(2))
+                    )
+                elif pending or running:
+                    handlers.record_cursor_position(window.end)
+                elif result.cursor is not None:
+                    # The last window ends now, so rather than its end, record the extractor's
+                    # cursor just past its last event, leaving room for events still being stored.
+                    handlers.record_cursor_position(result.cursor)
+        finally:
+            for _, future in running:
+                future.cancel()
+
+
+def _round(timestamp):
+    return round(timestamp, 3)
+
+
+def _round_down(timestamp):
+    # Round to microseconds first so that a float just short of a whole millisecond isn't
+    # rounded down a millisecond too far.
+    return math.floor(round(timestamp * 1000, 3)) / 1000
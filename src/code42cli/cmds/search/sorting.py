@@ -0,0 +1,75 @@
+import heapq
+from tempfile import TemporaryFile
+
+import code42cli.json_backend as json_backend
+
+# How many items to sort in memory before spilling them to a temporary file.
+DEFAULT_RUN_SIZE = 10000
+# How many spilled runs to keep before merging them into one, to bound the number of open files.
+_MAX_OPEN_RUNS = 64
+
+
+def sort_pages(pages, key, run_size=DEFAULT_RUN_SIZE):
+    """Yields the items of every page in `pages` (an iterable of lists) in ascending `key` order,
+    holding at most about `run_size` items in memory.
+
+    A later page can always hold items that sort before those of earlier pages, so nothing is
+    yielded until the last page has been read. Sorted runs of `run_size` items are spilled to
+    temporary files and merged after the last page; if every item fits in a single run, nothing
+    is spilled. Items that compare equal keep the order they arrived in.
+    """
+    return _sort_externally(pages, key, run_size)
+
+
+def _sort_externally(pages, key, run_size):
+    runs = []
+    buffer = []
+    try:
+        for page in pages:
+            buffer.extend(page)
+            if len(buffer) >= run_size:
+                runs.append(spill(sorted(buffer, key=key)))
+                buffer = []
+                if len(runs) >= _MAX_OPEN_RUNS:
+                    runs = [_merge_runs(runs, key)]
+        buffer.sort(key=key)
+        if not runs:
+            yield from buffer
+            return
+        # `heapq.merge` takes ties from the earlier iterable first, keeping arrival order.
+        yield from heapq.merge(*[read_spilled(run) for run in runs], buffer, key=key)
+    finally:
+        for run in runs:
+            run.close()
+
+
+def spill(items):
+    """Writes `items` to a temporary file as JSON lines and returns the file, ready to be read
+    with `read_spilled`. The file is removed once closed."""
+    run = TemporaryFile(mode="w+", encoding="utf-8")
+    try:
+        for item in items:
+            run.write(json_backend.dumps(item))
+            run.write("\n")
+        run.seek(0)
+    except BaseException:
+        run.close()
+        raise
+    return run
+
+
+def _merge_runs(runs, key):
+    try:
+        return spill(heapq.merge(*[read_spilled(run) for run in runs], key=key))
+    finally:
+        for run in runs:
+            run.close()
+
+
+def read_spilled(run):
+    """Yields the items of a file returned by `spill`, closing the file once done."""
+    try:
+        for line in run:
+            yield json_backend.loads(line)
+    finally:
+        run.close()
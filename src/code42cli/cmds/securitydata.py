@@ -17,8 +17,13 @@ from code42cli.click_ext.types import MapChoice
 from code42cli.cmds.search import SendToCommand
 from code42cli.cmds.search.cursor_store import FileEventCursorStore
 from code42cli.cmds.search.extraction import handle_no_events
+from code42cli.cmds.search.follow import create_follower
+from code42cli.cmds.search.options import follow_options
+from code42cli.cmds.search.options import parallel_option
 from code42cli.cmds.search.options import send_to_format_options
 from code42cli.cmds.search.options import server_options
+from code42cli.cmds.search.parallel import extract_in_parallel
+from code42cli.cmds.search.parallel import get_time_range
 from code42cli.date_helper import convert_datetime_to_timestamp
 from code42cli.date_helper import limit_date_range
 from code42cli.options import format_option
@@ -244,6 +249,7 @@ def clear_checkpoint(state, checkpoint_name):
     help="Display simple properties of the primary level of the nested response.",
 )
 @file_events_format_option
+@parallel_option
 def search(
     state,
     format,
@@ -254,6 +260,7 @@ def search(
     saved_search,
     or_query,
     include_all,
+    parallel,
     **kwargs,
 ):
     """Search for file events."""
@@ -271,7 +278,15 @@ def search(
         force_pager=include_all,
     )
     _extract(
-        state, handlers, begin, end, or_query, advanced_query, saved_search, **kwargs
+        state,
+        handlers,
+        begin,
+        end,
+        or_query,
+        advanced_query,
+        saved_search,
+        parallel=parallel,
+        **kwargs,
     )
 
 
@@ -321,8 +336,20 @@ def show(state, search_id):
     help="Display simple properties of the primary level of the nested response.",
 )
 @send_to_format_options
+@parallel_option
+@follow_options
 def send_to(
-    state, begin, end, advanced_query, use_checkpoint, saved_search, or_query, **kwargs,
+    state,
+    begin,
+    end,
+    advanced_query,
+    use_checkpoint,
+    saved_search,
+    or_query,
+    parallel,
+    follow,
+    interval,
+    **kwargs,
 ):
     """Send events to the given server address.
 
@@ -333,7 +360,16 @@ def send_to(
         state.sdk, FileEventExtractor, cursor, use_checkpoint, state.logger
     )
     _extract(
-        state, handlers, begin, end, or_query, advanced_query, saved_search, **kwargs
+        state,
+        handlers,
+        begin,
+        end,
+        or_query,
+        advanced_query,
+        saved_search,
+        parallel=parallel,
+        follower=create_follower(follow, interval),
+        **kwargs,
     )
 
 
@@ -359,18 +395,52 @@ def _extract(
 
 
 def _call_extractor(
-    state, handlers, begin, end, or_query, advanced_query, saved_search, **kwargs
+    state,
+    handlers,
+    begin,
+    end,
+    or_query,
+    advanced_query,
+    saved_search,
+    parallel=1,
+    follower=None,
+    **kwargs,
 ):
     if advanced_query:
         state.search_filters = advanced_query
-    extractor = _get_file_event_extractor(state.sdk, handlers)
-    extractor.use_or_query = or_query
-    extractor.or_query_exempt_filters.append(f.ExposureType.exists())
     if saved_search:
-        extractor.extract(*saved_search._filter_group_list)
+        filters = saved_search._filter_group_list
     else:
         if begin or end:
             state.search_filters.append(
                 ext.create_time_range_filter(f.EventTimestamp, begin, end)
             )
-        extractor.extract(*state.search_filters)
+        filters = state.search_filters
+
+    def create_extractor(extractor_handlers):
+        extractor = _get_file_event_extractor(state.sdk, extractor_handlers)
+        extractor.use_or_query = or_query
+        exempt_filter = f.ExposureType.exists()
+        if exempt_filter not in extractor.or_query_exempt_filters:
+            extractor.or_query_exempt_filters.append(exempt_filter)
+        return extractor
+
+    def extract():
+        time_range = get_time_range(handlers, begin) if parallel > 1 else None
+        if time_range:
+            extract_in_parallel(
+                create_extractor, handlers, filters, time_range, parallel
+            )
+        else:
+            ext.extract_with_prefetch(
+                lambda extractor_handlers: create_extractor(extractor_handlers).extract(
+                    *filters
+                ),
+                handlers,
+            )
+
+    if follower:
+        follower.stop_after_each_page(handlers)
+        follower.run(extract)
+    else:
+        extract()
@@ -1,9 +1,20 @@
 from functools import lru_cache
 
 from code42cli.errors import UserDoesNotExistError
+from code42cli.file_readers import RowStream
+
+# Bulk runs with more rows than this look up all users up front unless --no-prefetch-users is set.
+PREFETCH_USERS_ROW_THRESHOLD = 1000
+
+_user_id_indexes = {}
+_user_caches = {}
+
+
+def set_user_cache(sdk, user_cache):
+    """Makes `get_user_id` and `get_all_users` use the given `UserCache` for `sdk`."""
+    _user_caches[sdk] = user_cache
 
 
-@lru_cache(maxsize=None)
 def get_user_id(sdk, username):
     """Returns the user's UID (referred to by `user_id` in detection lists).
     Raises `UserDoesNotExistError` if the user doesn't exist in the Code42 server.
@@ -15,7 +26,74 @@ def get_user_id(sdk, username):
     Returns:
          str: The user ID for the user with the given username.
     """
+    index = _user_id_indexes.get(sdk)
+    if index:
+        user_id = index.get(username.lower())
+        if user_id:
+            return user_id
+    user_cache = _user_caches.get(sdk)
+    if user_cache:
+        user_id = user_cache.get_user_id(username)
+        if user_id:
+            return user_id
+    return _lookup_user_id(sdk, username)
+
+
+@lru_cache(maxsize=None)
+def _lookup_user_id(sdk, username):
     users = sdk.users.get_by_username(username)["users"]
     if not users:
         raise UserDoesNotExistError(username)
-    return users[0]["userUid"]
+    user_id = users[0]["userUid"]
+    user_cache = _user_caches.get(sdk)
+    if user_cache:
+        user_cache.add_users([{"username": username, "userUid": user_id}])
+    return user_id
+
+
+def get_all_users(sdk, refresh=False):
+    """Returns every user as a dict with `username` and `userUid` keys. Uses the user cache, if
+    one is set and its last full refresh hasn't expired, instead of paging through all users.
+
+    Args:
+        sdk (py42.sdk.SDKClient): The py42 sdk.
+        refresh (bool): Whether to page through all users even if the cache is fresh.
+
+    Returns:
+        list: The users.
+    """
+    user_cache = _user_caches.get(sdk)
+    if user_cache and not refresh:
+        users = user_cache.get_all_users()
+        if users is not None:
+            return users
+    users = [
+        {"username": user["username"], "userUid": user["userUid"]}
+        for page in sdk.users.get_all()
+        for user in page["users"]
+    ]
+    if user_cache:
+        user_cache.replace_all(users)
+    return users
+
+
+def prefetch_user_ids(sdk):
+    """Looks up the UIDs of all users with one paged sweep (or from the user cache) so that later
+    calls to `get_user_id` don't need to make a request per username. Usernames not found in the
+    sweep (such as users created since) are still looked up individually."""
+    _user_id_indexes[sdk] = {
+        user["username"].lower(): user["userUid"] for user in get_all_users(sdk)
+    }
+
+
+def prefetch_user_ids_if_needed(state, rows):
+    """Calls `prefetch_user_ids` if `--prefetch-users` was passed, or if it wasn't turned off and
+    there are more than `PREFETCH_USERS_ROW_THRESHOLD` rows. Streamed files are always large
+    enough to qualify."""
+    enabled = state.prefetch_users
+    if enabled is None:
+        enabled = (
+            isinstance(rows, RowStream) or len(rows) > PREFETCH_USERS_ROW_THRESHOLD
+        )
+    if enabled:
+        prefetch_user_ids(state.sdk)
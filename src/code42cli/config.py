@@ -19,6 +19,9 @@ class ConfigAccessor:
     AUTHORITY_KEY = "c42_authority_url"
     USERNAME_KEY = "c42_username"
     IGNORE_SSL_ERRORS_KEY = "ignore-ssl-errors"
+    BULK_WORKERS_KEY = "bulk-workers"
+    RATE_LIMIT_KEY = "rate-limit"
+    RATE_LIMIT_BURST_KEY = "rate-limit-burst"
     DEFAULT_PROFILE = "default_profile"
     _INTERNAL_SECTION = "Internal"
 
@@ -65,7 +68,16 @@ class ConfigAccessor:
         self.update_profile(profile.name, server, username, ignore_ssl_errors)
         self._try_complete_setup(profile)
 
-    def update_profile(self, name, server=None, username=None, ignore_ssl_errors=None):
+    def update_profile(
+        self,
+        name,
+        server=None,
+        username=None,
+        ignore_ssl_errors=None,
+        bulk_workers=None,
+        rate_limit=None,
+        rate_limit_burst=None,
+    ):
         profile = self.get_profile(name)
         if server:
             self._set_authority_url(server, profile)
@@ -73,6 +85,12 @@ class ConfigAccessor:
             self._set_username(username, profile)
         if ignore_ssl_errors is not None:
             self._set_ignore_ssl_errors(ignore_ssl_errors, profile)
+        if bulk_workers is not None:
+            self._set_bulk_workers(bulk_workers, profile)
+        if rate_limit is not None:
+            self._set_rate_limit(rate_limit, profile)
+        if rate_limit_burst is not None:
+            self._set_rate_limit_burst(rate_limit_burst, profile)
         self._save()
 
     def switch_default_profile(self, new_default_name):
@@ -100,6 +118,15 @@ class ConfigAccessor:
     def _set_ignore_ssl_errors(self, new_value, profile):
         profile[self.IGNORE_SSL_ERRORS_KEY] = str(new_value)
 
+    def _set_bulk_workers(self, new_value, profile):
+        profile[self.BULK_WORKERS_KEY] = str(new_value)
+
+    def _set_rate_limit(self, new_value, profile):
+        profile[self.RATE_LIMIT_KEY] = str(new_value)
+
+    def _set_rate_limit_burst(self, new_value, profile):
+        profile[self.RATE_LIMIT_BURST_KEY] = str(new_value)
+
     def _get_sections(self):
         return self.parser.sections()
 
@@ -45,6 +45,15 @@ class LoggedCLIError(Code42CLIError):
         )
 
 
+class PartialFailureError(Code42CLIError):
+    """An error raised by a bulk task that processes several items, such as a batch of alerts,
+    when only some of them failed. `failed_count` is how many failed."""
+
+    def __init__(self, message, failed_count):
+        self.failed_count = failed_count
+        super().__init__(message)
+
+
 class UserDoesNotExistError(Code42CLIError):
     """An error to represent a username that is not in our system. The CLI shows this error when
     the user tries to add or remove a user that does not exist. This error is not shown during
@@ -1,24 +1,54 @@
 import csv
+import os
+import stat
+from itertools import chain
 
 import click
 
 from code42cli.click_ext.types import AutoDecodedFile
 from code42cli.errors import Code42CLIError
 
+# Files larger than this are read lazily, one row at a time, instead of all at once.
+STREAMING_THRESHOLD_BYTES = 10 * 1024 * 1024
 
-def read_csv_arg(headers):
+
+def read_csv_arg(headers, stream=True):
     """Helper for defining arguments that read from a csv file. Automatically converts
     the file name provided on command line to a list of csv rows (passed to command
     function as `csv_rows` param).
+
+    If `stream` is True, files larger than `STREAMING_THRESHOLD_BYTES` are converted to a
+    `CsvRowStream` instead of a list so that they are never held in memory all at once.
     """
     return click.argument(
         "csv_rows",
         metavar="CSV_FILE",
         type=AutoDecodedFile("r"),
-        callback=lambda ctx, param, arg: read_csv(arg, headers=headers),
+        callback=lambda ctx, param, arg: _read_csv_file(arg, headers, stream),
     )
 
 
+def _read_csv_file(file, headers, stream):
+    if stream and _should_stream(file):
+        return CsvRowStream(file, headers)
+    return read_csv(file, headers=headers)
+
+
+def _should_stream(file):
+    size = get_file_size(file)
+    return size is not None and size > STREAMING_THRESHOLD_BYTES
+
+
+def get_file_size(file):
+    """Returns the size in bytes of the given file object, or None if it is not a regular file
+    (such as stdin)."""
+    try:
+        file_stat = os.fstat(file.fileno())
+    except (AttributeError, OSError, ValueError):
+        return None
+    return file_stat.st_size if stat.S_ISREG(file_stat.st_mode) else None
+
+
 def read_csv(file, headers):
     """Helper to read a csv file object into a list of dict rows.
     If CSV has a header row, all items in `headers` arg must be present in CSV or an
@@ -28,21 +58,33 @@ def read_csv(file, headers):
     else error is raised.
     """
     lines = file.readlines()
-    first_line = lines[0].strip().split(",")
+    header_row = _get_header_row(lines[0], headers)
 
-    # handle when first row has all of our expected headers
-    if all(field in first_line for field in headers):
-        reader = csv.DictReader(lines[1:], fieldnames=first_line)
+    if header_row:
+        reader = csv.DictReader(lines[1:], fieldnames=header_row)
         csv_rows = [{key: row[key] for key in headers} for row in reader]
         if not csv_rows:
             raise Code42CLIError("CSV contains no data rows.")
         return csv_rows
 
+    return list(csv.DictReader(lines, fieldnames=headers))
+
+
+def _get_header_row(first_line, headers):
+    """Returns the columns of the first line of a csv if it is a header row containing all of the
+    expected `headers`, or None if the csv has no header row. Raises if the csv can't be read with
+    the expected headers."""
+    first_line = first_line.strip().split(",")
+
+    # handle when first row has all of our expected headers
+    if all(field in first_line for field in headers):
+        return first_line
+
     # handle when first row has no expected headers
     elif all(field not in first_line for field in headers):
         #  only process header-less CSVs if we get exact expected column count
         if len(first_line) == len(headers):
-            return list(csv.DictReader(lines, fieldnames=headers))
+            return None
         else:
             raise Code42CLIError(
                 "CSV data is ambiguous. Column count must match expected columns exactly when no "
@@ -64,9 +106,79 @@ def read_flat_file(file):
         return [first_row.strip(), *[row.strip() for row in file]]
 
 
+def _read_flat_file(file):
+    if _should_stream(file):
+        return FlatFileRowStream(file)
+    return read_flat_file(file)
+
+
 read_flat_file_arg = click.argument(
     "file_rows",
     type=AutoDecodedFile("r"),
     metavar="FILE",
-    callback=lambda ctx, param, arg: read_flat_file(arg),
+    callback=lambda ctx, param, arg: _read_flat_file(arg),
 )
+
+
+class RowStream:
+    """Lazily reads the rows of a file so that the file is never held in memory all at once.
+
+    Since the number of rows isn't known until the whole file is read, `size` and `position`
+    (the approximate number of bytes read so far) can be used to report progress instead.
+    Rows can only be iterated over once.
+    """
+
+    def __init__(self, file):
+        self._file = file
+        self._encoding = getattr(file, "encoding", None) or "utf-8"
+        self._rows = iter(())
+        self.size = get_file_size(file)
+        self.position = 0
+
+    def __iter__(self):
+        return self._rows
+
+    def regroup(self, func):
+        """Replaces the rows with `func(rows)`, which lazily yields new rows (such as batches of
+        the original rows). Progress is still reported by how much of the file has been read."""
+        self._rows = iter(func(self._rows))
+        return self
+
+    def _read_lines(self):
+        for line in self._file:
+            self.position += len(line.encode(self._encoding, errors="replace"))
+            yield line
+
+
+class CsvRowStream(RowStream):
+    """Lazily reads a csv file into dict rows, the same as `read_csv` does all at once. The header
+    row, if any, is validated as soon as the stream is created."""
+
+    def __init__(self, file, headers):
+        super().__init__(file)
+        lines = self._read_lines()
+        first_line = next(lines, "")
+        header_row = _get_header_row(first_line, headers)
+        if header_row:
+            reader = csv.DictReader(lines, fieldnames=header_row)
+            rows = ({key: row[key] for key in headers} for row in reader)
+            first_row = next(rows, None)
+            if first_row is None:
+                raise Code42CLIError("CSV contains no data rows.")
+            self._rows = chain([first_row], rows)
+        else:
+            self._rows = iter(
+                csv.DictReader(chain([first_line], lines), fieldnames=headers)
+            )
+
+
+class FlatFileRowStream(RowStream):
+    """Lazily reads the rows of a flat file, the same as `read_flat_file` does all at once."""
+
+    def __init__(self, file):
+        super().__init__(file)
+        lines = self._read_lines()
+        first_row = next(lines, "")
+        if not first_row.startswith("#"):
+            lines = chain([first_row], lines)
+        self._rows = (row.strip() for row in lines)
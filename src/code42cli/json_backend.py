@@ -0,0 +1,164 @@
+"""Serializes JSON with the fastest library available: `orjson`, then `ujson`, then the standard
+library's `json`.
+
+Every backend produces the same JSON value as `json.dumps`: keys keep their order (unless
+`sort_keys` is set) and non-ASCII characters are escaped as `\\uXXXX`. Only insignificant
+whitespace can differ, since the third-party backends don't put spaces after separators.
+
+Output shown to users (the JSON output formats and `--results-file`) is always serialized with
+`json` so that it looks the same whichever backend is installed.
+
+Set the `CODE42CLI_JSON_BACKEND` environment variable to `orjson`, `ujson`, or `json` to choose a
+backend.
+"""
+import codecs
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+ORJSON = "orjson"
+UJSON = "ujson"
+STDLIB = "json"
+
+BACKEND_ENV_VAR = "CODE42CLI_JSON_BACKEND"
+
+# The codec error handler that escapes non-ASCII characters the way `json.dumps` does.
+_ESCAPE_ERRORS = "code42cli.json_escape"
+
+# Reused rather than letting `json.dumps` create an encoder for every call.
+_CANONICAL_ENCODER = json.JSONEncoder(
+    sort_keys=True, separators=(",", ":"), default=str
+)
+
+# The types orjson serializes exactly as `json` does. Their subclasses, such as `IntEnum`, may not be.
+_EXACT_SCALAR_TYPES = frozenset((str, int, bool, type(None)))
+
+_available = {
+    ORJSON: orjson is not None,
+    UJSON: ujson is not None,
+    STDLIB: True,
+}
+_backend = None
+
+
+def get_available_backends():
+    """The names of the backends that are installed, fastest first."""
+    return [name for name in (ORJSON, UJSON, STDLIB) if _available[name]]
+
+
+def get_backend():
+    """The name of the backend in use."""
+    if _backend is None:
+        set_backend(os.environ.get(BACKEND_ENV_VAR))
+    return _backend
+
+
+def set_backend(name=None):
+    """Uses the backend with the given name, or the fastest one installed if `name` is `None`.
+    Raises `ValueError` if the backend isn't installed."""
+    global _backend
+    if name is None:
+        name = get_available_backends()[0]
+    if not _available.get(name):
+        raise ValueError(f"JSON backend '{name}' is not installed.")
+    _backend = name
+
+
+def dumps(obj, indent=None, sort_keys=False, default=None):
+    """Serializes `obj` to a JSON `str`. Takes the same arguments as `json.dumps`."""
+    backend = get_backend()
+    try:
+        if backend == ORJSON and indent is None:
+            return _orjson_dumps(obj, sort_keys, default)
+        if backend in (ORJSON, UJSON) and ujson is not None and default is None:
+            return ujson.dumps(
+                obj,
+                ensure_ascii=True,
+                escape_forward_slashes=False,
+                indent=indent or 0,
+                sort_keys=sort_keys,
+            )
+    except (TypeError, ValueError, OverflowError):
+        # Values the fast backends can't handle, such as integers over 64 bits.
+        pass
+    return json.dumps(obj, indent=indent, sort_keys=sort_keys, default=default)
+
+
+def dumps_canonical(obj):
+    """Serializes `obj` to compact JSON with sorted keys, such as for hashing. Values JSON can't
+    represent, such as `datetime`s, are serialized as their `str()`. Every backend produces the
+    same `str` as `json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)`."""
+    if get_backend() == ORJSON and _has_only_exact_types(obj):
+        try:
+            return _orjson_dumps(obj, True, None, non_str_keys=False)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    # `ujson` escapes some characters differently from `json`, so it isn't used here.
+    return _CANONICAL_ENCODER.encode(obj)
+
+
+def loads(s):
+    """Deserializes a JSON `str` or `bytes`. Raises `ValueError` if it isn't valid JSON."""
+    backend = get_backend()
+    if backend == ORJSON:
+        return orjson.loads(s)
+    if backend == UJSON:
+        return ujson.loads(s)
+    return json.loads(s)
+
+
+def _has_only_exact_types(obj):
+    """Whether `obj` is made only of values that orjson and `json` serialize exactly alike. Floats
+    aren't, since the two switch to exponent notation at different magnitudes and write the
+    exponent differently (`1e-05` and `0.00001`, `1e+16` and `1e16`)."""
+    if isinstance(obj, dict):
+        values = obj.values()
+    elif isinstance(obj, (list, tuple)):
+        values = obj
+    else:
+        return type(obj) in _EXACT_SCALAR_TYPES
+    for value in values:
+        if type(value) not in _EXACT_SCALAR_TYPES and not _has_only_exact_types(value):
+            return False
+    return True
+
+
+def _orjson_dumps(obj, sort_keys, default, non_str_keys=True):
+    option = orjson.OPT_NON_STR_KEYS if non_str_keys else 0
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    result = orjson.dumps(obj, default=default, option=option)
+    if result.isascii() and b"\x7f" not in result:
+        return result.decode("ascii")
+    # orjson always writes UTF-8 and leaves DEL unescaped. Those characters can only occur inside
+    # strings, so they can be escaped in the output the way `json` escapes them.
+    text = result.decode("utf-8").replace("\x7f", "\\u007f")
+    return text.encode("ascii", _ESCAPE_ERRORS).decode("ascii")
+
+
+def _escape_non_ascii(error):
+    escaped = []
+    for character in error.object[error.start : error.end]:
+        code_point = ord(character)
+        if code_point < 0x10000:
+            escaped.append(f"\\u{code_point:04x}")
+        else:
+            # Characters outside the Basic Multilingual Plane are escaped as a UTF-16 surrogate
+            # pair.
+            code_point -= 0x10000
+            high = 0xD800 | (code_point >> 10)
+            low = 0xDC00 | (code_point & 0x3FF)
+            escaped.append(f"\\u{high:04x}\\u{low:04x}")
+    return "".join(escaped), error.end
+
+
+codecs.register_error(_ESCAPE_ERRORS, _escape_non_ascii)
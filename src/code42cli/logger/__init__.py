@@ -34,7 +34,7 @@ def _init_logger(logger, handler, output_format):
     return add_handler_to_logger(logger, handler, formatter)
 
 
-def get_logger_for_server(hostname, protocol, output_format, certs):
+def get_logger_for_server(hostname, protocol, output_format, certs, queue_size=None):
     """Gets the logger that sends logs to a server for the given format.
 
     Args:
@@ -42,6 +42,8 @@ def get_logger_for_server(hostname, protocol, output_format, certs):
         protocol: The transfer protocol for sending logs.
         output_format: CEF, JSON, or RAW_JSON. Each type results in a different logger instance.
         certs: Use for passing SSL/TLS certificates when connecting to the server.
+        queue_size: If set, logs are sent from a background thread, with up to this many
+            waiting to be sent (see `NoPrioritySysLogHandler`).
     """
     logger = logging.getLogger("code42_syslog_{}".format(output_format.lower()))
     if logger_has_handlers(logger):
@@ -52,7 +54,9 @@ def get_logger_for_server(hostname, protocol, output_format, certs):
         hostname = url_parts[0]
         port = url_parts[1] or 514
         if not logger_has_handlers(logger):
-            handler = NoPrioritySysLogHandler(hostname, port, protocol, certs)
+            handler = NoPrioritySysLogHandler(
+                hostname, port, protocol, certs, queue_size=queue_size
+            )
             handler.connect_socket()
             return _init_logger(logger, handler, output_format)
     return logger
@@ -84,6 +88,12 @@ def logger_has_handlers(logger):
     return len(logger.handlers)
 
 
+def flush_handlers(logger):
+    """Waits for every record logged so far to be sent by the logger's handlers."""
+    for handler in logger.handlers:
+        handler.flush()
+
+
 def _get_error_file_logger():
     """Gets the logger where raw exceptions are logged."""
     logger = logging.getLogger("code42_error_logger")
@@ -1,7 +1,7 @@
-import json
 from datetime import datetime
 from logging import Formatter
 
+import code42cli.json_backend as json_backend
 from code42cli.maps import CEF_CUSTOM_FIELD_NAME_MAP
 from code42cli.maps import FILE_EVENT_TO_SIGNATURE_ID_MAP
 from code42cli.maps import JSON_TO_CEF_MAP
@@ -63,14 +63,14 @@ class FileEventDictToJSONFormatter(Formatter):
             for key in file_event_dict
             if file_event_dict[key] or file_event_dict[key] == 0
         }
-        return json.dumps(file_event_dict)
+        return json_backend.dumps(file_event_dict)
 
 
 class FileEventDictToRawJSONFormatter(Formatter):
     """Formats file event dicts into JSON format. Attach to a logger via `setFormatter` to use."""
 
     def format(self, record):
-        return json.dumps(record.msg)
+        return json_backend.dumps(record.msg)
 
 
 def _format_cef_kvp(cef_field_key, cef_field_value):
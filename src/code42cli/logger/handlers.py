@@ -2,7 +2,14 @@ import logging
 import socket
 import ssl
 import sys
+from collections import deque
 from logging.handlers import SysLogHandler
+from queue import Empty
+from queue import Full
+from queue import Queue
+from threading import Thread
+from time import monotonic
+from time import sleep
 
 from code42cli.logger.enums import ServerProtocol
 
@@ -18,6 +25,51 @@ class SyslogServerNetworkConnectionError(Exception):
         )
 
 
+# The default number of records that may wait to be sent when sending from a background thread.
+DEFAULT_SEND_QUEUE_SIZE = 10000
+# Sends of queued TCP/TLS records are combined up to about this many bytes.
+MAX_SEND_BATCH_BYTES = 64 * 1024
+# Put on the send queue to stop the sender thread.
+_STOP_SENDING = object()
+# How many times to try reconnecting to a TCP/TLS server after the connection breaks.
+DEFAULT_RECONNECT_ATTEMPTS = 5
+# How many of the latest records sent over TCP/TLS to send again after reconnecting.
+DEFAULT_REPLAY_BUFFER_SIZE = 100
+# The wait before each reconnect attempt after the first doubles, starting from and up to these.
+_RECONNECT_BACKOFF_SECONDS = 1
+_MAX_RECONNECT_BACKOFF_SECONDS = 30
+
+
+class SyslogSenderStats:
+    """Counters for a `NoPrioritySysLogHandler` that sends records from a background thread.
+
+    `blocked_count` and `blocked_seconds` measure backpressure: how often, and for how long in
+    total, logging a record had to wait because the send queue was full. `reconnect_count` and
+    `records_replayed` count reconnects after a broken TCP/TLS connection and the records sent
+    again after them.
+    """
+
+    def __init__(self):
+        self.records_sent = 0
+        self.batches_sent = 0
+        self.bytes_sent = 0
+        self.max_queue_depth = 0
+        self.blocked_count = 0
+        self.blocked_seconds = 0.0
+        self.reconnect_count = 0
+        self.records_replayed = 0
+
+    def __repr__(self):
+        return (
+            f"SyslogSenderStats(records_sent={self.records_sent}, "
+            f"batches_sent={self.batches_sent}, bytes_sent={self.bytes_sent}, "
+            f"max_queue_depth={self.max_queue_depth}, blocked_count={self.blocked_count}, "
+            f"blocked_seconds={self.blocked_seconds:.3f}, "
+            f"reconnect_count={self.reconnect_count}, "
+            f"records_replayed={self.records_replayed})"
+        )
+
+
 class NoPrioritySysLogHandler(SysLogHandler):
     """
     Overrides the default implementation of SysLogHandler to not send a `<PRI>` at the
@@ -33,9 +85,28 @@ class NoPrioritySysLogHandler(SysLogHandler):
         protocol: The protocol over which to submit syslog messages. Accepts TCP, UDP, or TLS.
         certs: Certs to specify when using TLS-TCP for the `protocol` argument. Use "ignore" for
             ssl.CERT_NONE (ignoring certificate validation).
+        queue_size: If set, records are formatted on the logging thread and sent from a
+            background thread, which combines queued TCP/TLS records into a single send. Logging
+            waits once this many records are waiting to be sent. Call `flush()` to wait for every
+            record to be sent. Once sending a record fails, the next `emit()` or `flush()` raises
+            `SyslogServerNetworkConnectionError`, whatever the error was.
+        reconnect_attempts: How many times to try reconnecting when a TCP/TLS connection breaks
+            before giving up. Attempts after the first wait with exponential backoff.
+        replay_buffer_size: How many of the latest records sent over TCP/TLS to send again after
+            reconnecting. A record written to a socket may still be lost when the connection
+            breaks, so a record may be delivered twice but is not dropped.
     """
 
-    def __init__(self, hostname, port, protocol, certs):
+    def __init__(
+        self,
+        hostname,
+        port,
+        protocol,
+        certs,
+        queue_size=None,
+        reconnect_attempts=DEFAULT_RECONNECT_ATTEMPTS,
+        replay_buffer_size=DEFAULT_REPLAY_BUFFER_SIZE,
+    ):
         self._hostname = hostname
         self._port = port
         self._protocol = protocol
@@ -44,6 +115,12 @@ class NoPrioritySysLogHandler(SysLogHandler):
         logging.Handler.__init__(self)
         self.socktype = _try_get_socket_type_from_protocol(protocol)
         self.socket = None
+        self.stats = SyslogSenderStats()
+        self._queue = Queue(queue_size) if queue_size else None
+        self._sender_thread = None
+        self._send_error = None
+        self._reconnect_attempts = reconnect_attempts
+        self._replay_buffer = deque(maxlen=replay_buffer_size)
 
     @property
     def _wrap_socket(self):
@@ -79,7 +156,10 @@ class NoPrioritySysLogHandler(SysLogHandler):
 
     def emit(self, record):
         try:
-            self._send_record(record)
+            if self._queue is None:
+                self._send_record(record)
+            else:
+                self._queue_record(record)
         except Exception:
             self.handleError(record)
 
@@ -88,24 +168,140 @@ class NoPrioritySysLogHandler(SysLogHandler):
         log, otherwise it would continue to gather and process events if the connection breaks but send
         them nowhere.
         """
-        t, _, _ = sys.exc_info()
-        if issubclass(t, ConnectionError):
+        t, err, _ = sys.exc_info()
+        if issubclass(t, SyslogServerNetworkConnectionError):
+            raise err
+        if issubclass(t, OSError):
             raise SyslogServerNetworkConnectionError()
         super().handleError(record)
 
     def _send_record(self, record):
+        self._send_messages([self._format_message(record)])
+
+    def _format_message(self, record):
         formatted_record = self.format(record)
         msg = formatted_record + "\n"
-        msg = msg.encode("utf-8")
+        return msg.encode("utf-8")
+
+    def _queue_record(self, record):
+        self._raise_send_error()
+        msg = self._format_message(record)
+        if self._sender_thread is None:
+            self._sender_thread = Thread(target=self._send_queued_records, daemon=True)
+            self._sender_thread.start()
+        try:
+            self._queue.put_nowait(msg)
+        except Full:
+            start = monotonic()
+            self._queue.put(msg)
+            self.stats.blocked_count += 1
+            self.stats.blocked_seconds += monotonic() - start
+        self.stats.max_queue_depth = max(
+            self.stats.max_queue_depth, self._queue.qsize()
+        )
+
+    def _send_queued_records(self):
+        stopped = False
+        while not stopped:
+            batch = [self._queue.get()]
+            batch_bytes = 0
+            while batch[-1] is not _STOP_SENDING:
+                batch_bytes += len(batch[-1])
+                if batch_bytes >= MAX_SEND_BATCH_BYTES:
+                    break
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+            stopped = batch[-1] is _STOP_SENDING
+            messages = batch[:-1] if stopped else batch
+            try:
+                # After an error, keep emptying the queue so that logging doesn't wait forever.
+                if messages and self._send_error is None:
+                    self._send_messages(messages)
+            except Exception as err:
+                self._send_error = err
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _send_messages(self, messages):
         if self.socktype == socket.SOCK_DGRAM:
-            self.socket.sendto(msg, self.address)
+            for msg in messages:
+                self.socket.sendto(msg, self.address)
+            batch_count = len(messages)
         else:
-            self.socket.sendall(msg)
+            self._send_stream(messages)
+            batch_count = 1
+        self.stats.records_sent += len(messages)
+        self.stats.batches_sent += batch_count
+        self.stats.bytes_sent += sum(len(msg) for msg in messages)
+
+    def _send_stream(self, messages):
+        data = b"".join(messages)
+        try:
+            self.socket.sendall(data)
+        except OSError as err:
+            # A broken TLS connection can raise `ssl.SSLError` or `socket.timeout` rather than a
+            # `ConnectionError`.
+            self._reconnect_and_send(data, err)
+        self._replay_buffer.extend(messages)
+
+    def _reconnect_and_send(self, data, err):
+        """Reconnects after the connection broke with `err`, then sends the replay buffer and
+        `data`. Raises `err` if every attempt fails."""
+        for attempt in range(self._reconnect_attempts):
+            self._close_socket()
+            if attempt:
+                sleep(
+                    min(
+                        _RECONNECT_BACKOFF_SECONDS * 2 ** (attempt - 1),
+                        _MAX_RECONNECT_BACKOFF_SECONDS,
+                    )
+                )
+            try:
+                self.socket = self._create_socket(
+                    self._hostname, self._port, self._certs
+                )
+                self.socket.sendall(b"".join(self._replay_buffer) + data)
+            except OSError:
+                continue
+            self.stats.reconnect_count += 1
+            self.stats.records_replayed += len(self._replay_buffer)
+            return
+        raise err
+
+    def _close_socket(self):
+        if self.socket is None:
+            return
+        try:
+            self.socket.close()
+        except OSError:
+            pass
+        self.socket = None
+
+    def _raise_send_error(self):
+        if self._send_error is not None:
+            raise SyslogServerNetworkConnectionError() from self._send_error
+
+    def flush(self):
+        """Waits for queued records to be sent. Raises `SyslogServerNetworkConnectionError` if the
+        connection broke while sending them."""
+        if self._sender_thread is None:
+            return
+        self._queue.join()
+        self._raise_send_error()
 
     def close(self):
-        if self._wrap_socket:
-            self.socket.unwrap()
-        self.socket.close()
+        if self._sender_thread is not None:
+            # Sends whatever is still queued first.
+            self._queue.put(_STOP_SENDING)
+            self._sender_thread.join()
+            self._sender_thread = None
+        if self.socket is not None:
+            if self._wrap_socket:
+                self.socket.unwrap()
+            self.socket.close()
         logging.Handler.close(self)
 
 
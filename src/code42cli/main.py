@@ -13,6 +13,7 @@ from code42cli.click_ext.groups import ExceptionHandlingGroup
 from code42cli.cmds.alert_rules import alert_rules
 from code42cli.cmds.alerts import alerts
 from code42cli.cmds.auditlogs import audit_logs
+from code42cli.cmds.cache import cache
 from code42cli.cmds.cases import cases
 from code42cli.cmds.departing_employee import departing_employee
 from code42cli.cmds.devices import devices
@@ -84,3 +85,4 @@ cli.add_command(devices)
 cli.add_command(users)
 cli.add_command(audit_logs)
 cli.add_command(cases)
+cli.add_command(cache)
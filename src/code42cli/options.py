@@ -1,8 +1,10 @@
 import click
 
 from code42cli.click_ext.types import MagicDate
+from code42cli.click_ext.types import WorkerCount
 from code42cli.cmds.search.options import AdvancedQueryAndSavedSearchIncompatible
 from code42cli.cmds.search.options import BeginOption
+from code42cli.cmds.shared import set_user_cache
 from code42cli.date_helper import convert_datetime_to_timestamp
 from code42cli.date_helper import round_datetime_to_day_end
 from code42cli.date_helper import round_datetime_to_day_start
@@ -12,6 +14,7 @@ from code42cli.output_formats import OutputFormat
 from code42cli.output_formats import SendToFileEventsOutputFormat
 from code42cli.profile import get_profile
 from code42cli.sdk_client import create_sdk
+from code42cli.user_cache import UserCache
 
 
 def yes_option(hidden=False):
@@ -44,6 +47,10 @@ class CLIState:
         self.totp = None
         self.debug = False
         self._sdk = None
+        self._workers = None
+        self.resume = None
+        self.stats_file = None
+        self.prefetch_users = None
         self.search_filters = []
         self.assume_yes = False
 
@@ -61,8 +68,24 @@ class CLIState:
     def sdk(self):
         if self._sdk is None:
             self._sdk = create_sdk(self.profile, self.debug, totp=self.totp)
+            set_user_cache(self._sdk, UserCache.for_profile(self.profile.name))
         return self._sdk
 
+    @property
+    def workers(self):
+        """The number of concurrent workers (or `auto`) to use for bulk processing. Uses the
+        value of `--workers` if passed, otherwise the profile's `bulk-workers` setting. Returns
+        `None` if neither is set."""
+        if self._workers is not None:
+            return self._workers
+        configured = self.profile.bulk_workers
+        if configured:
+            return WorkerCount().convert(configured, None, None)
+
+    @workers.setter
+    def workers(self, value):
+        self._workers = value
+
     def set_assume_yes(self, param):
         self.assume_yes = param
 
@@ -88,6 +111,33 @@ def set_totp(ctx, param, value):
         ctx.ensure_object(CLIState).totp = value
 
 
+def set_workers(ctx, param, value):
+    """Sets the number of concurrent bulk workers on the global state object when --workers is
+    passed to commands decorated with @bulk_options."""
+    if value:
+        ctx.ensure_object(CLIState).workers = value
+
+
+def set_resume(ctx, param, value):
+    """Sets whether to resume a previous run on the global state object for commands decorated
+    with @bulk_options. Always set, so that bulk commands know to journal their progress."""
+    ctx.ensure_object(CLIState).resume = value
+
+
+def set_stats_file(ctx, param, value):
+    """Sets the path to write bulk processing stats to on the global state object when
+    --stats-file is passed to commands decorated with @bulk_options."""
+    if value:
+        ctx.ensure_object(CLIState).stats_file = value
+
+
+def set_prefetch_users(ctx, param, value):
+    """Sets whether to look up all users up front on the global state object when
+    --prefetch-users/--no-prefetch-users is passed."""
+    if value is not None:
+        ctx.ensure_object(CLIState).prefetch_users = value
+
+
 def profile_option(hidden=False):
     opt = click.option(
         "--profile",
@@ -123,6 +173,46 @@ def totp_option(hidden=False):
     return opt
 
 
+def workers_option(hidden=False):
+    opt = click.option(
+        "--workers",
+        type=WorkerCount(),
+        expose_value=False,
+        callback=set_workers,
+        hidden=hidden,
+        help="The number of rows to process concurrently, or 'auto' to raise and lower "
+        "concurrency based on server latency and throttling. Defaults to the profile's "
+        "bulk-workers setting, or 5 if it is not set.",
+    )
+    return opt
+
+
+def resume_option(hidden=False):
+    opt = click.option(
+        "--resume",
+        is_flag=True,
+        expose_value=False,
+        callback=set_resume,
+        hidden=hidden,
+        help="Skip rows that succeeded the last time this command was run with this profile, "
+        "such as when a previous run was interrupted or had errors.",
+    )
+    return opt
+
+
+def stats_file_option(hidden=False):
+    opt = click.option(
+        "--stats-file",
+        type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+        expose_value=False,
+        callback=set_stats_file,
+        hidden=hidden,
+        help="Write stats about the run to this file as JSON when it finishes, including latency "
+        "percentiles, errors by exception type and HTTP status, and throughput over time.",
+    )
+    return opt
+
+
 pass_state = click.make_pass_decorator(CLIState, ensure=True)
 
 
@@ -137,6 +227,34 @@ def sdk_options(hidden=False):
     return decorator
 
 
+def bulk_options(f):
+    """Options shared by commands that process rows in bulk."""
+    f = workers_option()(f)
+    f = resume_option()(f)
+    f = stats_file_option()(f)
+    return f
+
+
+prefetch_users_option = click.option(
+    "--prefetch-users/--no-prefetch-users",
+    default=None,
+    expose_value=False,
+    callback=set_prefetch_users,
+    help="Look up the IDs of all users with a single paged sweep before processing rows, instead "
+    "of one request per username. Turned on automatically for files with more than "
+    "1000 rows.",
+)
+
+
+results_file_option = click.option(
+    "--results-file",
+    type=click.File("w"),
+    help="Write each result to this file as soon as it is available instead of printing all "
+    "results at the end. Results are written as CSV if the file name ends in '.csv' and as JSON "
+    "lines otherwise. Use '-' to write JSON lines to stdout.",
+)
+
+
 def server_options(f):
     hostname_arg = click.argument("hostname")
     protocol_option = click.option(
@@ -1,6 +1,8 @@
 import csv
 import io
 import json
+from itertools import chain
+from itertools import islice
 
 import click
 
@@ -77,6 +79,21 @@ class OutputFormatter:
             if self.output_format in [OutputFormat.TABLE]:
                 click.echo()
 
+    def echo_formatted_stream(self, output_stream):
+        """Like `echo_formatted_list`, but outputs each item of the iterable as it arrives when the
+        format allows it. Table and CSV output need every item first to line up columns."""
+        if self._requires_list_output:
+            self.echo_formatted_list(list(output_stream))
+            return
+        output_stream = iter(output_stream)
+        first_items = list(islice(output_stream, OUTPUT_VIA_PAGER_THRESHOLD + 1))
+        if len(first_items) <= OUTPUT_VIA_PAGER_THRESHOLD:
+            self.echo_formatted_list(first_items)
+            return
+        click.echo_via_pager(
+            self.get_formatted_output(chain(first_items, output_stream))
+        )
+
     @property
     def _requires_list_output(self):
         return self.output_format in (OutputFormat.TABLE, OutputFormat.CSV)
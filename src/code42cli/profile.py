@@ -28,6 +28,26 @@ class Code42Profile:
     def ignore_ssl_errors(self):
         return self._profile[ConfigAccessor.IGNORE_SSL_ERRORS_KEY]
 
+    @property
+    def bulk_workers(self):
+        """The number of concurrent tasks bulk commands use by default, `auto` for adaptive
+        concurrency, or `None` if the profile doesn't specify it."""
+        return self._profile.get(ConfigAccessor.BULK_WORKERS_KEY)
+
+    @property
+    def rate_limit(self):
+        """The most requests per second to make to Code42 with this profile, or `None` if
+        requests aren't limited."""
+        value = self._profile.get(ConfigAccessor.RATE_LIMIT_KEY)
+        return float(value) if value and float(value) > 0 else None
+
+    @property
+    def rate_limit_burst(self):
+        """The most requests to make at once before `rate_limit` applies, or `None` to use the
+        default of one second's worth of requests."""
+        value = self._profile.get(ConfigAccessor.RATE_LIMIT_BURST_KEY)
+        return int(value) if value and int(value) > 0 else None
+
     @property
     def has_stored_password(self):
         stored_password = password.get_stored_password(self)
@@ -116,8 +136,24 @@ def delete_profile(profile_name):
     config_accessor.delete_profile(profile_name)
 
 
-def update_profile(name, server, username, ignore_ssl_errors):
-    config_accessor.update_profile(name, server, username, ignore_ssl_errors)
+def update_profile(
+    name,
+    server,
+    username,
+    ignore_ssl_errors,
+    bulk_workers=None,
+    rate_limit=None,
+    rate_limit_burst=None,
+):
+    config_accessor.update_profile(
+        name,
+        server,
+        username,
+        ignore_ssl_errors,
+        bulk_workers,
+        rate_limit,
+        rate_limit_burst,
+    )
 
 
 def get_all_profiles():
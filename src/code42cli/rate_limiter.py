@@ -0,0 +1,61 @@
+from threading import Lock
+from time import monotonic
+from time import sleep
+
+from requests.adapters import HTTPAdapter
+
+
+class TokenBucket:
+    """Limits how often something can happen across threads to a sustained rate, while allowing
+    short bursts.
+
+    The bucket holds up to `burst` tokens and refills at `rate` tokens per second. Each call to
+    `acquire` takes a token, waiting for one to refill if the bucket is empty. Callers that have
+    to wait are served in the order they arrived.
+
+    Args:
+        rate (float): The sustained number of acquisitions allowed per second.
+        burst (int): The most acquisitions allowed at once after a quiet period. Defaults to
+            `rate` rounded up, or 1.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+        self.rate = rate
+        self.burst = burst or max(1, int(-(-rate // 1)))
+        self._tokens = float(self.burst)
+        self._updated = monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        """Takes a token, blocking until one is available."""
+        wait_time = self._reserve()
+        if wait_time > 0:
+            sleep(wait_time)
+
+    def _reserve(self):
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is the debt of callers already waiting for tokens, so each new
+            # caller waits behind them.
+            return -self._tokens / self.rate if self._tokens < 0 else 0
+
+
+class RateLimitedHTTPAdapter(HTTPAdapter):
+    """An HTTPAdapter that takes a token from `rate_limiter`, if given, before sending each
+    request."""
+
+    def __init__(self, rate_limiter=None, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        return super().send(request, **kwargs)
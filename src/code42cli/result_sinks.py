@@ -0,0 +1,118 @@
+import csv
+import json
+import sys
+from abc import ABC
+from abc import abstractmethod
+
+
+class ResultSink(ABC):
+    """Receives the results of bulk tasks as they complete."""
+
+    @property
+    def results(self):
+        """The results written so far, if this sink keeps them."""
+        return None
+
+    @property
+    def writes_to_stdout(self):
+        """Whether results are written to stdout, so that other output should go elsewhere."""
+        return False
+
+    @abstractmethod
+    def write(self, result):
+        """Writes a single result."""
+
+    def reset(self):
+        """Discards any results this sink keeps."""
+        pass
+
+    def close(self):
+        pass
+
+
+class ListResultSink(ResultSink):
+    """Keeps results in memory so they can be used once processing finishes."""
+
+    def __init__(self):
+        self._results = []
+
+    @property
+    def results(self):
+        return self._results
+
+    def write(self, result):
+        self._results.append(result)
+
+    def reset(self):
+        self._results = []
+
+
+class JsonLinesResultSink(ResultSink):
+    """Writes each record of a result to a file as a line of JSON."""
+
+    def __init__(self, file):
+        self._file = file
+
+    @property
+    def writes_to_stdout(self):
+        return _is_stdout(self._file)
+
+    def write(self, result):
+        for record in to_records(result):
+            self._file.write("{}\n".format(json.dumps(record, default=str)))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class CsvResultSink(ResultSink):
+    """Writes each record of a result to a file as a CSV row. The header is taken from the keys of
+    the first record; keys that first appear in later records are left out."""
+
+    def __init__(self, file):
+        self._file = file
+        self._writer = None
+
+    @property
+    def writes_to_stdout(self):
+        return _is_stdout(self._file)
+
+    def write(self, result):
+        for record in to_records(result):
+            if self._writer is None:
+                self._writer = csv.DictWriter(
+                    self._file, fieldnames=list(record), extrasaction="ignore"
+                )
+                self._writer.writeheader()
+            self._writer.writerow(record)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def create_result_sink(file):
+    """Creates a sink that writes results to the given file, as CSV if its name ends in `.csv`
+    and as JSON lines otherwise (including when writing to stdout)."""
+    name = getattr(file, "name", "") or ""
+    if str(name).lower().endswith(".csv"):
+        return CsvResultSink(file)
+    return JsonLinesResultSink(file)
+
+
+def _is_stdout(file):
+    return file is sys.stdout or getattr(file, "name", None) == "<stdout>"
+
+
+def to_records(result):
+    """Converts a task result (a dict, a list of dicts, or a DataFrame) to a list of dicts."""
+    if result is None:
+        return []
+    if isinstance(result, dict):
+        return [result]
+    if hasattr(result, "to_json"):
+        # Round-trip through JSON so NaN and numpy values become plain JSON-compatible values.
+        # Parse with the same library the sinks write with, so values come out unchanged.
+        return json.loads(result.to_json(orient="records", default_handler=str))
+    return list(result)
@@ -6,17 +6,26 @@ from click import prompt
 from click import secho
 from py42.exceptions import Py42MFARequiredError
 from py42.exceptions import Py42UnauthorizedError
+from py42.services import _connection
 from requests.exceptions import ConnectionError
 from requests.exceptions import SSLError
 
 from code42cli.errors import Code42CLIError
 from code42cli.errors import LoggedCLIError
 from code42cli.logger import get_main_cli_logger
+from code42cli.rate_limiter import RateLimitedHTTPAdapter
+from code42cli.rate_limiter import TokenBucket
 
 py42.settings.items_per_page = 500
 
 logger = get_main_cli_logger()
 
+# py42 shares one connection pool across all of its requests and blocks when it is exhausted.
+_DEFAULT_MAX_CONNECTIONS = 4
+_max_connections = _DEFAULT_MAX_CONNECTIONS
+# Limits the rate of every request py42 makes in this process, if set.
+_rate_limiter = None
+
 
 def create_sdk(profile, is_debug_mode, password=None, totp=None):
     if is_debug_mode:
@@ -32,6 +41,7 @@ def create_sdk(profile, is_debug_mode, password=None, totp=None):
             requests.packages.urllib3.exceptions.InsecureRequestWarning
         )
         py42.settings.verify_ssl_certs = False
+    set_rate_limit(profile.rate_limit, profile.rate_limit_burst)
     password = password or profile.get_password()
     return _validate_connection(profile.authority_url, profile.username, password, totp)
 
@@ -59,3 +69,39 @@ def _validate_connection(authority_url, username, password, totp=None):
     except Exception as err:
         logger.log_error(err)
         raise LoggedCLIError("Unknown problem validating connection.")
+
+
+def ensure_max_connections(count):
+    """Grows the connection pool py42 shares across requests so that `count` requests can be in
+    flight at once. py42 only allows 4 concurrent connections by default, which would otherwise
+    cap the concurrency of bulk commands.
+    """
+    global _max_connections
+    if count <= _max_connections:
+        return
+    _max_connections = count
+    _mount_adapter()
+
+
+def set_rate_limit(requests_per_second, burst=None):
+    """Limits every request py42 makes in this process, from any thread, to a sustained
+    `requests_per_second`, allowing bursts of up to `burst` requests. Removes the limit if
+    `requests_per_second` is falsy."""
+    global _rate_limiter
+    if not requests_per_second and _rate_limiter is None:
+        return
+    _rate_limiter = (
+        TokenBucket(requests_per_second, burst) if requests_per_second else None
+    )
+    _mount_adapter()
+
+
+def _mount_adapter():
+    adapter = RateLimitedHTTPAdapter(
+        _rate_limiter,
+        pool_connections=200,
+        pool_maxsize=_max_connections,
+        pool_block=True,
+    )
+    _connection.ROOT_SESSION.mount("https://", adapter)
+    _connection.ROOT_SESSION.mount("http://", adapter)
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+from threading import Lock
+from time import time
+
+from code42cli.util import get_user_project_path
+
+# How long cached users are trusted before they are looked up again.
+DEFAULT_USER_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+_LAST_FULL_REFRESH_KEY = "last_full_refresh"
+
+
+class UserCache:
+    """A local SQLite cache of usernames and user UIDs so that they don't have to be downloaded
+    again every time the CLI runs.
+
+    Each user is stored with the time it was fetched and expires after `ttl` seconds. A full
+    refresh replaces every user at once; individual users are added as they are looked up, so a
+    stale or partial cache is refreshed incrementally.
+
+    Args:
+        path (str): The path to the SQLite database file.
+        ttl (int): How many seconds cached users stay valid.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_USER_CACHE_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self._connection = None
+        self._lock = Lock()
+
+    @classmethod
+    def for_profile(cls, profile_name, ttl=DEFAULT_USER_CACHE_TTL_SECONDS):
+        """Gets the cache for the given profile, stored under `~/.code42cli/user_cache`."""
+        dir_path = get_user_project_path("user_cache")
+        return cls(os.path.join(dir_path, f"{profile_name}.db"), ttl=ttl)
+
+    @property
+    def last_full_refresh(self):
+        """The time of the last full refresh in seconds since the epoch, or `None`."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT value FROM meta WHERE key = ?", (_LAST_FULL_REFRESH_KEY,)
+                )
+                .fetchone()
+            )
+        return float(row[0]) if row else None
+
+    def get_user_id(self, username):
+        """Returns the cached UID for `username`, or `None` if it isn't cached or has expired."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT user_uid FROM users WHERE username = ? AND fetched_at > ?",
+                    (username.lower(), self._expired_before()),
+                )
+                .fetchone()
+            )
+        return row[0] if row else None
+
+    def get_all_users(self):
+        """Returns every cached user as a dict with `username` and `userUid` keys, or `None` if
+        the last full refresh has expired (or never happened)."""
+        last_full_refresh = self.last_full_refresh
+        if last_full_refresh is None or last_full_refresh <= self._expired_before():
+            return None
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT display_username, user_uid FROM users"
+            )
+            return [{"username": row[0], "userUid": row[1]} for row in rows]
+
+    def add_users(self, users):
+        """Adds or updates the given users (dicts with `username` and `userUid` keys)."""
+        now = time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?)",
+                    _to_rows(users, now),
+                )
+
+    def replace_all(self, users):
+        """Replaces the cache with the given users, the result of a full refresh."""
+        now = time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM users")
+                connection.executemany(
+                    "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?)",
+                    _to_rows(users, now),
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                    (_LAST_FULL_REFRESH_KEY, str(now)),
+                )
+
+    def count(self):
+        """The number of cached users, including expired ones."""
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def clear(self):
+        """Removes every cached user."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM users")
+                connection.execute("DELETE FROM meta")
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _expired_before(self):
+        return time() - self.ttl
+
+    def _connect(self):
+        if self._connection is None:
+            # Bulk commands look users up from several worker threads.
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS users (username TEXT PRIMARY KEY, "
+                    "display_username TEXT, user_uid TEXT, fetched_at REAL)"
+                )
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+                )
+        return self._connection
+
+
+def _to_rows(users, fetched_at):
+    return (
+        (user["username"].lower(), user["username"], user["userUid"], fetched_at)
+        for user in users
+    )
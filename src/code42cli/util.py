@@ -3,6 +3,7 @@ import os
 import shutil
 from collections import OrderedDict
 from functools import wraps
+from hashlib import blake2b
 from hashlib import md5
 from os import path
 from signal import getsignal
@@ -13,7 +14,12 @@ from click import echo
 from click import get_current_context
 from click import style
 
+import code42cli.json_backend as json_backend
+
 _PADDING_SIZE = 3
+# Identifies hashes from the current version of `hash_event`.
+EVENT_HASH_VERSION_PREFIX = "v2:"
+_EVENT_HASH_DIGEST_SIZE = 16
 
 
 def does_user_agree(prompt):
@@ -170,6 +176,24 @@ def _get_default_header(header_items):
 
 
 def hash_event(event):
+    """Returns a hash that identifies the event (a `dict` or a `str`) across runs, such as for
+    checkpoints. The event is serialized canonically and hashed with 128-bit BLAKE2b. The hash is
+    prefixed with `EVENT_HASH_VERSION_PREFIX` so it can be told apart from older hashes (see
+    `hash_event_v1`)."""
+    if isinstance(event, dict):
+        event = json_backend.dumps_canonical(event)
+    digest = blake2b(event.encode(), digest_size=_EVENT_HASH_DIGEST_SIZE).hexdigest()
+    return f"{EVENT_HASH_VERSION_PREFIX}{digest}"
+
+
+def hash_event_v1(event):
+    """Returns the unversioned MD5 hash of the event that `hash_event` used to return. Checkpoints
+    saved by earlier versions hold these hashes."""
     if isinstance(event, dict):
         event = json.dumps(event, sort_keys=True)
     return md5(event.encode()).hexdigest()
+
+
+def is_current_event_hash(event_hash):
+    """Whether the hash was returned by the current version of `hash_event`."""
+    return event_hash.startswith(EVENT_HASH_VERSION_PREFIX)
@@ -1,27 +1,59 @@
+import heapq
+import math
 import queue
+import random
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from itertools import count
+from threading import Condition
 from threading import Lock
 from threading import Thread
-from time import sleep
+from time import perf_counter
+from time import time
 
 from py42.exceptions import Py42ForbiddenError
 from py42.exceptions import Py42HTTPError
+from requests.exceptions import ConnectionError
+from requests.exceptions import Timeout
 
 from code42cli.errors import Code42CLIError
+from code42cli.errors import PartialFailureError
 from code42cli.logger import get_main_cli_logger
+from code42cli.result_sinks import ListResultSink
+
+# Queued in place of a task to tell a worker thread to exit.
+_SHUTDOWN = object()
+
+# HTTP statuses the server uses to signal that it is overloaded or throttling requests.
+_THROTTLING_STATUS_CODES = (429, 503)
 
 
 class WorkerStats:
-    """Stats about the tasks that have run."""
+    """Stats about the tasks that have run.
 
-    def __init__(self, total):
-        self.total = total
+    Args:
+        total (int): The number of tasks expected to run, or None if it isn't known.
+        result_sink (ResultSink): Where to send the results of tasks as they complete. Defaults
+            to keeping them in memory.
+    """
 
-    _total_processed = 0
-    _total_errors = 0
-    _results = []
-    __total_processed_lock = Lock()
-    __total_errors_lock = Lock()
-    __results_lock = Lock()
+    def __init__(self, total, result_sink=None):
+        self.total = total
+        self._total_processed = 0
+        self._total_errors = 0
+        self._result_sink = result_sink or ListResultSink()
+        self._latencies = LatencyHistogram()
+        self._errors_by_type = Counter()
+        self._errors_by_status = Counter()
+        self._retries_by_status = Counter()
+        self._total_retries = 0
+        self._completed_per_second = Counter()
+        self._start_time = None
+        self._last_completed_time = None
+        self.__total_processed_lock = Lock()
+        self.__total_errors_lock = Lock()
+        self.__results_lock = Lock()
+        self.__performance_lock = Lock()
 
     @property
     def total_processed(self):
@@ -40,59 +72,458 @@ class WorkerStats:
 
     @property
     def results(self):
-        return self._results
+        """The results of the tasks, if they are kept in memory. Tasks that return None have no
+        result."""
+        return self._result_sink.results
 
     def __str__(self):
+        if self.total is None:
+            return "{} succeeded, {} failed".format(
+                self.total_successes, self._total_errors
+            )
         return "{} succeeded, {} failed out of {}".format(
             self.total_successes, self._total_errors, self.total
         )
 
-    def increment_total_processed(self):
-        """+1 to self.total_processed"""
+    def increment_total_processed(self, count=1):
+        """+`count` to self.total_processed"""
         with self.__total_processed_lock:
-            self._total_processed += 1
+            self._total_processed += count
 
-    def increment_total_errors(self):
-        """+1 to self.total_errors"""
+    def increment_total_errors(self, count=1):
+        """+`count` to self.total_errors"""
         with self.__total_errors_lock:
-            self._total_errors += 1
+            self._total_errors += count
 
     def add_result(self, result):
-        """add a result to the list"""
+        """Sends a result to the result sink."""
+        if result is None:
+            return
         with self.__results_lock:
-            self._results.append(result)
+            self._result_sink.write(result)
 
     def reset_results(self):
         with self.__results_lock:
-            self._results = []
+            self._result_sink.reset()
+
+    @property
+    def latencies(self):
+        """A histogram of how long each task took, in seconds."""
+        return self._latencies
+
+    @property
+    def elapsed(self):
+        """Seconds from when the first task started until the last one completed."""
+        if self._start_time is None:
+            return 0.0
+        return self._last_completed_time - self._start_time
+
+    @property
+    def throughput(self):
+        """The average number of tasks completed per second."""
+        elapsed = self.elapsed
+        return self._latencies.count / elapsed if elapsed else 0.0
+
+    def record_latency(self, latency):
+        """Records how long a completed task took, in seconds."""
+        now = perf_counter()
+        with self.__performance_lock:
+            if self._start_time is None:
+                self._start_time = now - latency
+            self._last_completed_time = now
+            self._latencies.add(latency)
+            self._completed_per_second[int(now - self._start_time)] += 1
+
+    def record_error(self, err, count=1):
+        """Counts an error that failed `count` items by its exception type and, for HTTP errors,
+        its status code."""
+        self.increment_total_errors(count)
+        status_code = _get_status_code(err)
+        with self.__performance_lock:
+            self._errors_by_type[type(err).__name__] += count
+            if status_code is not None:
+                self._errors_by_status[status_code] += count
+
+    @property
+    def total_retries(self):
+        """The number of times a task was retried after a transient error. Retried attempts are
+        not counted as processed or as errors."""
+        return self._total_retries
+
+    def record_retry(self, err):
+        """Counts a retry of a task that failed with the given transient error."""
+        status_code = _get_status_code(err)
+        with self.__performance_lock:
+            self._total_retries += 1
+            self._retries_by_status[status_code or type(err).__name__] += 1
+
+    def describe_performance(self):
+        """A short summary of latency percentiles and throughput for showing progress."""
+        if not self._latencies.count:
+            return ""
+        description = "p50 {:.2f}s, p95 {:.2f}s, p99 {:.2f}s, {:.1f}/s".format(
+            self._latencies.percentile(50),
+            self._latencies.percentile(95),
+            self._latencies.percentile(99),
+            self.throughput,
+        )
+        if self._total_retries:
+            description = f"{description}, {self._total_retries} retried"
+        return description
+
+    def to_dict(self):
+        """All stats as a JSON-serializable dict."""
+        with self.__performance_lock:
+            return {
+                "total": self.total,
+                "processed": self.total_processed,
+                "succeeded": self.total_successes,
+                "failed": self.total_errors,
+                "elapsed_seconds": self.elapsed,
+                "throughput_per_second": self.throughput,
+                "latency_seconds": self._latencies.to_dict(),
+                "errors_by_type": dict(self._errors_by_type),
+                "errors_by_status": {
+                    str(status): count
+                    for status, count in sorted(self._errors_by_status.items())
+                },
+                "retries": self._total_retries,
+                "retries_by_status": {
+                    str(status): count
+                    for status, count in self._retries_by_status.items()
+                },
+                "completed_per_second": [
+                    {"second": second, "completed": count}
+                    for second, count in sorted(self._completed_per_second.items())
+                ],
+            }
+
+
+class LatencyHistogram:
+    """Counts latencies in exponentially growing buckets so that percentiles can be estimated, to
+    within about 10%, without keeping every latency in memory."""
+
+    # The upper bound of the first bucket, in seconds. Each bucket's bound is 10% more than the
+    # one before it.
+    _FIRST_BOUND = 0.001
+    _GROWTH = 1.1
+
+    def __init__(self):
+        self._counts = Counter()
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, latency):
+        self._counts[self._get_bucket(latency)] += 1
+        self.count += 1
+        self.sum += latency
+        self.max = max(self.max, latency)
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def percentile(self, percent):
+        """Estimates the latency that `percent` percent of tasks completed within."""
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= rank:
+                return min(self._get_bound(bucket), self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": [
+                {"le": self._get_bound(bucket), "count": count}
+                for bucket, count in sorted(self._counts.items())
+            ],
+        }
+
+    def _get_bucket(self, latency):
+        if latency <= self._FIRST_BOUND:
+            return 0
+        return math.ceil(math.log(latency / self._FIRST_BOUND, self._GROWTH))
+
+    def _get_bound(self, bucket):
+        return self._FIRST_BOUND * self._GROWTH ** bucket
+
+
+class AdaptiveConcurrency:
+    """Limits how many tasks run at once and adjusts that limit based on how the server responds.
+
+    After every `window` tasks, the limit grows by one if their average latency stayed within
+    `tolerance` of the best average seen so far, and shrinks by one if it did not. The limit is
+    halved whenever the server throttles a request.
+
+    Args:
+        maximum (int): The most tasks allowed to run at once.
+        initial (int): The number of tasks allowed to run at once to start with.
+        window (int): The number of completed tasks to average latency over.
+        tolerance (float): How much slower than the baseline a window can be before the limit
+            is lowered.
+    """
+
+    def __init__(self, maximum, initial=2, window=10, tolerance=1.5):
+        self._maximum = maximum
+        self._limit = min(initial, maximum)
+        self._window = window
+        self._tolerance = tolerance
+        self._latencies = []
+        self._baseline = None
+        self._active = 0
+        self._condition = Condition()
+
+    @property
+    def limit(self):
+        """The number of tasks currently allowed to run at once."""
+        return self._limit
+
+    def acquire(self):
+        """Blocks until another task is allowed to run."""
+        with self._condition:
+            while self._active >= self._limit:
+                self._condition.wait()
+            self._active += 1
+
+    def release(self, latency, throttled=False):
+        """Records the outcome of a finished task and lets another one run.
+
+        Args:
+            latency (float): How long the task took in seconds.
+            throttled (bool): Whether the server rejected the task because it was overloaded.
+        """
+        with self._condition:
+            self._active -= 1
+            if throttled:
+                self._limit = max(1, self._limit // 2)
+                self._latencies = []
+            else:
+                self._latencies.append(latency)
+                if len(self._latencies) >= self._window:
+                    self._adjust()
+            self._condition.notify_all()
+
+    def _adjust(self):
+        average = sum(self._latencies) / len(self._latencies)
+        self._latencies = []
+        if self._baseline is None:
+            self._baseline = average
+        if average <= self._baseline * self._tolerance:
+            self._limit = min(self._maximum, self._limit + 1)
+        else:
+            self._limit = max(1, self._limit - 1)
+        # Let the baseline drift up slowly so a server that is permanently slower than it was at
+        # the start doesn't pin the limit at 1.
+        self._baseline = min(average, self._baseline * 1.05)
+
+
+class RetryPolicy:
+    """Decides whether, and how long after, a task that failed with a transient error is retried.
+
+    Delays grow exponentially with each attempt and are randomized between zero and that amount
+    ("full jitter") so that tasks throttled together don't all retry at the same moment. When the
+    server sends a `Retry-After` header, its delay is used instead if it is longer.
+
+    Args:
+        max_attempts (int): The most times a task is attempted, including the first attempt.
+        base_delay (float): The most seconds to wait before the first retry.
+        max_delay (float): The most seconds to wait before any retry, unless the server asks
+            for longer with `Retry-After`.
+        retryable_statuses (tuple): The HTTP status codes that are retried. Connection errors
+            and timeouts are always retried.
+    """
+
+    DEFAULT_RETRYABLE_STATUSES = (429, 502, 503, 504)
+
+    def __init__(
+        self,
+        max_attempts=3,
+        base_delay=1.0,
+        max_delay=30.0,
+        retryable_statuses=DEFAULT_RETRYABLE_STATUSES,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable_statuses = retryable_statuses
+
+    def get_delay(self, err, attempt):
+        """Returns how many seconds to wait before retrying a task that raised `err` on the
+        given attempt (starting at 1), or None if it shouldn't be retried."""
+        if attempt >= self.max_attempts or not self.is_retryable(err):
+            return None
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(0, backoff)
+        retry_after = _get_retry_after(err)
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    def is_retryable(self, err):
+        if isinstance(err, (ConnectionError, Timeout)):
+            return True
+        return (
+            isinstance(err, Py42HTTPError)
+            and _get_status_code(err) in self.retryable_statuses
+        )
+
+
+class _RetryScheduler:
+    """Holds tasks until their retry is due and then puts them back on the queue, so that
+    waiting to retry never occupies a worker thread.
+
+    A task stays unfinished on the queue while it waits, so `queue.join()` doesn't return until
+    its retry completes.
+    """
+
+    def __init__(self, task_queue):
+        self._queue = task_queue
+        self._pending = []
+        self._sequence = count()
+        self._condition = Condition()
+        self._thread = None
+        self._stopping = False
+
+    def schedule(self, task, delay):
+        with self._condition:
+            due = perf_counter() + delay
+            heapq.heappush(self._pending, (due, next(self._sequence), task))
+            if self._thread is None:
+                self._stopping = False
+                self._thread = Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+
+    def stop(self):
+        """Stops the scheduler thread once no retries are waiting."""
+        with self._condition:
+            thread = self._thread
+            self._stopping = True
+            self._condition.notify()
+        if thread:
+            thread.join()
+        with self._condition:
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                task = self._get_due_task()
+                if task is None:
+                    return
+            self._queue.put(task)
+            # Balances the `put` of the attempt that failed, which was never marked done.
+            self._queue.task_done()
+
+    def _get_due_task(self):
+        while True:
+            if not self._pending:
+                if self._stopping:
+                    return None
+                self._condition.wait()
+                continue
+            wait_time = self._pending[0][0] - perf_counter()
+            if wait_time <= 0:
+                return heapq.heappop(self._pending)[2]
+            self._condition.wait(wait_time)
 
 
 class Worker:
-    def __init__(self, thread_count, expected_total, bar=None):
-        self._queue = queue.Queue()
+    """Runs tasks concurrently on a pool of threads.
+
+    Args:
+        thread_count (int): The number of threads to run tasks on. When `adaptive` is True, this
+            is the most tasks that will run at once.
+        expected_total (int): The number of tasks expected to run, for reporting progress, or
+            None if it isn't known.
+        bar: An optional progress bar to update as tasks complete.
+        adaptive (bool): Whether to adjust how many tasks run at once based on task latency and
+            server throttling instead of always running `thread_count` at once.
+        max_queued (int): The most tasks that can be waiting to run. Once reached, `do_async`
+            blocks until a task starts. Defaults to no limit.
+        result_sink (ResultSink): Where to send the results of tasks as they complete. Defaults
+            to keeping them in memory.
+        retry_policy (RetryPolicy): How to retry tasks that fail with transient errors. Defaults
+            to not retrying.
+    """
+
+    def __init__(
+        self,
+        thread_count,
+        expected_total,
+        bar=None,
+        adaptive=False,
+        max_queued=0,
+        result_sink=None,
+        retry_policy=None,
+    ):
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._retry_policy = retry_policy
+        self._retry_scheduler = _RetryScheduler(self._queue)
         self._thread_count = thread_count
-        self._stats = WorkerStats(expected_total)
-        self._tasks = 0
+        self._concurrency = AdaptiveConcurrency(thread_count) if adaptive else None
+        self._stats = WorkerStats(expected_total, result_sink=result_sink)
+        self._threads = []
         self.__started = False
         self.__start_lock = Lock()
         self._logger = get_main_cli_logger()
         self._bar = bar
 
     def do_async(self, func, *args, **kwargs):
-        """Execute the given func asynchronously given *args and **kwargs.
+        """Execute the given func asynchronously given *args and **kwargs. Blocks while the queue
+        of waiting tasks is full.
 
         Args:
             func (callable): The function to execute asynchronously.
             *args (iter): Positional args to pass to the function.
             **kwargs (dict): Key-value args to pass to the function.
         """
+        self._put_task(func, args, kwargs)
+
+    def do_async_task(self, func, args=(), kwargs=None, on_failure=None, item_count=1):
+        """Like `do_async`, with options for tasks that need to know their final outcome or that
+        stand for more than one item.
+
+        Args:
+            func (callable): The function to execute asynchronously.
+            args (tuple): Positional args to pass to the function.
+            kwargs (dict): Key-value args to pass to the function.
+            on_failure (callable): Called on the worker thread with the error if the task fails
+                for good, that is, once it has failed and won't be retried. Attempts that are
+                retried don't call it.
+            item_count (int): How many items the task processes, such as a batch of alerts
+                updated in one request. Stats and the progress bar count the task as that many
+                items. If the task raises `PartialFailureError`, only its `failed_count` items
+                count as failed.
+        """
+        self._put_task(func, args, kwargs or {}, on_failure, item_count)
+
+    def _put_task(self, func, args, kwargs, on_failure=None, item_count=1):
         if not self.__started:
             with self.__start_lock:
                 if not self.__started:
                     self.__start()
                     self.__started = True
-        self._queue.put({"func": func, "args": args, "kwargs": kwargs})
-        self._tasks += 1
+        self._queue.put(
+            {
+                "func": func,
+                "args": args,
+                "kwargs": kwargs,
+                "attempt": 1,
+                "on_failure": on_failure,
+                "item_count": item_count,
+            }
+        )
 
     @property
     def stats(self):
@@ -102,45 +533,141 @@ class Worker:
 
     def wait(self):
         """Wait for the tasks in the queue to complete. This should usually be called before
-        program termination."""
-        while self._stats.total_processed < self._tasks:
-            sleep(0.5)
+        program termination. Returns as soon as the last queued task finishes."""
+        self._queue.join()
+
+    def shutdown(self):
+        """Wait for the queued tasks to complete and then stop the worker threads. Calling
+        `do_async` after shutting down starts a new set of threads."""
+        with self.__start_lock:
+            if not self.__started:
+                return
+            for _ in self._threads:
+                self._queue.put(_SHUTDOWN)
+            for thread in self._threads:
+                thread.join()
+            self._retry_scheduler.stop()
+            self._threads = []
+            self.__started = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+        return False
 
     def _process_queue(self):
         while True:
+            task = self._queue.get()
+            if task is _SHUTDOWN:
+                self._queue.task_done()
+                return
+            if self._concurrency:
+                self._concurrency.acquire()
+            start = perf_counter()
+            throttled = False
+            retrying = False
+            failure = None
             try:
-                task = self._queue.get()
                 func = task["func"]
                 args = task["args"]
                 kwargs = task["kwargs"]
                 self._stats.add_result(func(*args, **kwargs))
             except Code42CLIError as err:
-                self._increment_total_errors()
+                failure = err
+                self._stats.record_error(err, _get_failed_count(task, err))
                 self._logger.log_error(err)
             except Py42ForbiddenError as err:
-                self._increment_total_errors()
+                failure = err
+                self._stats.record_error(err, task["item_count"])
                 self._logger.log_verbose_error(http_request=err.response.request)
                 self._logger.log_error(
                     "You do not have the necessary permissions to perform this task. "
                     "Try using or creating a different profile."
                 )
             except Py42HTTPError as err:
-                self._increment_total_errors()
-                self._logger.log_verbose_error(http_request=err.response.request)
-            except Exception:
-                self._increment_total_errors()
-                self._logger.log_verbose_error()
+                throttled = _is_throttling_error(err)
+                retrying = self._retry(task, err)
+                if not retrying:
+                    failure = err
+                    self._stats.record_error(err, task["item_count"])
+                    self._logger.log_verbose_error(http_request=err.response.request)
+            except Exception as err:
+                retrying = self._retry(task, err)
+                if not retrying:
+                    failure = err
+                    self._stats.record_error(err, task["item_count"])
+                    self._logger.log_verbose_error()
             finally:
-                self._stats.increment_total_processed()
-                if self._bar:
-                    self._bar.update(1)
-                self._queue.task_done()
+                latency = perf_counter() - start
+                if self._concurrency:
+                    self._concurrency.release(latency, throttled)
+                self._stats.record_latency(latency)
+                # A retried task is marked done by the retry scheduler once it is re-queued.
+                if failure is not None and task["on_failure"]:
+                    self._handle_failure(task, failure)
+                if not retrying:
+                    self._stats.increment_total_processed(task["item_count"])
+                    if self._bar:
+                        self._bar.update(task["item_count"])
+                    self._queue.task_done()
+
+    def _handle_failure(self, task, err):
+        try:
+            task["on_failure"](err)
+        except Exception:
+            # Keep the thread processing tasks; the task itself is already counted as an error.
+            self._logger.log_verbose_error()
+
+    def _retry(self, task, err):
+        """Schedules the task to run again if the retry policy allows it. Returns whether it
+        was scheduled."""
+        if not self._retry_policy:
+            return False
+        delay = self._retry_policy.get_delay(err, task["attempt"])
+        if delay is None:
+            return False
+        self._stats.record_retry(err)
+        self._retry_scheduler.schedule({**task, "attempt": task["attempt"] + 1}, delay)
+        return True
 
     def __start(self):
         for _ in range(0, self._thread_count):
             t = Thread(target=self._process_queue)
             t.daemon = True
             t.start()
+            self._threads.append(t)
+
+
+def _get_failed_count(task, err):
+    if isinstance(err, PartialFailureError):
+        return min(err.failed_count, task["item_count"])
+    return task["item_count"]
+
+
+def _is_throttling_error(err):
+    return _get_status_code(err) in _THROTTLING_STATUS_CODES
+
+
+def _get_retry_after(err):
+    """The number of seconds the server asked to wait in the `Retry-After` header of an HTTP
+    error, if any."""
+    response = getattr(err, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
 
-    def _increment_total_errors(self):
-        self._stats.increment_total_errors()
+def _get_status_code(err):
+    response = getattr(err, "response", None)
+    return getattr(response, "status_code", None)
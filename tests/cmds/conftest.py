@@ -128,3 +128,18 @@ def get_mark_for_search_and_send_to(command_group):
     search_cmd = [command_group, "search"]
     send_to_cmd = [command_group, "send-to", "0.0.0.0"]
     return pytest.mark.parametrize("command", (search_cmd, send_to_cmd))
+
+
+@pytest.fixture
+def follow_for_two_polls(mocker):
+    """Makes `--follow` stop after polling twice instead of waiting for SIGTERM."""
+    waits = []
+
+    def wait(follower):
+        waits.append(None)
+        if len(waits) == 2:
+            follower.stop()
+
+    return mocker.patch(
+        "code42cli.cmds.search.follow.Follower._wait", autospec=True, side_effect=wait
+    )
@@ -1,4 +1,6 @@
-from os import path
+import os
+import sqlite3
+from pathlib import Path
 
 import pytest
 
@@ -7,6 +9,7 @@ from code42cli.cmds.search.cursor_store import AlertCursorStore
 from code42cli.cmds.search.cursor_store import AuditLogCursorStore
 from code42cli.cmds.search.cursor_store import Cursor
 from code42cli.cmds.search.cursor_store import FileEventCursorStore
+from code42cli.cmds.search.cursor_store import get_all_cursor_stores_for_profile
 from code42cli.errors import Code42CLIError
 
 PROFILE_NAME = "testprofile"
@@ -18,328 +21,275 @@ ALERT_CHECKPOINT_FOLDER_NAME = "alert_checkpoints"
 FILE_EVENT_CHECKPOINT_FOLDER_NAME = "file_event_checkpoints"
 AUDIT_LOG_CHECKPOINT_FOLDER_NAME = "audit_log_checkpoints"
 
-
-@pytest.fixture
-def mock_open(mocker):
-    mock = mocker.patch("builtins.open", mocker.mock_open(read_data="123456789"))
-    return mock
-
-
 AUDIT_LOG_EVENT_HASH_1 = "bc8f70ff821cadcc3e717d534d14737d"
 AUDIT_LOG_EVENT_HASH_2 = "66ad12c0a0dba2b41520fb69aeefd84d"
 
-
-@pytest.fixture
-def mock_open_events(mocker):
-    mock = mocker.patch(
-        "builtins.open",
-        mocker.mock_open(
-            read_data='["{}", "{}"]'.format(
-                AUDIT_LOG_EVENT_HASH_1, AUDIT_LOG_EVENT_HASH_2
-            )
-        ),
-    )
-    return mock
+STORE_CLASSES = [
+    (FileEventCursorStore, FILE_EVENT_CHECKPOINT_FOLDER_NAME),
+    (AlertCursorStore, ALERT_CHECKPOINT_FOLDER_NAME),
+    (AuditLogCursorStore, AUDIT_LOG_CHECKPOINT_FOLDER_NAME),
+]
 
 
 @pytest.fixture
-def mock_isfile(mocker):
-    mock = mocker.patch("{}.os.path.isfile".format(_NAMESPACE))
-    mock.return_value = True
-    return mock
+def user_project_path(mocker, tmp_path, mock_listdir, mock_remove):
+    # `os.makedirs`, `os.listdir` and `os.remove` are mocked for every test; use the real file
+    # system under `tmp_path` instead.
+    mock_listdir.side_effect = lambda dir_path: [
+        entry.name for entry in os.scandir(dir_path)
+    ]
+    mock_remove.side_effect = lambda file_path: Path(file_path).unlink()
+
+    def get_user_project_path(*subdirs):
+        result_path = tmp_path.joinpath(*subdirs)
+        result_path.mkdir(parents=True, exist_ok=True)
+        return str(result_path)
+
+    mocker.patch(
+        "{}.get_user_project_path".format(_NAMESPACE),
+        side_effect=get_user_project_path,
+    )
+    return tmp_path
 
 
-class TestCursor:
-    def test_name_returns_expected_name(self):
-        cursor = Cursor("bogus/path")
-        assert cursor.name == "path"
+@pytest.fixture(params=STORE_CLASSES, ids=lambda param: param[1])
+def store_class(request, user_project_path):
+    return request.param[0]
 
-    def test_value_returns_expected_value(self, mock_open):
-        cursor = Cursor("bogus/path")
-        assert cursor.value == "123456789"
 
-    def test_value_reads_expected_file(self, mock_open):
-        cursor = Cursor("bogus/path")
-        _ = cursor.value
-        mock_open.assert_called_once_with("bogus/path")
+@pytest.fixture
+def store(store_class):
+    store = store_class(PROFILE_NAME)
+    yield store
+    store.close()
 
 
-class TestAlertCursorStore:
-    def test_get_returns_expected_timestamp(self, mock_open):
-        store = AlertCursorStore(PROFILE_NAME)
-        checkpoint = store.get(CURSOR_NAME)
-        assert checkpoint == 123456789
+def _write_legacy_file(user_project_path, folder_name, file_name, content):
+    dir_path = user_project_path / folder_name / PROFILE_NAME
+    dir_path.mkdir(parents=True, exist_ok=True)
+    (dir_path / file_name).write_text(content)
+    return dir_path
 
-    def test_get_when_profile_does_not_exist_returns_none(self, mocker):
-        store = AlertCursorStore(PROFILE_NAME)
-        checkpoint = store.get(CURSOR_NAME)
-        mock_open = mocker.patch("{}.open".format(_NAMESPACE))
-        mock_open.side_effect = FileNotFoundError
-        assert checkpoint is None
 
-    def test_get_reads_expected_file(self, mock_open):
-        store = AlertCursorStore(PROFILE_NAME)
-        store.get(CURSOR_NAME)
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        expected_path = path.join(
-            user_path, ALERT_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, CURSOR_NAME
-        )
-        mock_open.assert_called_once_with(expected_path)
-
-    def test_replace_writes_to_expected_file(self, mock_open):
-        store = AlertCursorStore(PROFILE_NAME)
-        store.replace("checkpointname", 123)
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        expected_path = path.join(
-            user_path, ALERT_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, "checkpointname"
-        )
-        mock_open.assert_called_once_with(expected_path, "w")
-
-    def test_replace_writes_expected_content(self, mock_open):
-        store = AlertCursorStore(PROFILE_NAME)
-        store.replace("checkpointname", 123)
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        path.join(
-            user_path, ALERT_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, "checkpointname"
+class TestCursor:
+    def test_name_returns_expected_name(self):
+        cursor = Cursor("name", 123)
+        assert cursor.name == "name"
+
+    def test_value_returns_expected_value(self):
+        cursor = Cursor("name", 123)
+        assert cursor.value == 123
+
+
+class TestCursorStore:
+    def test_get_when_cursor_does_not_exist_returns_none(self, store):
+        assert store.get(CURSOR_NAME) is None
+
+    def test_get_after_replace_returns_expected_timestamp(self, store):
+        store.replace(CURSOR_NAME, 123456789)
+        assert store.get(CURSOR_NAME) == 123456789
+
+    def test_replace_overwrites_existing_timestamp(self, store):
+        store.replace(CURSOR_NAME, 123)
+        store.replace(CURSOR_NAME, 456.789)
+        assert store.get(CURSOR_NAME) == 456.789
+
+    def test_replace_persists_across_instances(self, store_class):
+        first = store_class(PROFILE_NAME)
+        first.replace(CURSOR_NAME, 123)
+        first.close()
+        second = store_class(PROFILE_NAME)
+        assert second.get(CURSOR_NAME) == 123
+        second.close()
+
+    def test_stores_of_different_kinds_do_not_share_cursors(self, user_project_path):
+        file_event_store = FileEventCursorStore(PROFILE_NAME)
+        alert_store = AlertCursorStore(PROFILE_NAME)
+        file_event_store.replace(CURSOR_NAME, 123)
+        assert alert_store.get(CURSOR_NAME) is None
+        alert_store.clean()
+        assert file_event_store.get(CURSOR_NAME) == 123
+
+    def test_stores_of_different_profiles_do_not_share_cursors(self, store_class):
+        store = store_class(PROFILE_NAME)
+        other_store = store_class("otherprofile")
+        store.replace(CURSOR_NAME, 123)
+        assert other_store.get(CURSOR_NAME) is None
+
+    def test_get_events_when_cursor_does_not_exist_returns_empty_list(self, store):
+        assert store.get_events(CURSOR_NAME) == []
+
+    def test_get_events_after_replace_events_returns_expected_events(self, store):
+        store.replace_events(
+            CURSOR_NAME, [AUDIT_LOG_EVENT_HASH_1, AUDIT_LOG_EVENT_HASH_2]
         )
-        mock_open.return_value.write.assert_called_once_with("123")
-
-    def test_delete_calls_remove_on_expected_file(self, mock_open, mock_remove):
-        store = AlertCursorStore(PROFILE_NAME)
-        store.delete("deleteme")
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        expected_path = path.join(
-            user_path, ALERT_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, "deleteme"
+        assert store.get_events(CURSOR_NAME) == [
+            AUDIT_LOG_EVENT_HASH_1,
+            AUDIT_LOG_EVENT_HASH_2,
+        ]
+
+    def test_replace_events_does_not_change_timestamp(self, store):
+        store.replace(CURSOR_NAME, 123)
+        store.replace_events(CURSOR_NAME, [AUDIT_LOG_EVENT_HASH_1])
+        assert store.get(CURSOR_NAME) == 123
+
+    def test_replace_checkpoint_replaces_timestamp_and_events(self, store):
+        store.replace_checkpoint(CURSOR_NAME, 123, [AUDIT_LOG_EVENT_HASH_1])
+        assert store.get(CURSOR_NAME) == 123
+        assert store.get_events(CURSOR_NAME) == [AUDIT_LOG_EVENT_HASH_1]
+
+    def test_replace_checkpoint_when_it_fails_changes_nothing(self, mocker, store):
+        store.replace_checkpoint(CURSOR_NAME, 123, [AUDIT_LOG_EVENT_HASH_1])
+        mocker.patch(
+            "{}.json_backend.dumps".format(_NAMESPACE), side_effect=TypeError()
         )
-        mock_remove.assert_called_once_with(expected_path)
-
-    def test_delete_when_checkpoint_does_not_exist_raises_cli_error(
-        self, mock_open, mock_remove
-    ):
-        store = AlertCursorStore(PROFILE_NAME)
-        mock_remove.side_effect = FileNotFoundError
-        with pytest.raises(Code42CLIError):
+        with pytest.raises(TypeError):
+            store.replace_checkpoint(CURSOR_NAME, 456, [AUDIT_LOG_EVENT_HASH_2])
+        assert store.get(CURSOR_NAME) == 123
+        assert store.get_events(CURSOR_NAME) == [AUDIT_LOG_EVENT_HASH_1]
+
+    def test_delete_removes_cursor(self, store):
+        store.replace(CURSOR_NAME, 123)
+        store.delete(CURSOR_NAME)
+        assert store.get(CURSOR_NAME) is None
+
+    def test_delete_when_cursor_does_not_exist_raises_cli_error(self, store):
+        with pytest.raises(Code42CLIError) as err:
             store.delete("deleteme")
+        assert str(err.value) == "No checkpoint named deleteme exists for this profile."
 
-    def test_clean_calls_remove_on_each_checkpoint(
-        self, mock_open, mock_remove, mock_listdir, mock_isfile
-    ):
-        mock_listdir.return_value = ["fileone", "filetwo", "filethree"]
-        store = AlertCursorStore(PROFILE_NAME)
+    def test_clean_removes_all_cursors(self, store):
+        store.replace("one", 1)
+        store.replace("two", 2)
         store.clean()
-        assert mock_remove.call_count == 3
+        assert store.get_all_cursors() == []
 
-    def test_get_all_cursors_returns_all_checkpoints(
-        self, mock_open, mock_listdir, mock_isfile
-    ):
-        mock_listdir.return_value = ["fileone", "filetwo", "filethree"]
-        store = AlertCursorStore(PROFILE_NAME)
+    def test_get_all_cursors_returns_all_checkpoints(self, store):
+        store.replace("fileone", 1)
+        store.replace("filetwo", 2)
+        store.replace("filethree", 3)
         cursors = store.get_all_cursors()
-        assert len(cursors) == 3
-        assert cursors[0].name == "fileone"
-        assert cursors[1].name == "filetwo"
-        assert cursors[2].name == "filethree"
-
-
-class TestFileEventCursorStore:
-    def test_get_returns_expected_timestamp(self, mock_open):
-        store = FileEventCursorStore(PROFILE_NAME)
-        checkpoint = store.get(CURSOR_NAME)
-        assert checkpoint == 123456789
-
-    def test_get_reads_expected_file(self, mock_open):
-        store = FileEventCursorStore(PROFILE_NAME)
-        store.get(CURSOR_NAME)
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        expected_path = path.join(
-            user_path, FILE_EVENT_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, CURSOR_NAME
-        )
-        mock_open.assert_called_once_with(expected_path)
-
-    def test_get_when_profile_does_not_exist_returns_none(self, mocker):
-        store = FileEventCursorStore(PROFILE_NAME)
-        checkpoint = store.get(CURSOR_NAME)
-        mock_open = mocker.patch("{}.open".format(_NAMESPACE))
-        mock_open.side_effect = FileNotFoundError
-        assert checkpoint is None
-
-    def test_replace_writes_to_expected_file(self, mock_open):
-        store = FileEventCursorStore(PROFILE_NAME)
-        store.replace("checkpointname", 123)
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        expected_path = path.join(
-            user_path, FILE_EVENT_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, "checkpointname"
-        )
-        mock_open.assert_called_once_with(expected_path, "w")
-
-    def test_replace_writes_expected_content(self, mock_open):
-        store = FileEventCursorStore(PROFILE_NAME)
-        store.replace("checkpointname", 123)
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        path.join(
-            user_path, FILE_EVENT_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, "checkpointname"
+        assert [(cursor.name, cursor.value) for cursor in cursors] == [
+            ("fileone", 1),
+            ("filethree", 3),
+            ("filetwo", 2),
+        ]
+
+    def test_database_uses_write_ahead_logging(self, store, user_project_path):
+        store.replace(CURSOR_NAME, 123)
+        db_path = user_project_path / "checkpoints" / f"{PROFILE_NAME}.db"
+        connection = sqlite3.connect(str(db_path))
+        journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        connection.close()
+        assert journal_mode == "wal"
+
+    def test_concurrent_stores_see_each_others_updates(self, store_class):
+        first = store_class(PROFILE_NAME)
+        second = store_class(PROFILE_NAME)
+        first.replace(CURSOR_NAME, 123)
+        assert second.get(CURSOR_NAME) == 123
+        second.replace(CURSOR_NAME, 456)
+        assert first.get(CURSOR_NAME) == 456
+        first.close()
+        second.close()
+
+
+class TestLegacyFileMigration:
+    @pytest.mark.parametrize("store_class,folder_name", STORE_CLASSES)
+    def test_store_imports_legacy_checkpoint_files(
+        self, user_project_path, store_class, folder_name
+    ):
+        _write_legacy_file(user_project_path, folder_name, CURSOR_NAME, "123.456")
+        store = store_class(PROFILE_NAME)
+        assert store.get(CURSOR_NAME) == 123.456
+        store.close()
+
+    def test_store_imports_legacy_event_hashes(self, user_project_path):
+        _write_legacy_file(
+            user_project_path, AUDIT_LOG_CHECKPOINT_FOLDER_NAME, CURSOR_NAME, "123"
         )
-        mock_open.return_value.write.assert_called_once_with("123")
-
-    def test_delete_calls_remove_on_expected_file(self, mock_open, mock_remove):
-        store = FileEventCursorStore(PROFILE_NAME)
-        store.delete("deleteme")
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        expected_path = path.join(
-            user_path, FILE_EVENT_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, "deleteme"
+        _write_legacy_file(
+            user_project_path,
+            AUDIT_LOG_CHECKPOINT_FOLDER_NAME,
+            f"{CURSOR_NAME}_events",
+            '["{}", "{}"]'.format(AUDIT_LOG_EVENT_HASH_1, AUDIT_LOG_EVENT_HASH_2),
         )
-        mock_remove.assert_called_once_with(expected_path)
-
-    def test_delete_when_checkpoint_does_not_exist_raises_cli_error(
-        self, mock_open, mock_remove
-    ):
-        store = FileEventCursorStore(PROFILE_NAME)
-        mock_remove.side_effect = FileNotFoundError
-        with pytest.raises(Code42CLIError):
-            store.delete("deleteme")
-
-    def test_clean_calls_remove_on_each_checkpoint(
-        self, mock_open, mock_remove, mock_listdir, mock_isfile
-    ):
-        mock_listdir.return_value = ["fileone", "filetwo", "filethree"]
-        store = FileEventCursorStore(PROFILE_NAME)
-        store.clean()
-        assert mock_remove.call_count == 3
-
-    def test_get_all_cursors_returns_all_checkpoints(self, mock_listdir, mock_isfile):
-        mock_listdir.return_value = ["fileone", "filetwo", "filethree"]
-        store = FileEventCursorStore(PROFILE_NAME)
-        cursors = store.get_all_cursors()
-        assert len(cursors) == 3
-        assert cursors[0].name == "fileone"
-        assert cursors[1].name == "filetwo"
-        assert cursors[2].name == "filethree"
-
-
-class TestAuditLogCursorStore:
-    def test_get_returns_expected_timestamp(self, mock_open):
-        store = AuditLogCursorStore(PROFILE_NAME)
-        checkpoint = store.get(CURSOR_NAME)
-        assert checkpoint == 123456789
-
-    def test_get_reads_expected_file(self, mock_open):
         store = AuditLogCursorStore(PROFILE_NAME)
-        store.get(CURSOR_NAME)
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        expected_path = path.join(
-            user_path, AUDIT_LOG_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, CURSOR_NAME
+        assert store.get_events(CURSOR_NAME) == [
+            AUDIT_LOG_EVENT_HASH_1,
+            AUDIT_LOG_EVENT_HASH_2,
+        ]
+        assert [cursor.name for cursor in store.get_all_cursors()] == [CURSOR_NAME]
+        store.close()
+
+    def test_store_skips_invalid_legacy_files(self, user_project_path):
+        _write_legacy_file(
+            user_project_path, ALERT_CHECKPOINT_FOLDER_NAME, CURSOR_NAME, "not a number"
         )
-        mock_open.assert_called_once_with(expected_path)
-
-    def test_get_when_profile_does_not_exist_returns_none(self, mocker):
-        store = AuditLogCursorStore(PROFILE_NAME)
-        checkpoint = store.get(CURSOR_NAME)
-        mock_open = mocker.patch("{}.open".format(_NAMESPACE))
-        mock_open.side_effect = FileNotFoundError
-        assert checkpoint is None
+        store = AlertCursorStore(PROFILE_NAME)
+        assert store.get_all_cursors() == []
+        store.close()
 
-    def test_replace_writes_to_expected_file(self, mock_open):
-        store = AuditLogCursorStore(PROFILE_NAME)
-        store.replace("checkpointname", 123)
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        expected_path = path.join(
-            user_path, AUDIT_LOG_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, "checkpointname"
+    def test_store_does_not_remove_invalid_legacy_files(self, user_project_path):
+        _write_legacy_file(
+            user_project_path, ALERT_CHECKPOINT_FOLDER_NAME, "valid", "123"
         )
-        mock_open.assert_called_once_with(expected_path, "w")
-
-    def test_replace_writes_expected_content(self, mock_open):
-        store = AuditLogCursorStore(PROFILE_NAME)
-        store.replace("checkpointname", 123)
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        path.join(
-            user_path, AUDIT_LOG_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, "checkpointname"
+        dir_path = _write_legacy_file(
+            user_project_path, ALERT_CHECKPOINT_FOLDER_NAME, CURSOR_NAME, "not a number"
         )
-        mock_open.return_value.write.assert_called_once_with("123")
-
-    def test_delete_calls_remove_on_expected_file(self, mock_open, mock_remove):
-        store = AuditLogCursorStore(PROFILE_NAME)
-        store.delete("deleteme")
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        expected_path = path.join(
-            user_path, AUDIT_LOG_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, "deleteme"
+        store = AlertCursorStore(PROFILE_NAME)
+        assert store.get("valid") == 123
+        store.close()
+        assert not (dir_path / "valid").exists()
+        assert (dir_path / CURSOR_NAME).read_text() == "not a number"
+
+    def test_store_removes_legacy_files_after_import(self, user_project_path):
+        dir_path = _write_legacy_file(
+            user_project_path, FILE_EVENT_CHECKPOINT_FOLDER_NAME, CURSOR_NAME, "123"
         )
-        mock_remove.assert_called_once_with(expected_path)
-
-    def test_delete_when_checkpoint_does_not_exist_raises_cli_error(
-        self, mock_open, mock_remove
-    ):
-        store = AuditLogCursorStore(PROFILE_NAME)
-        mock_remove.side_effect = FileNotFoundError
-        with pytest.raises(Code42CLIError):
-            store.delete("deleteme")
-
-    def test_clean_calls_remove_on_each_checkpoint(
-        self, mock_open, mock_remove, mock_listdir, mock_isfile
-    ):
-        mock_listdir.return_value = ["fileone", "filetwo", "filethree"]
-        store = AuditLogCursorStore(PROFILE_NAME)
-        store.clean()
-        assert mock_remove.call_count == 3
-
-    def test_get_all_cursors_returns_all_checkpoints(self, mock_listdir, mock_isfile):
-        mock_listdir.return_value = ["fileone", "filetwo", "filethree"]
-        store = AuditLogCursorStore(PROFILE_NAME)
-        cursors = store.get_all_cursors()
-        assert len(cursors) == 3
-        assert cursors[0].name == "fileone"
-        assert cursors[1].name == "filetwo"
-        assert cursors[2].name == "filethree"
-
-    def test_get_events_returns_expected_list(self, mock_open_events):
-        store = AuditLogCursorStore(PROFILE_NAME)
-        event_list = store.get_events(CURSOR_NAME)
-        assert event_list == [AUDIT_LOG_EVENT_HASH_1, AUDIT_LOG_EVENT_HASH_2]
+        store = FileEventCursorStore(PROFILE_NAME)
+        store.get(CURSOR_NAME)
+        store.close()
+        assert not dir_path.exists()
 
-    def test_get_events_reads_expected_file(self, mock_open):
-        store = AuditLogCursorStore(PROFILE_NAME)
-        store.get_events(CURSOR_NAME)
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        expected_filename = CURSOR_NAME + "_events"
-        expected_path = path.join(
-            user_path, AUDIT_LOG_CHECKPOINT_FOLDER_NAME, PROFILE_NAME, expected_filename
+    def test_store_does_not_import_legacy_files_twice(self, user_project_path):
+        _write_legacy_file(
+            user_project_path, FILE_EVENT_CHECKPOINT_FOLDER_NAME, CURSOR_NAME, "123"
         )
-        mock_open.assert_called_once_with(expected_path)
-
-    def test_get_events_when_profile_does_not_exist_returns_empty_list(self, mocker):
-        store = AuditLogCursorStore(PROFILE_NAME)
-        event_list = store.get_events(CURSOR_NAME)
-        mock_open = mocker.patch("{}.open".format(_NAMESPACE))
-        mock_open.side_effect = FileNotFoundError
-        assert event_list == []
-
-    def test_get_events_when_checkpoint_not_valid_json_returns_empty_list(self, mocker):
-        mocker.patch("builtins.open", mocker.mock_open(read_data="invalid_json"))
-        store = AuditLogCursorStore(PROFILE_NAME)
-        event_list = store.get_events(CURSOR_NAME)
-        assert event_list == []
-
-    def test_replace_events_writes_to_expected_file(self, mock_open):
-        store = AuditLogCursorStore(PROFILE_NAME)
-        store.replace_events("checkpointname", ["hash1", "hash2"])
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        expected_path = path.join(
-            user_path,
-            AUDIT_LOG_CHECKPOINT_FOLDER_NAME,
-            PROFILE_NAME,
-            "checkpointname_events",
+        store = FileEventCursorStore(PROFILE_NAME)
+        store.replace(CURSOR_NAME, 456)
+        store.close()
+        _write_legacy_file(
+            user_project_path, FILE_EVENT_CHECKPOINT_FOLDER_NAME, CURSOR_NAME, "123"
         )
-        mock_open.assert_called_once_with(expected_path, "w")
+        store = FileEventCursorStore(PROFILE_NAME)
+        assert store.get(CURSOR_NAME) == 456
+        store.close()
 
-    def test_replace_events_writes_expected_content(self, mock_open_events):
-        store = AuditLogCursorStore(PROFILE_NAME)
-        store.replace_events("checkpointname", ["hash1", "hash2"])
-        user_path = path.join(path.expanduser("~"), ".code42cli")
-        path.join(
-            user_path,
-            AUDIT_LOG_CHECKPOINT_FOLDER_NAME,
-            PROFILE_NAME,
-            "checkpointname_events",
+    def test_store_when_already_migrated_does_not_remove_legacy_files(
+        self, user_project_path
+    ):
+        _write_legacy_file(
+            user_project_path, FILE_EVENT_CHECKPOINT_FOLDER_NAME, CURSOR_NAME, "123"
         )
-        mock_open_events.return_value.write.assert_called_once_with(
-            '["hash1", "hash2"]'
+        store = FileEventCursorStore(PROFILE_NAME)
+        store.get(CURSOR_NAME)
+        store.close()
+        dir_path = _write_legacy_file(
+            user_project_path, FILE_EVENT_CHECKPOINT_FOLDER_NAME, CURSOR_NAME, "123"
         )
+        store = FileEventCursorStore(PROFILE_NAME)
+        store.get(CURSOR_NAME)
+        store.close()
+        assert (dir_path / CURSOR_NAME).read_text() == "123"
+
+
+def test_get_all_cursor_stores_for_profile_returns_a_store_of_each_kind(
+    user_project_path,
+):
+    stores = get_all_cursor_stores_for_profile(PROFILE_NAME)
+    assert [type(store) for store in stores] == [
+        FileEventCursorStore,
+        AlertCursorStore,
+        AuditLogCursorStore,
+    ]
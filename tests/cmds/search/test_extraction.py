@@ -1,5 +1,12 @@
+import json
+import threading
+import time
+
 import pytest
+from c42eventextractor import ExtractionHandlers
+from c42eventextractor.extractors import AlertExtractor
 from c42eventextractor.extractors import BaseExtractor
+from c42eventextractor.extractors import FileEventExtractor
 from py42.response import Py42Response
 from requests import Response
 
@@ -7,7 +14,9 @@ from code42cli import errors
 from code42cli.cmds.search.cursor_store import BaseCursorStore
 from code42cli.cmds.search.extraction import create_handlers
 from code42cli.cmds.search.extraction import create_send_to_handlers
+from code42cli.cmds.search.extraction import extract_with_prefetch
 from code42cli.cmds.search.extraction import try_get_default_header
+from code42cli.logger.handlers import SyslogServerNetworkConnectionError
 from code42cli.output_formats import OutputFormat
 
 
@@ -88,3 +97,382 @@ def test_send_to_handlers_creates_handlers_that_pass_events_to_logger(
     py42_response = Py42Response(http_response)
     handlers.handle_response(py42_response)
     event_extractor_logger.info.assert_called_once_with(events[0])
+
+
+def test_create_handlers_outputs_events_as_truncated_by_extractor_without_reparsing(
+    mocker, sdk,
+):
+    class TestExtractor(BaseExtractor):
+        def __init__(self, handlers, timestamp_filter):
+            timestamp_filter._term = "test_term"
+            super().__init__(key, search, handlers, timestamp_filter, TestQuery)
+
+        def _get_timestamp_from_item(self, item):
+            pass
+
+    formatter = mocker.MagicMock()
+    handlers = create_handlers(
+        sdk, TestExtractor, None, "chk-name", formatter, force_pager=False
+    )
+    http_response = mocker.MagicMock(spec=Response)
+    http_response.text = '{{"{0}": [{{"id": 1}}, {{"id": 2}}]}}'.format(key)
+    py42_response = Py42Response(http_response)
+    # The extractor drops events that share the last timestamp before handling a page.
+    py42_response._data_root[key] = py42_response[key][:1]
+    loads = mocker.patch("json.loads", side_effect=AssertionError("re-parsed"))
+    handlers.handle_response(py42_response)
+    loads.assert_not_called()
+    formatter.echo_formatted_list.assert_called_once_with(
+        [{"id": 1}], force_pager=False
+    )
+
+
+def _create_file_event(event_id, insertion_timestamp):
+    return {"eventId": event_id, "insertionTimestamp": insertion_timestamp}
+
+
+def _create_py42_response(mocker, response_key, events):
+    http_response = mocker.MagicMock(spec=Response)
+    http_response.text = json.dumps({response_key: events})
+    return Py42Response(http_response)
+
+
+@pytest.fixture
+def checkpointed_cursor_store(mocker):
+    cursor_store = mocker.MagicMock(spec=BaseCursorStore)
+    cursor_store.get.return_value = None
+    cursor_store.get_events.return_value = ["id-1", "id-2"]
+    return cursor_store
+
+
+def test_send_to_handlers_skips_events_stored_with_checkpoint(
+    mocker, sdk, event_extractor_logger, checkpointed_cursor_store
+):
+    handlers = create_send_to_handlers(
+        sdk,
+        FileEventExtractor,
+        checkpointed_cursor_store,
+        "chk-name",
+        event_extractor_logger,
+    )
+    events = [
+        _create_file_event("id-1", "2020-01-01T00:00:00.000Z"),
+        _create_file_event("id-2", "2020-01-01T00:00:00.000Z"),
+        _create_file_event("id-3", "2020-01-01T00:00:00.000Z"),
+    ]
+    handlers.handle_response(_create_py42_response(mocker, "fileEvents", events))
+    event_extractor_logger.info.assert_called_once_with(events[2])
+    assert handlers.TOTAL_EVENTS == 1
+
+
+def test_create_handlers_skips_events_stored_with_checkpoint(
+    mocker, sdk, checkpointed_cursor_store
+):
+    formatter = mocker.MagicMock()
+    handlers = create_handlers(
+        sdk,
+        FileEventExtractor,
+        checkpointed_cursor_store,
+        "chk-name",
+        formatter,
+        force_pager=False,
+    )
+    events = [
+        _create_file_event("id-2", "2020-01-01T00:00:00.000Z"),
+        _create_file_event("id-3", "2020-01-01T00:00:01.000Z"),
+    ]
+    handlers.handle_response(_create_py42_response(mocker, "fileEvents", events))
+    formatter.echo_formatted_list.assert_called_once_with(
+        [events[1]], force_pager=False
+    )
+
+
+def test_send_to_handlers_stores_ids_of_events_at_latest_timestamp_with_checkpoint(
+    mocker, sdk, event_extractor_logger, checkpointed_cursor_store
+):
+    handlers = create_send_to_handlers(
+        sdk,
+        FileEventExtractor,
+        checkpointed_cursor_store,
+        "chk-name",
+        event_extractor_logger,
+    )
+    events = [
+        _create_file_event("id-3", "2020-01-01T00:00:00.000Z"),
+        _create_file_event("id-4", "2020-01-01T00:00:01.000Z"),
+        _create_file_event("id-5", "2020-01-01T00:00:01.000Z"),
+    ]
+    handlers.handle_response(_create_py42_response(mocker, "fileEvents", events))
+    checkpointed_cursor_store.replace_checkpoint.assert_called_once_with(
+        "chk-name", 1577836801.0, ["id-4", "id-5"]
+    )
+
+
+def test_send_to_handlers_keeps_ids_from_earlier_pages_at_same_timestamp(
+    mocker, sdk, event_extractor_logger, checkpointed_cursor_store
+):
+    handlers = create_send_to_handlers(
+        sdk,
+        FileEventExtractor,
+        checkpointed_cursor_store,
+        "chk-name",
+        event_extractor_logger,
+    )
+    first_page = [_create_file_event("id-3", "2020-01-01T00:00:01.000Z")]
+    second_page = [_create_file_event("id-4", "2020-01-01T00:00:01.000Z")]
+    handlers.handle_response(_create_py42_response(mocker, "fileEvents", first_page))
+    handlers.handle_response(_create_py42_response(mocker, "fileEvents", second_page))
+    assert checkpointed_cursor_store.replace_checkpoint.call_args[0] == (
+        "chk-name",
+        1577836801.0,
+        ["id-3", "id-4"],
+    )
+
+
+def test_send_to_handlers_keeps_stored_ids_when_events_share_stored_timestamp(
+    mocker, sdk, event_extractor_logger, checkpointed_cursor_store
+):
+    checkpointed_cursor_store.get.return_value = 1577836800.0
+    handlers = create_send_to_handlers(
+        sdk,
+        FileEventExtractor,
+        checkpointed_cursor_store,
+        "chk-name",
+        event_extractor_logger,
+    )
+    events = [_create_file_event("id-3", "2020-01-01T00:00:00.000Z")]
+    handlers.handle_response(_create_py42_response(mocker, "fileEvents", events))
+    checkpointed_cursor_store.replace_checkpoint.assert_called_once_with(
+        "chk-name", 1577836800.0, ["id-1", "id-2", "id-3"]
+    )
+
+
+def test_send_to_handlers_skips_events_stored_earlier_in_the_same_run(
+    mocker, sdk, event_extractor_logger, checkpointed_cursor_store
+):
+    handlers = create_send_to_handlers(
+        sdk,
+        FileEventExtractor,
+        checkpointed_cursor_store,
+        "chk-name",
+        event_extractor_logger,
+    )
+    events = [_create_file_event("id-3", "2020-01-01T00:00:00.000Z")]
+    # A `--follow` poll with no new events returns the last event again.
+    handlers.handle_response(_create_py42_response(mocker, "fileEvents", events))
+    handlers.handle_response(_create_py42_response(mocker, "fileEvents", events))
+    event_extractor_logger.info.assert_called_once_with(events[0])
+    assert checkpointed_cursor_store.replace_checkpoint.call_count == 1
+
+
+def test_send_to_handlers_for_alerts_stores_ids_of_newest_alerts_with_checkpoint(
+    mocker, sdk, event_extractor_logger, checkpointed_cursor_store
+):
+    alerts = [
+        {"id": "alert-2", "createdAt": "2020-01-01T00:00:01.000000Z"},
+        {"id": "alert-1", "createdAt": "2020-01-01T00:00:00.000000Z"},
+    ]
+    sdk.alerts.get_details.return_value = {"alerts": alerts}
+    handlers = create_send_to_handlers(
+        sdk,
+        AlertExtractor,
+        checkpointed_cursor_store,
+        "chk-name",
+        event_extractor_logger,
+    )
+    handlers.handle_response(_create_py42_response(mocker, "alerts", alerts))
+    checkpointed_cursor_store.replace_checkpoint.assert_called_once_with(
+        "chk-name", 1577836801.0, ["alert-2"]
+    )
+
+
+class _RecordingHandlers(ExtractionHandlers):
+    def __init__(self, cursor=None):
+        self.calls = []
+        self._cursor_position = cursor
+
+    def handle_response(self, response):
+        self.calls.append(("response", response))
+
+    def handle_error(self, exception):
+        self.calls.append(("error", exception))
+
+    def record_cursor_position(self, cursor):
+        self.calls.append(("cursor", cursor))
+        self._cursor_position = cursor
+
+
+def test_extract_with_prefetch_when_extractor_handles_os_error_raises_it(
+    sdk, event_extractor_logger
+):
+    handlers = create_send_to_handlers(
+        sdk, FileEventExtractor, None, None, event_extractor_logger
+    )
+    error = ConnectionError("connection refused")
+    with pytest.raises(ConnectionError) as err:
+        extract_with_prefetch(lambda h: h.handle_error(error), handlers)
+    assert err.value is error
+
+
+def test_extract_with_prefetch_passes_pages_and_cursors_to_handlers_in_order():
+    def extract(handlers):
+        for page in range(5):
+            handlers.handle_response(page)
+            handlers.record_cursor_position(page + 0.5)
+
+    handlers = _RecordingHandlers()
+    extract_with_prefetch(extract, handlers)
+    expected = []
+    for page in range(5):
+        expected.extend([("response", page), ("cursor", page + 0.5)])
+    assert handlers.calls == expected
+
+
+def test_extract_with_prefetch_fetches_next_page_while_page_is_output():
+    second_page_fetched = threading.Event()
+
+    def extract(handlers):
+        handlers.handle_response(1)
+        handlers.handle_response(2)
+        second_page_fetched.set()
+
+    class WaitingHandlers(_RecordingHandlers):
+        def handle_response(self, response):
+            if response == 1:
+                assert second_page_fetched.wait(timeout=5)
+            super().handle_response(response)
+
+    handlers = WaitingHandlers()
+    extract_with_prefetch(extract, handlers)
+    assert handlers.calls == [("response", 1), ("response", 2)]
+
+
+def test_extract_with_prefetch_does_not_fetch_more_than_depth_pages_ahead():
+    fetched = []
+    max_ahead = []
+
+    def extract(handlers):
+        for page in range(10):
+            fetched.append(page)
+            handlers.handle_response(page)
+
+    class CountingHandlers(_RecordingHandlers):
+        def handle_response(self, response):
+            max_ahead.append(len(fetched) - response - 1)
+            super().handle_response(response)
+
+    extract_with_prefetch(extract, CountingHandlers(), depth=2)
+    # One page may be waiting to be queued in addition to the queued ones.
+    assert max(max_ahead) <= 3
+
+
+def test_extract_with_prefetch_when_cursors_recorded_queues_depth_pages_ahead():
+    fetched = []
+
+    def extract(handlers):
+        for page in range(10):
+            fetched.append(page)
+            handlers.handle_response(page)
+            handlers.record_cursor_position(page)
+
+    pages_ahead = []
+
+    class SlowHandlers(_RecordingHandlers):
+        def handle_response(self, response):
+            if response == 0:
+                # Wait for the extractor to fill the queue while the first page is output.
+                deadline = time.monotonic() + 2
+                while len(fetched) < 4 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                time.sleep(0.05)
+                pages_ahead.append(len(fetched) - 1)
+            super().handle_response(response)
+
+    handlers = SlowHandlers()
+    extract_with_prefetch(extract, handlers, depth=2)
+    # Two queued pages plus the one the extractor holds while waiting to queue it.
+    assert pages_ahead == [3]
+    assert [value for kind, value in handlers.calls if kind == "response"] == list(
+        range(10)
+    )
+
+
+def test_extract_with_prefetch_uses_stored_cursor_until_extractor_records_one():
+    positions = []
+
+    def extract(handlers):
+        positions.append(handlers.get_cursor_position())
+        handlers.record_cursor_position(20)
+        positions.append(handlers.get_cursor_position())
+
+    extract_with_prefetch(extract, _RecordingHandlers(cursor=10))
+    assert positions == [10, 20]
+
+
+def test_extract_with_prefetch_passes_errors_to_handlers():
+    error = Exception("test")
+    handlers = _RecordingHandlers()
+    extract_with_prefetch(lambda h: h.handle_error(error), handlers)
+    assert handlers.calls == [("error", error)]
+
+
+def test_extract_with_prefetch_raises_exceptions_from_extract():
+    def extract(handlers):
+        raise ValueError("bad filters")
+
+    with pytest.raises(ValueError):
+        extract_with_prefetch(extract, _RecordingHandlers())
+
+
+def test_extract_with_prefetch_when_output_fails_stops_extracting():
+    def extract(handlers):
+        page = 0
+        while True:
+            handlers.handle_response(page)
+            page += 1
+
+    class FailingHandlers(_RecordingHandlers):
+        def handle_response(self, response):
+            raise OSError("broken pipe")
+
+    with pytest.raises(OSError):
+        extract_with_prefetch(extract, FailingHandlers())
+
+
+def test_send_to_handlers_sends_events_before_storing_checkpoint(
+    mocker, sdk, checkpointed_cursor_store
+):
+    calls = []
+    logger = mocker.MagicMock()
+    handler = mocker.MagicMock()
+    logger.handlers = [handler]
+    logger.info.side_effect = lambda event: calls.append("info")
+    handler.flush.side_effect = lambda: calls.append("flush")
+    checkpointed_cursor_store.replace_checkpoint.side_effect = lambda *args: (
+        calls.append("checkpoint")
+    )
+    handlers = create_send_to_handlers(
+        sdk, FileEventExtractor, checkpointed_cursor_store, "chk-name", logger
+    )
+    events = [
+        _create_file_event("id-3", "2020-01-01T00:00:00.000Z"),
+        _create_file_event("id-4", "2020-01-01T00:00:01.000Z"),
+    ]
+    handlers.handle_response(_create_py42_response(mocker, "fileEvents", events))
+    assert calls == ["info", "info", "flush", "checkpoint"]
+
+
+def test_send_to_handlers_when_sending_fails_does_not_store_checkpoint(
+    mocker, sdk, checkpointed_cursor_store
+):
+    logger = mocker.MagicMock()
+    handler = mocker.MagicMock()
+    logger.handlers = [handler]
+    handler.flush.side_effect = SyslogServerNetworkConnectionError()
+    handlers = create_send_to_handlers(
+        sdk, FileEventExtractor, checkpointed_cursor_store, "chk-name", logger
+    )
+    events = [_create_file_event("id-3", "2020-01-01T00:00:00.000Z")]
+    with pytest.raises(SyslogServerNetworkConnectionError):
+        handlers.handle_response(_create_py42_response(mocker, "fileEvents", events))
+    assert not checkpointed_cursor_store.replace_checkpoint.call_count
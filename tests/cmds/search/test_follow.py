@@ -0,0 +1,139 @@
+import os
+from signal import getsignal
+from signal import SIGTERM
+
+import pytest
+
+from code42cli.cmds.search.follow import create_follower
+from code42cli.cmds.search.follow import Follower
+from code42cli.cmds.search.follow import FollowStopped
+
+_NAMESPACE = "code42cli.cmds.search.follow"
+
+
+@pytest.fixture
+def mock_sleep(mocker):
+    return mocker.patch(f"{_NAMESPACE}.sleep")
+
+
+@pytest.fixture
+def mock_monotonic(mocker):
+    return mocker.patch(f"{_NAMESPACE}.monotonic")
+
+
+def _stop_after_polls(follower, count):
+    polls = []
+
+    def poll():
+        polls.append(None)
+        if len(polls) == count:
+            follower.stop()
+
+    return poll, polls
+
+
+def test_create_follower_when_not_following_returns_none():
+    assert create_follower(False, 10) is None
+
+
+def test_create_follower_when_following_returns_follower_with_interval():
+    follower = create_follower(True, 10)
+    assert isinstance(follower, Follower)
+    assert follower.interval == 10
+
+
+def test_run_polls_until_stopped(mocker):
+    follower = Follower(10)
+    mocker.patch.object(follower, "_wait")
+    poll, polls = _stop_after_polls(follower, 3)
+    follower.run(poll)
+    assert len(polls) == 3
+    assert follower._wait.call_count == 3
+
+
+def test_run_waits_interval_seconds_between_polls(mock_sleep, mock_monotonic):
+    follower = Follower(3)
+    mock_monotonic.side_effect = [100, 100, 101, 102.5, 103, 103]
+    poll, polls = _stop_after_polls(follower, 2)
+    follower.run(poll)
+    assert len(polls) == 2
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [1, 1, 0.5]
+
+
+def test_run_when_stopped_while_waiting_stops_waiting(mock_sleep, mock_monotonic):
+    follower = Follower(60)
+    mock_monotonic.return_value = 100
+    mock_sleep.side_effect = lambda seconds: follower.stop()
+    polls = []
+    follower.run(lambda: polls.append(None))
+    assert len(polls) == 1
+    assert mock_sleep.call_count == 1
+
+
+def test_run_when_sigterm_received_stops_after_poll(mocker, capsys):
+    follower = Follower(10)
+    mocker.patch.object(follower, "_wait")
+    polls = []
+
+    def poll():
+        polls.append(None)
+        os.kill(os.getpid(), SIGTERM)
+
+    follower.run(poll)
+    assert len(polls) == 1
+    assert follower.stopped
+    assert "Received SIGTERM" in capsys.readouterr().err
+
+
+def test_run_restores_previous_sigterm_handler(mocker):
+    previous_handler = getsignal(SIGTERM)
+    follower = Follower(10)
+    mocker.patch.object(follower, "_wait")
+    handlers_during_poll = []
+
+    def poll():
+        handlers_during_poll.append(getsignal(SIGTERM))
+        follower.stop()
+
+    follower.run(poll)
+    assert handlers_during_poll == [follower._handle_sigterm]
+    assert getsignal(SIGTERM) == previous_handler
+
+
+def test_stop_after_each_page_when_not_stopped_handles_response(mocker):
+    follower = Follower(10)
+    handlers = mocker.MagicMock()
+    handle_response = handlers.handle_response
+    follower.stop_after_each_page(handlers)
+    handlers.handle_response("response")
+    handle_response.assert_called_once_with("response")
+
+
+def test_stop_after_each_page_when_stopped_raises_follow_stopped_after_handling(
+    mocker,
+):
+    follower = Follower(10)
+    handlers = mocker.MagicMock()
+    handle_response = handlers.handle_response
+    follower.stop_after_each_page(handlers)
+    follower.stop()
+    with pytest.raises(FollowStopped):
+        handlers.handle_response("response")
+    handle_response.assert_called_once_with("response")
+
+
+def test_run_when_poll_stopped_mid_extraction_stops_following(mocker):
+    follower = Follower(10)
+    mocker.patch.object(follower, "_wait")
+    handlers = follower.stop_after_each_page(mocker.MagicMock())
+    polls = []
+
+    def poll():
+        polls.append(None)
+        follower.stop()
+        handlers.handle_response("page one")
+        handlers.handle_response("page two")
+
+    follower.run(poll)
+    assert len(polls) == 1
+    assert follower._wait.call_count == 0
@@ -1,6 +1,9 @@
+import click
 import pytest
+from click.testing import CliRunner
 
 from code42cli.cmds.search import _try_get_logger_for_server
+from code42cli.cmds.search import SendToCommand
 from code42cli.errors import Code42CLIError
 from code42cli.logger.enums import ServerProtocol
 from code42cli.output_formats import SendToFileEventsOutputFormat
@@ -29,12 +32,14 @@ def test_try_get_logger_for_server_calls_get_logger_for_server(
         ServerProtocol.TLS_TCP,
         SendToFileEventsOutputFormat.CEF,
         _TEST_CERTS,
+        queue_size=100,
     )
     patched_get_logger_method.assert_called_once_with(
         _TEST_HOST,
         ServerProtocol.TLS_TCP,
         SendToFileEventsOutputFormat.CEF,
         _TEST_CERTS,
+        queue_size=100,
     )
 
 
@@ -53,3 +58,21 @@ def test_try_get_logger_for_server_when_exception_raised_raises_code42_cli_error
         str(err.value)
         == f"Unable to connect to example.com. Failed with error: {_TEST_ERROR_MESSAGE}."
     )
+
+
+def test_send_to_command_flushes_logger_handlers_after_invoking(
+    mocker, patched_get_logger_method
+):
+    handler = mocker.MagicMock()
+    patched_get_logger_method.return_value.handlers = [handler]
+    calls = []
+    handler.flush.side_effect = lambda: calls.append("flush")
+
+    @click.command(cls=SendToCommand)
+    @click.pass_obj
+    def send_to(state):
+        calls.append("send")
+
+    result = CliRunner().invoke(send_to, obj=mocker.MagicMock())
+    assert result.exit_code == 0
+    assert calls == ["send", "flush"]
@@ -0,0 +1,203 @@
+import pytest
+from c42eventextractor import ExtractionHandlers
+from c42eventextractor.extractors import FileEventExtractor
+from py42.sdk.queries.fileevents.filters import InsertionTimestamp
+
+from code42cli.cmds.search import parallel
+from code42cli.cmds.search.extraction import create_send_to_handlers
+from code42cli.cmds.search.parallel import _SplitWindow
+from code42cli.cmds.search.parallel import extract_in_parallel
+from code42cli.cmds.search.parallel import get_time_range
+from code42cli.cmds.search.parallel import TimeWindow
+
+PAGE_SIZE = 2
+
+
+class FakeResponse:
+    def __init__(self, events, total_count):
+        self._data_root = {"events": events, "totalCount": total_count}
+
+
+class FakeExtractor:
+    """Pages through the events in its window the way a real extractor would."""
+
+    _timestamp_filter = InsertionTimestamp
+
+    def __init__(self, handlers, events, fail_at=None, error=None):
+        self._handlers = handlers
+        self._events = events
+        self._fail_at = fail_at
+        self._error = error or Exception("failed")
+        self.filters = None
+
+    def extract(self, *filters):
+        self.filters = filters
+        window = self._handlers._window
+        if self._fail_at is not None and window.begin <= self._fail_at < window.end:
+            self._handlers.handle_error(self._error)
+            return
+        cursor = window.begin
+        while True:
+            events = [e for e in self._events if cursor <= e < window.end]
+            if not events:
+                return
+            page = events[:PAGE_SIZE]
+            self._handlers.handle_response(FakeResponse(page, len(events)))
+            cursor = page[-1] + 0.001
+            try:
+                self._handlers.record_cursor_position(cursor)
+            except _SplitWindow as err:
+                self._handlers.handle_error(err)
+                return
+
+
+class RecordingHandlers(ExtractionHandlers):
+    def __init__(self, cursor=None):
+        self.events = []
+        self.errors = []
+        self.cursors = []
+        self._cursor_position = cursor
+
+    def handle_response(self, response):
+        self.events.extend(response._data_root["events"])
+
+    def handle_error(self, exception):
+        self.errors.append(exception)
+
+    def record_cursor_position(self, cursor):
+        self.cursors.append(cursor)
+        self._cursor_position = cursor
+
+
+def _extract(events, worker_count=3, fail_at=None, time_range=None):
+    handlers = RecordingHandlers()
+    extract_in_parallel(
+        lambda h: FakeExtractor(h, events, fail_at),
+        handlers,
+        [],
+        time_range or TimeWindow(0, 1000),
+        worker_count,
+    )
+    return handlers
+
+
+def test_time_window_split_covers_window_without_overlap():
+    windows = TimeWindow(0, 10).split(3)
+    assert windows[0].begin == 0
+    assert windows[-1].end == 10
+    for before, after in zip(windows, windows[1:]):
+        assert before.end == after.begin
+
+
+def test_time_window_split_rounds_bounds_down_to_the_millisecond():
+    windows = TimeWindow(1606151606.239647, 1606151706.0).split(2)
+    assert windows[0].begin == 1606151606.239
+    assert windows[1].begin == 1606151656.119
+
+
+def test_extract_in_parallel_outputs_all_events_in_order():
+    events = [float(i * 7 % 1000) for i in range(200)]
+    events = sorted(set(events))
+    handlers = _extract(events)
+    assert handlers.events == events
+    assert not handlers.errors
+
+
+def test_extract_in_parallel_records_cursor_in_order():
+    handlers = _extract([1.0, 500.0, 999.0])
+    assert handlers.cursors == sorted(handlers.cursors)
+    assert handlers.cursors
+
+
+def test_extract_in_parallel_splits_windows_with_many_events(mocker):
+    mocker.patch.object(parallel, "SPLIT_EVENT_COUNT", 4)
+    mocker.patch.object(parallel, "MIN_WINDOW_SECONDS", 1)
+    events = [float(i) for i in range(0, 100, 3)] + [400.0, 800.0]
+    handlers = _extract(events, worker_count=2)
+    assert handlers.events == events
+    assert not handlers.errors
+
+
+def test_extract_in_parallel_records_cursor_past_last_event_of_last_window(mocker):
+    mocker.patch.object(parallel, "time", return_value=1000.0)
+    handlers = RecordingHandlers()
+    extract_in_parallel(
+        lambda h: FakeExtractor(h, [100.0, 990.0]),
+        handlers,
+        [],
+        get_time_range(handlers, 50.0),
+        2,
+    )
+    assert handlers.cursors[-1] == 990.001
+
+
+def test_extract_in_parallel_when_polled_again_without_new_events_outputs_nothing(
+    mocker,
+):
+    mocker.patch.object(parallel, "time", return_value=1000.0)
+    events = [100.0, 500.0, 950.0, 990.0]
+    handlers = RecordingHandlers()
+    for _ in range(2):
+        extract_in_parallel(
+            lambda h: FakeExtractor(h, events),
+            handlers,
+            [],
+            get_time_range(handlers, 50.0),
+            2,
+        )
+    assert handlers.events == events
+
+
+def test_extract_in_parallel_when_window_fails_does_not_output_later_windows():
+    events = [10.0, 300.0, 900.0]
+    handlers = _extract(events, worker_count=2, fail_at=300.0)
+    assert handlers.events == [10.0]
+    assert len(handlers.errors) == 1
+    assert all(cursor <= 300.0 for cursor in handlers.cursors)
+
+
+def test_extract_in_parallel_when_window_fails_with_os_error_raises_it(
+    sdk, event_extractor_logger
+):
+    handlers = create_send_to_handlers(
+        sdk, FileEventExtractor, None, None, event_extractor_logger
+    )
+    error = ConnectionError("connection refused")
+    with pytest.raises(ConnectionError) as err:
+        extract_in_parallel(
+            lambda h: FakeExtractor(h, [300.0], fail_at=300.0, error=error),
+            handlers,
+            [],
+            TimeWindow(0, 1000),
+            2,
+        )
+    assert err.value is error
+
+
+def test_extract_in_parallel_adds_window_filter_to_filters():
+    extractors = []
+
+    def create_extractor(handlers):
+        extractor = FakeExtractor(handlers, [])
+        extractors.append(extractor)
+        return extractor
+
+    extract_in_parallel(
+        create_extractor, RecordingHandlers(), ["filter"], TimeWindow(0, 100), 1
+    )
+    assert all(e.filters[0] == "filter" for e in extractors)
+    assert all(len(e.filters) == 2 for e in extractors)
+
+
+def test_get_time_range_starts_at_cursor_when_one_exists():
+    time_range = get_time_range(RecordingHandlers(cursor=500.0), 100.0)
+    assert time_range.begin == 500.0
+
+
+def test_get_time_range_starts_at_begin_when_no_cursor():
+    time_range = get_time_range(RecordingHandlers(), 100.0)
+    assert time_range.begin == 100.0
+
+
+def test_get_time_range_when_no_cursor_or_begin_returns_none():
+    assert get_time_range(RecordingHandlers(), None) is None
@@ -0,0 +1,99 @@
+import pytest
+
+from code42cli.cmds.search import sorting
+from code42cli.cmds.search.sorting import sort_pages
+
+
+def _key(item):
+    return item["ts"]
+
+
+def _items(*timestamps):
+    return [{"ts": ts} for ts in timestamps]
+
+
+@pytest.fixture
+def mock_temporary_file(mocker):
+    return mocker.patch(
+        "code42cli.cmds.search.sorting.TemporaryFile", wraps=sorting.TemporaryFile
+    )
+
+
+def test_sort_pages_reads_every_page_before_yielding():
+    read = []
+
+    def pages():
+        read.append(1)
+        yield _items(1, 2)
+        read.append(2)
+        yield _items(2, 3)
+
+    results = sort_pages(pages(), _key)
+    assert next(results) == _items(1)[0]
+    assert read == [1, 2]
+    assert list(results) == _items(2, 2, 3)
+
+
+def test_sort_pages_when_items_fit_in_one_run_does_not_spill(mock_temporary_file):
+    pages = [_items(1, 2), _items(4, 3)]
+    assert list(sort_pages(pages, _key, run_size=5)) == _items(1, 2, 3, 4)
+    assert not mock_temporary_file.call_count
+
+
+def test_sort_pages_when_first_page_out_of_order_sorts_everything():
+    pages = [_items(4, 3), _items(2, 1)]
+    assert list(sort_pages(pages, _key)) == _items(1, 2, 3, 4)
+
+
+def test_sort_pages_when_order_changes_after_first_page_sorts_everything():
+    pages = [_items(1, 5), _items(3, 2), _items(6, 4)]
+    assert list(sort_pages(pages, _key, run_size=2)) == _items(1, 2, 3, 4, 5, 6)
+
+
+def test_sort_pages_when_out_of_order_spills_runs_and_merges_them(mock_temporary_file):
+    pages = [_items(9, 8, 7), _items(6, 5, 4), _items(3, 2, 1), _items(0)]
+    assert list(sort_pages(pages, _key, run_size=3)) == _items(*range(10))
+    assert mock_temporary_file.call_count == 3
+
+
+def test_sort_pages_when_out_of_order_keeps_arrival_order_of_equal_items():
+    pages = [
+        [{"ts": 2, "id": "a"}, {"ts": 1, "id": "b"}],
+        [{"ts": 2, "id": "c"}, {"ts": 1, "id": "d"}],
+        [{"ts": 1, "id": "e"}],
+    ]
+    results = sort_pages(pages, _key, run_size=2)
+    assert [item["id"] for item in results] == ["b", "d", "e", "a", "c"]
+
+
+def test_sort_pages_when_too_many_runs_merges_them_into_one(mocker):
+    mocker.patch("code42cli.cmds.search.sorting._MAX_OPEN_RUNS", 2)
+    merge_runs = mocker.patch(
+        "code42cli.cmds.search.sorting._merge_runs", wraps=sorting._merge_runs
+    )
+    pages = [_items(6, 5), _items(4, 3), _items(2, 1)]
+    assert list(sort_pages(pages, _key, run_size=2)) == _items(1, 2, 3, 4, 5, 6)
+    assert merge_runs.call_count == 2
+
+
+def test_sort_pages_when_closed_early_closes_spilled_runs(mocker):
+    spill = sorting.spill
+    runs = []
+
+    def spill_and_keep_run(items):
+        run = spill(items)
+        runs.append(run)
+        return run
+
+    mocker.patch("code42cli.cmds.search.sorting.spill", side_effect=spill_and_keep_run)
+    pages = [_items(4, 3), _items(2, 1), _items(0)]
+    results = sort_pages(pages, _key, run_size=2)
+    next(results)
+    results.close()
+    assert len(runs) == 2
+    assert all(run.closed for run in runs)
+
+
+def test_sort_pages_skips_empty_pages():
+    pages = [[], _items(1), [], _items(2)]
+    assert list(sort_pages(pages, _key)) == _items(1, 2)
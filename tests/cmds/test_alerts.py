@@ -1,9 +1,11 @@
 import json
 import logging
+import threading
 
 import py42.sdk.queries.alerts.filters as f
 import pytest
 from c42eventextractor.extractors import AlertExtractor
+from py42.exceptions import Py42BadRequestError
 from py42.exceptions import Py42NotFoundError
 from py42.response import Py42Response
 from py42.sdk.queries.alerts.filters import AlertState
@@ -15,6 +17,7 @@ from tests.conftest import get_test_date_str
 
 from code42cli import errors
 from code42cli import PRODUCT_NAME
+from code42cli.cmds.alerts import MAX_ALERTS_PER_UPDATE
 from code42cli.cmds.search import extraction
 from code42cli.cmds.search.cursor_store import AlertCursorStore
 from code42cli.logger.enums import ServerProtocol
@@ -608,6 +611,48 @@ def test_search_and_send_to_with_use_checkpoint_and_with_begin_and_with_stored_c
     )
 
 
+def test_send_to_with_follow_and_stored_checkpoint_extracts_from_checkpoint_each_poll(
+    cli_state,
+    alert_extractor,
+    alert_cursor_with_checkpoint,
+    runner,
+    follow_for_two_polls,
+):
+    result = runner.invoke(
+        cli,
+        [
+            "alerts",
+            "send-to",
+            "0.0.0.0",
+            "--use-checkpoint",
+            "test",
+            "--begin",
+            "1h",
+            "--follow",
+        ],
+        obj=cli_state,
+    )
+    assert result.exit_code == 0
+    assert alert_extractor.extract.call_count == 2
+    for call in alert_extractor.extract.call_args_list:
+        assert all(f.DateObserved._term not in str(arg) for arg in call[0])
+
+
+def test_send_to_with_follow_without_checkpoint_extracts_with_begin_date_first(
+    cli_state, alert_extractor, begin_option, runner, follow_for_two_polls
+):
+    result = runner.invoke(
+        cli,
+        ["alerts", "send-to", "0.0.0.0", "--begin", "1d", "--follow"],
+        obj=cli_state,
+    )
+    assert result.exit_code == 0
+    assert alert_extractor.extract.call_count == 2
+    assert begin_option.expected_timestamp in str(
+        alert_extractor.extract.call_args_list[0][0][0]
+    )
+
+
 @search_and_send_to_test
 def test_search_and_send_to_when_given_actor_is_uses_username_filter(
     cli_state, alert_extractor, runner, command
@@ -878,7 +923,7 @@ def test_send_to_creates_expected_logger(cli_state, runner, send_to_logger_facto
         obj=cli_state,
     )
     send_to_logger_factory.assert_called_once_with(
-        "0.0.0.0", "TLS-TCP", "RAW-JSON", "certs/file"
+        "0.0.0.0", "TLS-TCP", "RAW-JSON", "certs/file", queue_size=10000
     )
 
 
@@ -900,7 +945,7 @@ def test_send_to_when_given_ignore_cert_validation_uses_certs_equal_to_ignore_st
         obj=cli_state,
     )
     send_to_logger_factory.assert_called_once_with(
-        "0.0.0.0", "TLS-TCP", "RAW-JSON", "ignore"
+        "0.0.0.0", "TLS-TCP", "RAW-JSON", "ignore", queue_size=10000
     )
 
 
@@ -964,6 +1009,46 @@ def test_get_alert_details_sorts_results_by_date(sdk):
     assert results == SORTED_ALERT_DETAILS
 
 
+def test_get_alert_details_uses_given_batch_size(sdk):
+    sdk.alerts.get_details.side_effect = ALERT_DETAIL_RESULT
+    extraction._get_alert_details(sdk, ALERT_SUMMARY_LIST, batch_size=4)
+    assert sdk.alerts.get_details.call_count == 5
+    requested_ids = sorted(
+        i for c in sdk.alerts.get_details.call_args_list for i in c[0][0]
+    )
+    assert requested_ids == list(range(20))
+
+
+def test_get_alert_details_requests_batches_concurrently(sdk):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def get_details(batch):
+        # Only returns once a second batch is being requested at the same time.
+        barrier.wait()
+        return {"alerts": [{"id": i, "createdAt": "2020-01-01"} for i in batch]}
+
+    sdk.alerts.get_details.side_effect = get_details
+    results = extraction._get_alert_details(sdk, ALERT_SUMMARY_LIST[:4], batch_size=2)
+    assert len(results) == 4
+
+
+@search_and_send_to_test
+def test_search_and_send_to_with_details_batch_size_uses_batch_size(
+    cli_state, runner, mocker, command
+):
+    create_handlers = mocker.patch(
+        "code42cli.cmds.alerts.ext.create_send_to_handlers"
+        if "send-to" in command
+        else "code42cli.cmds.alerts.ext.create_handlers"
+    )
+    create_handlers.return_value.TOTAL_EVENTS = 1
+    mocker.patch("code42cli.cmds.alerts._get_alert_extractor")
+    runner.invoke(
+        cli, [*command, "--begin", "1d", "--details-batch-size", "25"], obj=cli_state
+    )
+    assert create_handlers.call_args[1]["alert_details_batch_size"] == 25
+
+
 def test_show_outputs_expected_headers(cli_state, runner, full_alert_details_response):
     cli_state.sdk.alerts.get_details.return_value = full_alert_details_response
     result = runner.invoke(cli, ["alerts", "show", "TEST-ALERT-ID"], obj=cli_state)
@@ -1105,6 +1190,15 @@ def test_update_when_given_note_and_not_state_calls_py42_update_note(cli_state,
     )
 
 
+def test_update_when_given_neither_state_nor_note_does_not_update_alert(
+    cli_state, runner
+):
+    result = runner.invoke(cli, ["alerts", "update", "TEST-ALERT-ID"], obj=cli_state)
+    assert result.exit_code == 0
+    assert not cli_state.sdk.alerts.update_note.call_count
+    assert not cli_state.sdk.alerts.update_state.call_count
+
+
 def test_bulk_update_uses_expected_arguments(runner, mocker, cli_state_with_user):
     bulk_processor = mocker.patch("code42cli.cmds.alerts.run_bulk_process")
     with runner.isolated_filesystem():
@@ -1118,6 +1212,135 @@ def test_bulk_update_uses_expected_arguments(runner, mocker, cli_state_with_user
             obj=cli_state_with_user,
         )
     assert bulk_processor.call_args[0][1] == [
-        {"id": "1", "state": "PENDING", "note": "note1"},
-        {"id": "2", "state": "IN_PROGRESS", "note": "note2"},
+        {"ids": ["1"], "state": "PENDING", "note": "note1"},
+        {"ids": ["2"], "state": "IN_PROGRESS", "note": "note2"},
     ]
+
+
+def test_bulk_update_combines_rows_with_same_state_and_note(
+    runner, mocker, cli_state_with_user
+):
+    bulk_processor = mocker.patch("code42cli.cmds.alerts.run_bulk_process")
+    with runner.isolated_filesystem():
+        with open("test_update.csv", "w") as csv:
+            csv.writelines(
+                [
+                    "id,state,note\n",
+                    "1,RESOLVED,done\n",
+                    "2,PENDING,\n",
+                    "3,RESOLVED,done\n",
+                    "4,,just a note\n",
+                    "5,PENDING,\n",
+                ]
+            )
+        runner.invoke(
+            cli,
+            ["alerts", "bulk", "update", "test_update.csv"],
+            obj=cli_state_with_user,
+        )
+    assert bulk_processor.call_args[0][1] == [
+        {"ids": ["4"], "state": None, "note": "just a note"},
+        {"ids": ["1", "3"], "state": "RESOLVED", "note": "done"},
+        {"ids": ["2", "5"], "state": "PENDING", "note": None},
+    ]
+
+
+def test_bulk_update_splits_batches_at_max_alerts_per_update(
+    runner, mocker, cli_state_with_user
+):
+    bulk_processor = mocker.patch("code42cli.cmds.alerts.run_bulk_process")
+    rows = ["{},RESOLVED,\n".format(i) for i in range(MAX_ALERTS_PER_UPDATE + 1)]
+    with runner.isolated_filesystem():
+        with open("test_update.csv", "w") as csv:
+            csv.writelines(["id,state,note\n"] + rows)
+        runner.invoke(
+            cli,
+            ["alerts", "bulk", "update", "test_update.csv"],
+            obj=cli_state_with_user,
+        )
+    batches = bulk_processor.call_args[0][1]
+    assert [len(batch["ids"]) for batch in batches] == [MAX_ALERTS_PER_UPDATE, 1]
+
+
+def test_bulk_update_calls_update_state_once_per_batch(runner, cli_state):
+    with runner.isolated_filesystem():
+        with open("test_update.csv", "w") as csv:
+            csv.writelines(
+                ["id,state,note\n", "1,RESOLVED,done\n", "2,RESOLVED,done\n"]
+            )
+        runner.invoke(
+            cli, ["alerts", "bulk", "update", "test_update.csv"], obj=cli_state,
+        )
+    cli_state.sdk.alerts.update_state.assert_called_once_with(
+        "RESOLVED", ["1", "2"], note="done"
+    )
+
+
+def test_bulk_update_when_batch_is_rejected_updates_alerts_individually(
+    runner, cli_state, custom_error
+):
+    def update_state(state, alert_ids, note=None):
+        if "bad" in alert_ids:
+            raise Py42BadRequestError(custom_error)
+
+    cli_state.sdk.alerts.update_state.side_effect = update_state
+    with runner.isolated_filesystem():
+        with open("test_update.csv", "w") as csv:
+            csv.writelines(
+                ["id,state,note\n", "1,RESOLVED,\n", "bad,RESOLVED,\n", "2,RESOLVED,\n"]
+            )
+        result = runner.invoke(
+            cli, ["alerts", "bulk", "update", "test_update.csv"], obj=cli_state,
+        )
+    calls = cli_state.sdk.alerts.update_state.call_args_list
+    assert calls[0][0][1] == ["1", "bad", "2"]
+    assert [c[0][1] for c in calls[1:]] == [["1"], ["bad"], ["2"]]
+    assert "Some problems occurred during bulk processing" in result.output
+
+
+def test_bulk_update_counts_progress_per_alert(runner, mocker, cli_state_with_user):
+    bulk_processor = mocker.patch("code42cli.cmds.alerts.run_bulk_process")
+    with runner.isolated_filesystem():
+        with open("test_update.csv", "w") as csv:
+            csv.writelines(
+                ["id,state,note\n", "1,RESOLVED,done\n", "2,RESOLVED,done\n"]
+            )
+        runner.invoke(
+            cli,
+            ["alerts", "bulk", "update", "test_update.csv"],
+            obj=cli_state_with_user,
+        )
+    count_items = bulk_processor.call_args[1]["count_items"]
+    assert count_items({"ids": ["1", "2"], "state": "RESOLVED", "note": "done"}) == 2
+
+
+def test_bulk_update_when_batch_is_rejected_counts_only_failed_alerts(
+    runner, cli_state, custom_error
+):
+    def update_state(state, alert_ids, note=None):
+        if "bad" in alert_ids:
+            raise Py42BadRequestError(custom_error)
+
+    cli_state.sdk.alerts.update_state.side_effect = update_state
+    with runner.isolated_filesystem():
+        with open("test_update.csv", "w") as csv:
+            csv.writelines(
+                ["id,state,note\n", "1,RESOLVED,\n", "bad,RESOLVED,\n", "2,RESOLVED,\n"]
+            )
+        runner.invoke(
+            cli,
+            [
+                "alerts",
+                "bulk",
+                "update",
+                "test_update.csv",
+                "--stats-file",
+                "stats.json",
+            ],
+            obj=cli_state,
+        )
+        with open("stats.json") as stats_file:
+            stats = json.load(stats_file)
+    assert stats["total"] == 3
+    assert stats["succeeded"] == 2
+    assert stats["failed"] == 1
@@ -1,22 +1,32 @@
 import json
+import threading
 from datetime import datetime
 from datetime import timedelta
+from datetime import timezone
 from logging import Logger
 
 import pytest
 from py42.response import Py42Response
+from py42.util import convert_timestamp_to_str
 from requests import Response
 from tests.cmds.conftest import get_mark_for_search_and_send_to
 
 from code42cli.click_ext.types import MagicDate
+from code42cli.cmds.auditlogs import (
+    _dedupe_checkpointed_events_and_store_updated_checkpoint,
+)
 from code42cli.cmds.auditlogs import _parse_audit_log_timestamp_string_to_timestamp
 from code42cli.cmds.search.cursor_store import AuditLogCursorStore
+from code42cli.cmds.search.parallel import TimeWindow
+from code42cli.cmds.search.parallel import WINDOWS_PER_WORKER
 from code42cli.date_helper import convert_datetime_to_timestamp
 from code42cli.date_helper import round_datetime_to_day_end
 from code42cli.date_helper import round_datetime_to_day_start
 from code42cli.logger.handlers import ServerProtocol
+from code42cli.logger.handlers import SyslogServerNetworkConnectionError
 from code42cli.main import cli
 from code42cli.util import hash_event
+from code42cli.util import hash_event_v1
 
 TEST_AUDIT_LOG_TIMESTAMP_1 = "2020-01-01T12:00:00.000Z"
 TEST_AUDIT_LOG_TIMESTAMP_2 = "2020-02-01T12:01:00.000111Z"
@@ -101,6 +111,7 @@ def send_to_logger_factory(mocker):
 @pytest.fixture
 def send_to_logger(mocker, send_to_logger_factory):
     mock_logger = mocker.MagicMock(spec=Logger)
+    mock_logger.handlers = []
     send_to_logger_factory.return_value = mock_logger
     return mock_logger
 
@@ -257,7 +268,7 @@ def test_send_to_creates_expected_logger(cli_state, runner, send_to_logger_facto
         obj=cli_state,
     )
     send_to_logger_factory.assert_called_once_with(
-        "0.0.0.0", "TLS-TCP", "RAW-JSON", "certs/file"
+        "0.0.0.0", "TLS-TCP", "RAW-JSON", "certs/file", queue_size=10000
     )
 
 
@@ -279,7 +290,7 @@ def test_send_to_when_given_ignore_cert_validation_uses_certs_equal_to_ignore_st
         obj=cli_state,
     )
     send_to_logger_factory.assert_called_once_with(
-        "0.0.0.0", "TLS-TCP", "RAW-JSON", "ignore"
+        "0.0.0.0", "TLS-TCP", "RAW-JSON", "ignore", queue_size=10000
     )
 
 
@@ -308,6 +319,263 @@ def test_send_to_emits_events_in_chronological_order(
     )
 
 
+def _create_audit_log_response(mocker, events):
+    http_response = mocker.MagicMock(spec=Response)
+    http_response.status_code = 200
+    http_response.text = json.dumps({"events": events})
+    http_response._content_consumed = ""
+    return Py42Response(http_response)
+
+
+def test_send_to_gets_every_page_before_sending_events(
+    mocker, cli_state, runner, send_to_logger
+):
+    sent_before_second_page = []
+
+    def response_gen():
+        yield _create_audit_log_response(mocker, TEST_EVENTS_WITH_SAME_TIMESTAMP)
+        sent_before_second_page.append(send_to_logger.info.call_count)
+        yield _create_audit_log_response(mocker, TEST_EVENTS_WITH_DIFFERENT_TIMESTAMPS)
+
+    cli_state.sdk.auditlogs.get_all.return_value = response_gen()
+    runner.invoke(
+        cli, ["audit-logs", "send-to", "localhost", "--begin", "1d"], obj=cli_state
+    )
+    assert sent_before_second_page == [0]
+    assert send_to_logger.info.call_count == 4
+
+
+def test_search_when_later_page_out_of_order_outputs_events_in_chronological_order(
+    mocker, cli_state, runner
+):
+    def response_gen():
+        yield _create_audit_log_response(mocker, TEST_EVENTS_WITH_DIFFERENT_TIMESTAMPS)
+        yield _create_audit_log_response(mocker, TEST_EVENTS_WITH_SAME_TIMESTAMP)
+
+    cli_state.sdk.auditlogs.get_all.return_value = response_gen()
+    result = runner.invoke(
+        cli, ["audit-logs", "search", "--begin", "1d", "-f", "RAW-JSON"], obj=cli_state
+    )
+    timestamps = [json.loads(line)["timestamp"] for line in result.output.splitlines()]
+    assert timestamps == [
+        TEST_AUDIT_LOG_TIMESTAMP_1,
+        TEST_AUDIT_LOG_TIMESTAMP_1,
+        TEST_AUDIT_LOG_TIMESTAMP_2,
+        TEST_AUDIT_LOG_TIMESTAMP_3,
+    ]
+
+
+def test_send_to_when_pages_out_of_order_emits_events_in_chronological_order(
+    mocker, cli_state, runner, send_to_logger
+):
+    def response_gen():
+        yield _create_audit_log_response(
+            mocker, list(reversed(TEST_EVENTS_WITH_DIFFERENT_TIMESTAMPS))
+        )
+        yield _create_audit_log_response(mocker, TEST_EVENTS_WITH_SAME_TIMESTAMP)
+
+    cli_state.sdk.auditlogs.get_all.return_value = response_gen()
+    runner.invoke(
+        cli, ["audit-logs", "send-to", "localhost", "--begin", "1d"], obj=cli_state
+    )
+    timestamps = [
+        call[0][0]["timestamp"] for call in send_to_logger.info.call_args_list
+    ]
+    assert timestamps == [
+        TEST_AUDIT_LOG_TIMESTAMP_1,
+        TEST_AUDIT_LOG_TIMESTAMP_1,
+        TEST_AUDIT_LOG_TIMESTAMP_2,
+        TEST_AUDIT_LOG_TIMESTAMP_3,
+    ]
+
+
+def test_search_when_no_events_key_in_response_outputs_no_results(cli_state, runner):
+    def response_gen():
+        raise KeyError("events")
+        yield
+
+    cli_state.sdk.auditlogs.get_all.return_value = response_gen()
+    result = runner.invoke(
+        cli, ["audit-logs", "search", "--begin", "1d"], obj=cli_state
+    )
+    assert "No results found." in result.output
+
+
+def _get_window_events(mocker, begin_time):
+    # One event at the start of each window.
+    timestamp = datetime.fromtimestamp(begin_time, timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%S.%fZ"
+    )
+    event = {"type$": "audit_log::logged_in/1", "timestamp": timestamp}
+    return iter([_create_audit_log_response(mocker, [event])])
+
+
+@pytest.fixture
+def begin_and_end_args(date_str):
+    end_str = (datetime.utcnow() - timedelta(days=2)).strftime("%Y-%m-%d %H:%M:%S")
+    begin = convert_datetime_to_timestamp(
+        MagicDate(rounding_func=round_datetime_to_day_start).convert(
+            date_str, None, None
+        )
+    )
+    end = convert_datetime_to_timestamp(
+        MagicDate(rounding_func=round_datetime_to_day_end).convert(end_str, None, None)
+    )
+    return ["--begin", date_str, "--end", end_str], begin, end
+
+
+@search_and_send_to_test
+def test_search_and_send_to_with_parallel_gets_consecutive_windows_of_time_range(
+    runner, cli_state, begin_and_end_args, command
+):
+    args, begin, end = begin_and_end_args
+    runner.invoke(cli, [*command, *args, "--parallel", "2"], obj=cli_state)
+    calls = sorted(
+        cli_state.sdk.auditlogs.get_all.call_args_list,
+        key=lambda call: call[1]["begin_time"],
+    )
+    assert len(calls) == 2 * WINDOWS_PER_WORKER
+    assert calls[0][1]["begin_time"] == begin
+    assert calls[-1][1]["end_time"] == end
+    for call, next_call in zip(calls, calls[1:]):
+        assert call[1]["end_time"] == next_call[1]["begin_time"]
+        assert call[1]["event_types"] == ()
+
+
+def test_send_to_with_parallel_sends_events_in_timestamp_order(
+    mocker, runner, cli_state, send_to_logger, begin_and_end_args
+):
+    args, begin, _ = begin_and_end_args
+    second_window_fetched = threading.Event()
+
+    def get_all(**kwargs):
+        if kwargs["begin_time"] == begin:
+            # Let the second window finish first.
+            second_window_fetched.wait(5)
+        else:
+            second_window_fetched.set()
+        return _get_window_events(mocker, kwargs["begin_time"])
+
+    cli_state.sdk.auditlogs.get_all.side_effect = get_all
+    result = runner.invoke(
+        cli,
+        ["audit-logs", "send-to", "localhost", *args, "--parallel", "2"],
+        obj=cli_state,
+    )
+    assert result.exit_code == 0
+    timestamps = [
+        call[0][0]["timestamp"] for call in send_to_logger.info.call_args_list
+    ]
+    assert len(timestamps) == 2 * WINDOWS_PER_WORKER
+    assert timestamps == sorted(timestamps)
+
+
+def test_send_to_with_parallel_sends_events_at_window_boundaries_once(
+    mocker,
+    runner,
+    cli_state,
+    send_to_logger,
+    begin_and_end_args,
+    audit_log_cursor_with_checkpoint,
+):
+    args, begin, end = begin_and_end_args
+    checkpoint = begin + 0.239647
+    audit_log_cursor_with_checkpoint.get.return_value = checkpoint
+    audit_log_cursor_with_checkpoint.get_events.return_value = []
+    boundary = TimeWindow(checkpoint, end).split(2 * WINDOWS_PER_WORKER)[1].begin
+    timestamps = [
+        checkpoint + 0.0001,
+        boundary - 0.0004,
+        boundary,
+        boundary + 0.0003,
+    ]
+    events = [
+        {
+            "type$": "audit_log::logged_in/1",
+            "timestamp": datetime.fromtimestamp(ts, timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%S.%fZ"
+            ),
+        }
+        for ts in timestamps
+    ]
+
+    def get_all(**kwargs):
+        # Queries have millisecond precision; both bounds are inclusive.
+        def to_query_date(timestamp):
+            return datetime.strptime(
+                convert_timestamp_to_str(timestamp), "%Y-%m-%dT%H:%M:%S.%fZ"
+            )
+
+        begin_date = to_query_date(kwargs["begin_time"])
+        end_date = to_query_date(kwargs["end_time"])
+        window_events = [
+            event
+            for event, ts in zip(events, timestamps)
+            if begin_date <= datetime.utcfromtimestamp(ts) <= end_date
+        ]
+        return iter([_create_audit_log_response(mocker, window_events)])
+
+    cli_state.sdk.auditlogs.get_all.side_effect = get_all
+    result = runner.invoke(
+        cli,
+        [
+            "audit-logs",
+            "send-to",
+            "localhost",
+            *args,
+            "--parallel",
+            "2",
+            "--use-checkpoint",
+            "test",
+        ],
+        obj=cli_state,
+    )
+    assert result.exit_code == 0
+    sent = [call[0][0] for call in send_to_logger.info.call_args_list]
+    assert sent == events
+
+
+def test_send_to_with_parallel_when_window_fails_checkpoints_windows_before_it(
+    mocker,
+    runner,
+    cli_state,
+    send_to_logger,
+    begin_and_end_args,
+    audit_log_cursor_with_checkpoint,
+):
+    args, begin, _ = begin_and_end_args
+    audit_log_cursor_with_checkpoint.get.return_value = None
+    audit_log_cursor_with_checkpoint.get_events.return_value = []
+    failing_begin_times = []
+
+    def get_all(**kwargs):
+        if kwargs["begin_time"] != begin:
+            failing_begin_times.append(kwargs["begin_time"])
+            raise Exception("test window failed")
+        return _get_window_events(mocker, kwargs["begin_time"])
+
+    cli_state.sdk.auditlogs.get_all.side_effect = get_all
+    result = runner.invoke(
+        cli,
+        [
+            "audit-logs",
+            "send-to",
+            "localhost",
+            *args,
+            "--parallel",
+            "2",
+            "--use-checkpoint",
+            "test",
+        ],
+        obj=cli_state,
+    )
+    assert result.exit_code == 1
+    assert send_to_logger.info.call_count == 1
+    assert audit_log_cursor_with_checkpoint.replace_checkpoint.call_count == 1
+    ts = audit_log_cursor_with_checkpoint.replace_checkpoint.call_args[0][1]
+    assert ts == begin
+
+
 @pytest.mark.parametrize("protocol", (ServerProtocol.UDP, ServerProtocol.TCP))
 def test_send_to_when_given_ignore_cert_validation_with_non_tls_protocol_fails_expectedly(
     cli_state, runner, protocol
@@ -367,8 +635,8 @@ def test_search_and_send_to_with_checkpoint_saves_expected_cursor_timestamp(
     runner.invoke(
         cli, [*command, "--begin", "1d", "--use-checkpoint", "test"], obj=cli_state,
     )
-    assert audit_log_cursor_with_checkpoint.replace.call_count == 4
-    assert audit_log_cursor_with_checkpoint.replace.call_args_list[3][0] == (
+    assert audit_log_cursor_with_checkpoint.replace_checkpoint.call_count == 1
+    assert audit_log_cursor_with_checkpoint.replace_checkpoint.call_args[0][:2] == (
         "test",
         CURSOR_TIMESTAMP,
     )
@@ -391,6 +659,43 @@ def test_search_and_send_to_with_existing_checkpoint_replaces_begin_arg_if_passe
     )
 
 
+def test_send_to_with_follow_polls_from_last_sent_event(
+    cli_state, runner, send_to_logger, test_audit_log_response, follow_for_two_polls
+):
+    responses = [test_audit_log_response, iter([])]
+    cli_state.sdk.auditlogs.get_all.side_effect = lambda **kwargs: responses.pop(0)
+    result = runner.invoke(
+        cli,
+        ["audit-logs", "send-to", "localhost", "--begin", "1d", "--follow"],
+        obj=cli_state,
+    )
+    assert result.exit_code == 0
+    assert cli_state.sdk.auditlogs.get_all.call_count == 2
+    assert (
+        cli_state.sdk.auditlogs.get_all.call_args[1]["begin_time"] == CURSOR_TIMESTAMP
+    )
+    assert send_to_logger.info.call_count == 4
+
+
+def test_send_to_with_follow_and_checkpoint_stores_checkpoint_each_poll(
+    cli_state,
+    runner,
+    send_to_logger,
+    test_audit_log_response,
+    audit_log_cursor_with_checkpoint,
+    follow_for_two_polls,
+):
+    responses = [test_audit_log_response, iter([])]
+    cli_state.sdk.auditlogs.get_all.side_effect = lambda **kwargs: responses.pop(0)
+    runner.invoke(
+        cli,
+        ["audit-logs", "send-to", "localhost", "--use-checkpoint", "test", "--follow"],
+        obj=cli_state,
+    )
+    assert cli_state.sdk.auditlogs.get_all.call_count == 2
+    assert audit_log_cursor_with_checkpoint.replace_checkpoint.call_count == 1
+
+
 def test_search_with_existing_checkpoint_events_skips_duplicate_events(
     cli_state,
     runner,
@@ -407,6 +712,23 @@ def test_search_with_existing_checkpoint_events_skips_duplicate_events(
     assert "43@example.com" in result.stdout
 
 
+def test_search_with_existing_legacy_checkpoint_events_skips_duplicate_events(
+    cli_state, runner, test_audit_log_response, audit_log_cursor_with_checkpoint
+):
+    # Checkpoints saved by earlier versions hold unversioned MD5 hashes.
+    audit_log_cursor_with_checkpoint.get_events.return_value = [
+        hash_event_v1(TEST_EVENTS_WITH_SAME_TIMESTAMP[0])
+    ]
+    cli_state.sdk.auditlogs.get_all.return_value = test_audit_log_response
+    result = runner.invoke(
+        cli,
+        ["audit-logs", "search", "--begin", "1d", "--use-checkpoint", "test"],
+        obj=cli_state,
+    )
+    assert "42@example.com" not in result.stdout
+    assert "43@example.com" in result.stdout
+
+
 @search_and_send_to_test
 def test_search_and_send_to_without_existing_checkpoint_writes_both_event_hashes_with_same_timestamp(
     cli_state,
@@ -422,8 +744,8 @@ def test_search_and_send_to_without_existing_checkpoint_writes_both_event_hashes
     runner.invoke(
         cli, [*command, "--begin", "1d", "--use-checkpoint", "test"], obj=cli_state,
     )
-    assert audit_log_cursor_with_checkpoint.replace_events.call_count == 2
-    assert audit_log_cursor_with_checkpoint.replace_events.call_args_list[1][0][1] == [
+    assert audit_log_cursor_with_checkpoint.replace_checkpoint.call_count == 1
+    assert audit_log_cursor_with_checkpoint.replace_checkpoint.call_args[0][2] == [
         hash_event(TEST_EVENTS_WITH_SAME_TIMESTAMP[0]),
         hash_event(TEST_EVENTS_WITH_SAME_TIMESTAMP[1]),
     ]
@@ -478,3 +800,140 @@ def test_audit_log_parse_timestamp_handles_possible_strings():
     ts1 = _parse_audit_log_timestamp_string_to_timestamp(TIMESTAMP_WITH_MILLISECONDS)
     ts2 = _parse_audit_log_timestamp_string_to_timestamp(TIMESTAMP_WITHOUT_MILLISECONDS)
     assert ts1 == ts2
+
+
+ALL_TEST_EVENTS = (
+    TEST_EVENTS_WITH_SAME_TIMESTAMP + TEST_EVENTS_WITH_DIFFERENT_TIMESTAMPS
+)
+
+
+def test_dedupe_commits_checkpoint_every_commit_event_count_events(mocker):
+    cursor = mocker.MagicMock(spec=AuditLogCursorStore)
+    cursor.get_events.return_value = []
+    events = _dedupe_checkpointed_events_and_store_updated_checkpoint(
+        cursor, "test", ALL_TEST_EVENTS, commit_event_count=2, commit_interval=3600
+    )
+    list(events)
+    assert cursor.replace_checkpoint.call_count == 2
+    assert cursor.replace_checkpoint.call_args_list[0][0] == (
+        "test",
+        _parse_audit_log_timestamp_string_to_timestamp(TEST_AUDIT_LOG_TIMESTAMP_1),
+        [
+            hash_event(TEST_EVENTS_WITH_SAME_TIMESTAMP[0]),
+            hash_event(TEST_EVENTS_WITH_SAME_TIMESTAMP[1]),
+        ],
+    )
+    assert cursor.replace_checkpoint.call_args_list[1][0][:2] == (
+        "test",
+        CURSOR_TIMESTAMP,
+    )
+
+
+def test_dedupe_commits_checkpoint_when_commit_interval_elapses(mocker):
+    mocker.patch(
+        "code42cli.cmds.auditlogs.monotonic", side_effect=[0, 1, 10, 11, 12, 13]
+    )
+    cursor = mocker.MagicMock(spec=AuditLogCursorStore)
+    cursor.get_events.return_value = []
+    events = _dedupe_checkpointed_events_and_store_updated_checkpoint(
+        cursor, "test", ALL_TEST_EVENTS, commit_event_count=1000, commit_interval=5
+    )
+    list(events)
+    # Once when the interval elapses after the second event, then once at the end.
+    assert cursor.replace_checkpoint.call_count == 2
+    assert cursor.replace_checkpoint.call_args_list[0][0][2] == [
+        hash_event(TEST_EVENTS_WITH_SAME_TIMESTAMP[0]),
+        hash_event(TEST_EVENTS_WITH_SAME_TIMESTAMP[1]),
+    ]
+
+
+def test_dedupe_when_closed_early_commits_only_processed_events(mocker):
+    cursor = mocker.MagicMock(spec=AuditLogCursorStore)
+    cursor.get_events.return_value = []
+    events = _dedupe_checkpointed_events_and_store_updated_checkpoint(
+        cursor, "test", ALL_TEST_EVENTS
+    )
+    next(events)
+    next(events)
+    # The second event was yielded but is never finished being processed.
+    events.close()
+    cursor.replace_checkpoint.assert_called_once_with(
+        "test",
+        _parse_audit_log_timestamp_string_to_timestamp(TEST_AUDIT_LOG_TIMESTAMP_1),
+        [hash_event(TEST_EVENTS_WITH_SAME_TIMESTAMP[0])],
+    )
+
+
+def test_dedupe_when_no_events_processed_does_not_commit(mocker):
+    cursor = mocker.MagicMock(spec=AuditLogCursorStore)
+    cursor.get_events.return_value = [hash_event(e) for e in ALL_TEST_EVENTS]
+    events = _dedupe_checkpointed_events_and_store_updated_checkpoint(
+        cursor, "test", ALL_TEST_EVENTS
+    )
+    assert list(events) == []
+    assert not cursor.replace_checkpoint.call_count
+
+
+def test_dedupe_calls_before_commit_before_each_commit(mocker):
+    calls = []
+    cursor = mocker.MagicMock(spec=AuditLogCursorStore)
+    cursor.get_events.return_value = []
+    cursor.replace_checkpoint.side_effect = lambda *args: calls.append("commit")
+    events = _dedupe_checkpointed_events_and_store_updated_checkpoint(
+        cursor,
+        "test",
+        ALL_TEST_EVENTS,
+        commit_event_count=2,
+        commit_interval=3600,
+        before_commit=lambda: calls.append("before_commit"),
+    )
+    list(events)
+    assert calls == ["before_commit", "commit", "before_commit", "commit"]
+
+
+def test_dedupe_when_before_commit_raises_does_not_commit(mocker):
+    cursor = mocker.MagicMock(spec=AuditLogCursorStore)
+    cursor.get_events.return_value = []
+    before_commit = mocker.MagicMock(side_effect=SyslogServerNetworkConnectionError())
+    events = _dedupe_checkpointed_events_and_store_updated_checkpoint(
+        cursor, "test", ALL_TEST_EVENTS, before_commit=before_commit
+    )
+    with pytest.raises(SyslogServerNetworkConnectionError):
+        list(events)
+    assert not cursor.replace_checkpoint.call_count
+
+
+def test_send_to_with_checkpoint_sends_events_before_storing_checkpoint(
+    mocker,
+    cli_state,
+    runner,
+    send_to_logger,
+    test_audit_log_response,
+    audit_log_cursor_with_checkpoint,
+):
+    calls = []
+    handler = mocker.MagicMock()
+    handler.flush.side_effect = lambda: calls.append("flush")
+    send_to_logger.handlers = [handler]
+    send_to_logger.info.side_effect = lambda event: calls.append("info")
+    audit_log_cursor_with_checkpoint.replace_checkpoint.side_effect = lambda *args: (
+        calls.append("checkpoint")
+    )
+    cli_state.sdk.auditlogs.get_all.return_value = test_audit_log_response
+    result = runner.invoke(
+        cli,
+        [
+            "audit-logs",
+            "send-to",
+            "localhost",
+            "--begin",
+            "1d",
+            "--use-checkpoint",
+            "test",
+        ],
+        obj=cli_state,
+    )
+    assert result.exit_code == 0
+    # The command flushes once more before it exits.
+    assert calls[-3:] == ["flush", "checkpoint", "flush"]
+    assert calls.count("checkpoint") == 1
@@ -0,0 +1,27 @@
+from code42cli.cmds.shared import set_user_cache
+from code42cli.main import cli
+from code42cli.user_cache import UserCache
+
+
+def test_refresh_downloads_all_users_into_cache(runner, cli_state, tmp_path):
+    user_cache = UserCache(str(tmp_path / "users.db"))
+    set_user_cache(cli_state.sdk, user_cache)
+    cli_state.sdk.users.get_all.return_value = [
+        {"users": [{"username": "test@example.com", "userUid": "123"}]}
+    ]
+    result = runner.invoke(cli, ["cache", "refresh"], obj=cli_state)
+    assert "Cached 1 users" in result.output
+    assert user_cache.get_user_id("test@example.com") == "123"
+    user_cache.close()
+
+
+def test_clear_clears_profile_cache(runner, mocker, cli_state, tmp_path):
+    user_cache = UserCache(str(tmp_path / "users.db"))
+    user_cache.replace_all([{"username": "test@example.com", "userUid": "123"}])
+    for_profile = mocker.patch(
+        "code42cli.cmds.cache.UserCache.for_profile", return_value=user_cache
+    )
+    result = runner.invoke(cli, ["cache", "clear"], obj=cli_state)
+    for_profile.assert_called_once_with(cli_state.profile.name)
+    assert "Cleared the user cache" in result.output
+    assert user_cache.count() == 0
@@ -280,6 +280,27 @@ def test_remove_bulk_users_uses_expected_arguments(runner, mocker, cli_state_wit
     assert bulk_processor.call_args[0][1] == ["test_user1", "test_user2"]
 
 
+def test_remove_bulk_users_when_prefetch_users_passed_looks_up_all_users(
+    runner, mocker, cli_state_with_user
+):
+    mocker.patch("code42cli.cmds.departing_employee.run_bulk_process")
+    with runner.isolated_filesystem():
+        with open("test_remove.csv", "w") as csv:
+            csv.writelines(["# username\n", "test_user1\n"])
+        runner.invoke(
+            cli,
+            [
+                "departing-employee",
+                "bulk",
+                "remove",
+                "test_remove.csv",
+                "--prefetch-users",
+            ],
+            obj=cli_state_with_user,
+        )
+    cli_state_with_user.sdk.users.get_all.assert_called_once_with()
+
+
 def test_add_departing_employee_when_invalid_date_validation_raises_error(
     runner, cli_state_with_user
 ):
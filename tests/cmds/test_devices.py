@@ -19,7 +19,9 @@ from code42cli.cmds.devices import _add_legal_hold_membership_to_device_datafram
 from code42cli.cmds.devices import _add_usernames_to_device_dataframe
 from code42cli.cmds.devices import _break_backup_usage_into_total_storage
 from code42cli.cmds.devices import _get_device_dataframe
+from code42cli.cmds.devices import _write_backup_set_settings
 from code42cli.main import cli
+from code42cli.result_sinks import ListResultSink
 
 _NAMESPACE = "{}.cmds.devices".format(PRODUCT_NAME)
 TEST_DATE_OLDER = "2020-01-01T12:00:00.774Z"
@@ -814,6 +816,45 @@ def test_add_backup_set_settings_to_dataframe_returns_one_line_per_backup_set(
     assert len(result) == 2
 
 
+def test_write_backup_set_settings_writes_one_row_per_backup_set_with_device_columns(
+    cli_state, mock_device_settings
+):
+    cli_state.sdk.devices.get_settings.return_value = mock_device_settings
+    testdf = DataFrame.from_records([{"guid": "1234", "userUid": "user"}])
+    sink = ListResultSink()
+    _write_backup_set_settings(cli_state.sdk, testdf, sink)
+    assert len(sink.results) == 1
+    result = sink.results[0]
+    assert len(result) == 2
+    assert list(result["userUid"]) == ["user", "user"]
+    assert list(result["locked"]) == [True, True]
+
+
+def test_bulk_deactivate_when_given_results_file_writes_results_to_file(
+    runner, mocker, cli_state
+):
+    bulk_processor = mocker.patch(f"{_NAMESPACE}.run_bulk_process")
+    bulk_processor.return_value = None
+    with runner.isolated_filesystem():
+        with open("test_bulk_deactivate.csv", "w") as csv:
+            csv.writelines(["guid\n", "test\n"])
+        result = runner.invoke(
+            cli,
+            [
+                "devices",
+                "bulk",
+                "deactivate",
+                "test_bulk_deactivate.csv",
+                "--results-file",
+                "results.csv",
+            ],
+            obj=cli_state,
+        )
+    assert result.exit_code == 0
+    assert bulk_processor.call_args[1]["result_sink"] is not None
+    assert "guid" not in result.output
+
+
 def test_bulk_deactivate_uses_expected_arguments(runner, mocker, cli_state):
     bulk_processor = mocker.patch(f"{_NAMESPACE}.run_bulk_process")
     with runner.isolated_filesystem():
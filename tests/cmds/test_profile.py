@@ -277,7 +277,7 @@ def test_update_profile_updates_existing_profile(
         ],
     )
     mock_cliprofile_namespace.update_profile.assert_called_once_with(
-        name, "bar", "baz", True
+        name, "bar", "baz", True, None, None, None
     )
 
 
@@ -291,7 +291,7 @@ def test_update_profile_updates_default_profile(
         cli, ["profile", "update", "-s", "bar", "-u", "baz", "--disable-ssl-errors"],
     )
     mock_cliprofile_namespace.update_profile.assert_called_once_with(
-        name, "bar", "baz", True
+        name, "bar", "baz", True, None, None, None
     )
 
 
@@ -305,10 +305,67 @@ def test_update_profile_updates_name_alone(
         cli, ["profile", "update", "-u", "baz", "--disable-ssl-errors"],
     )
     mock_cliprofile_namespace.update_profile.assert_called_once_with(
-        name, None, "baz", True
+        name, None, "baz", True, None, None, None
     )
 
 
+def test_update_profile_updates_bulk_workers_alone(
+    runner, mock_cliprofile_namespace, profile
+):
+    name = "foo"
+    profile.name = name
+    mock_cliprofile_namespace.get_profile.return_value = profile
+    runner.invoke(cli, ["profile", "update", "--workers", "10"])
+    mock_cliprofile_namespace.update_profile.assert_called_once_with(
+        name, None, None, None, 10, None, None
+    )
+
+
+def test_update_profile_when_workers_is_auto_updates_bulk_workers(
+    runner, mock_cliprofile_namespace, profile
+):
+    name = "foo"
+    profile.name = name
+    mock_cliprofile_namespace.get_profile.return_value = profile
+    runner.invoke(cli, ["profile", "update", "--workers", "AUTO"])
+    mock_cliprofile_namespace.update_profile.assert_called_once_with(
+        name, None, None, None, "auto", None, None
+    )
+
+
+def test_update_profile_updates_rate_limit_and_burst(
+    runner, mock_cliprofile_namespace, profile
+):
+    name = "foo"
+    profile.name = name
+    mock_cliprofile_namespace.get_profile.return_value = profile
+    runner.invoke(
+        cli, ["profile", "update", "--rate-limit", "2.5", "--rate-limit-burst", "5"]
+    )
+    mock_cliprofile_namespace.update_profile.assert_called_once_with(
+        name, None, None, None, None, 2.5, 5
+    )
+
+
+def test_update_profile_when_rate_limit_is_negative_prints_error_message(
+    runner, mock_cliprofile_namespace, profile
+):
+    mock_cliprofile_namespace.get_profile.return_value = profile
+    result = runner.invoke(cli, ["profile", "update", "--rate-limit", "-1"])
+    assert result.exit_code == 2
+    assert not mock_cliprofile_namespace.update_profile.call_count
+
+
+def test_update_profile_when_workers_is_invalid_prints_error_message(
+    runner, mock_cliprofile_namespace, profile
+):
+    mock_cliprofile_namespace.get_profile.return_value = profile
+    result = runner.invoke(cli, ["profile", "update", "--workers", "0"])
+    assert result.exit_code == 2
+    assert "must be at least 1." in result.output
+    assert not mock_cliprofile_namespace.update_profile.call_count
+
+
 def test_update_profile_if_user_does_not_agree_does_not_save_password(
     runner, mock_cliprofile_namespace, user_disagreement, invalid_connection, profile
 ):
@@ -394,7 +451,8 @@ def test_update_profile_when_given_zero_args_prints_error_message(
     result = runner.invoke(cli, ["profile", "update"])
     expected = (
         "Must provide at least one of `--username`, `--server`, `--password`, "
-        "or `--disable-ssl-errors` when updating a profile."
+        "`--disable-ssl-errors`, `--workers`, `--rate-limit`, or `--rate-limit-burst` "
+        "when updating a profile."
     )
     assert "Profile 'foo' has been updated" not in result.output
     assert expected in result.output
@@ -501,6 +501,93 @@ def test_search_and_send_to_with_only_begin_calls_extract_with_expected_args(
     )
 
 
+@search_and_send_to_test
+def test_search_and_send_to_with_parallel_extracts_time_windows_in_parallel(
+    runner, mocker, cli_state, file_event_extractor, begin_option, command
+):
+    extract_in_parallel = mocker.patch(
+        "code42cli.cmds.securitydata.extract_in_parallel"
+    )
+    result = runner.invoke(
+        cli, [*command, "--begin", "1h", "--parallel", "4"], obj=cli_state
+    )
+    assert result.exit_code == 0
+    assert extract_in_parallel.call_args[0][3].begin == BEGIN_TIMESTAMP
+    assert extract_in_parallel.call_args[0][4] == 4
+    assert not file_event_extractor.extract.call_count
+
+
+@search_and_send_to_test
+def test_search_and_send_to_with_parallel_and_advanced_query_extracts_serially(
+    runner, mocker, cli_state, file_event_extractor, command
+):
+    extract_in_parallel = mocker.patch(
+        "code42cli.cmds.securitydata.extract_in_parallel"
+    )
+    advanced_query = '{"groups": [], "groupClause": "AND"}'
+    result = runner.invoke(
+        cli,
+        [*command, "--advanced-query", advanced_query, "--parallel", "4"],
+        obj=cli_state,
+    )
+    assert result.exit_code == 0
+    assert not extract_in_parallel.call_count
+    assert file_event_extractor.extract.call_count == 1
+
+
+def test_send_to_with_follow_extracts_until_stopped(
+    runner, cli_state, file_event_extractor, begin_option, follow_for_two_polls
+):
+    result = runner.invoke(
+        cli,
+        ["security-data", "send-to", "0.0.0.0", "--begin", "1h", "--follow"],
+        obj=cli_state,
+    )
+    assert result.exit_code == 0
+    assert file_event_extractor.extract.call_count == 2
+    assert follow_for_two_polls.call_args[0][0].interval == 60
+
+
+def test_send_to_with_follow_uses_given_interval(
+    runner, cli_state, file_event_extractor, begin_option, follow_for_two_polls
+):
+    runner.invoke(
+        cli,
+        [
+            "security-data",
+            "send-to",
+            "0.0.0.0",
+            "--begin",
+            "1h",
+            "--follow",
+            "--interval",
+            "5",
+        ],
+        obj=cli_state,
+    )
+    assert follow_for_two_polls.call_args[0][0].interval == 5
+
+
+def test_send_to_with_follow_and_end_fails(runner, cli_state):
+    result = runner.invoke(
+        cli,
+        [
+            "security-data",
+            "send-to",
+            "0.0.0.0",
+            "--begin",
+            "2d",
+            "--end",
+            "1d",
+            "--follow",
+        ],
+        obj=cli_state,
+    )
+    assert result.exit_code == 2
+    assert "--follow" in result.output
+    assert "--end" in result.output
+
+
 @search_and_send_to_test
 def test_search_and_send_to_with_use_checkpoint_and_without_begin_and_without_checkpoint_causes_expected_error(
     runner, cli_state, file_event_cursor_without_checkpoint, command
@@ -989,7 +1076,7 @@ def test_send_to_creates_expected_logger(cli_state, runner, send_to_logger_facto
         obj=cli_state,
     )
     send_to_logger_factory.assert_called_once_with(
-        "0.0.0.0", "TLS-TCP", "RAW-JSON", "certs/file"
+        "0.0.0.0", "TLS-TCP", "RAW-JSON", "certs/file", queue_size=10000
     )
 
 
@@ -1011,7 +1098,7 @@ def test_send_to_when_given_ignore_cert_validation_uses_certs_equal_to_ignore_st
         obj=cli_state,
     )
     send_to_logger_factory.assert_called_once_with(
-        "0.0.0.0", "TLS-TCP", "RAW-JSON", "ignore"
+        "0.0.0.0", "TLS-TCP", "RAW-JSON", "ignore", queue_size=10000
     )
 
 
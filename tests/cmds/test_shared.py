@@ -1,9 +1,100 @@
 import pytest
 
+from code42cli.cmds.shared import get_all_users
 from code42cli.cmds.shared import get_user_id
+from code42cli.cmds.shared import prefetch_user_ids
+from code42cli.cmds.shared import prefetch_user_ids_if_needed
+from code42cli.cmds.shared import PREFETCH_USERS_ROW_THRESHOLD
+from code42cli.cmds.shared import set_user_cache
 from code42cli.errors import UserDoesNotExistError
+from code42cli.user_cache import UserCache
 
 
 def test_get_user_id_when_user_does_not_raise_error(sdk_without_user):
     with pytest.raises(UserDoesNotExistError):
         get_user_id(sdk_without_user, "risky employee")
+
+
+def _mock_user_pages(sdk, users):
+    sdk.users.get_all.return_value = [{"users": users}]
+
+
+def test_get_user_id_after_prefetch_does_not_look_up_username(sdk):
+    _mock_user_pages(sdk, [{"username": "Test@example.com", "userUid": "123"}])
+    prefetch_user_ids(sdk)
+    assert get_user_id(sdk, "test@example.com") == "123"
+    assert not sdk.users.get_by_username.call_count
+
+
+def test_get_user_id_after_prefetch_when_user_not_in_index_looks_up_username(
+    sdk_with_user,
+):
+    _mock_user_pages(sdk_with_user, [])
+    prefetch_user_ids(sdk_with_user)
+    get_user_id(sdk_with_user, "new@example.com")
+    sdk_with_user.users.get_by_username.assert_called_once_with("new@example.com")
+
+
+def test_prefetch_user_ids_if_needed_when_below_threshold_does_not_prefetch(cli_state,):
+    prefetch_user_ids_if_needed(cli_state, [{}] * PREFETCH_USERS_ROW_THRESHOLD)
+    assert not cli_state.sdk.users.get_all.call_count
+
+
+def test_prefetch_user_ids_if_needed_when_above_threshold_prefetches(cli_state):
+    prefetch_user_ids_if_needed(cli_state, [{}] * (PREFETCH_USERS_ROW_THRESHOLD + 1))
+    cli_state.sdk.users.get_all.assert_called_once_with()
+
+
+def test_prefetch_user_ids_if_needed_when_turned_on_prefetches(cli_state):
+    cli_state.prefetch_users = True
+    prefetch_user_ids_if_needed(cli_state, [{}])
+    cli_state.sdk.users.get_all.assert_called_once_with()
+
+
+def test_prefetch_user_ids_if_needed_when_turned_off_does_not_prefetch(cli_state):
+    cli_state.prefetch_users = False
+    prefetch_user_ids_if_needed(cli_state, [{}] * (PREFETCH_USERS_ROW_THRESHOLD + 1))
+    assert not cli_state.sdk.users.get_all.call_count
+
+
+def test_get_user_id_when_user_cached_does_not_look_up_username(sdk, tmp_path):
+    user_cache = UserCache(str(tmp_path / "users.db"))
+    user_cache.add_users([{"username": "test@example.com", "userUid": "123"}])
+    set_user_cache(sdk, user_cache)
+    assert get_user_id(sdk, "test@example.com") == "123"
+    assert not sdk.users.get_by_username.call_count
+    user_cache.close()
+
+
+def test_get_user_id_when_user_not_cached_adds_looked_up_user_to_cache(
+    sdk_with_user, tmp_path
+):
+    user_cache = UserCache(str(tmp_path / "users.db"))
+    set_user_cache(sdk_with_user, user_cache)
+    user_id = get_user_id(sdk_with_user, "new@example.com")
+    assert user_cache.count() == 1
+    assert user_id
+    user_cache.close()
+
+
+def test_get_all_users_when_cache_fresh_does_not_page_through_users(sdk, tmp_path):
+    user_cache = UserCache(str(tmp_path / "users.db"))
+    user_cache.replace_all([{"username": "test@example.com", "userUid": "123"}])
+    set_user_cache(sdk, user_cache)
+    assert get_all_users(sdk) == [{"username": "test@example.com", "userUid": "123"}]
+    assert not sdk.users.get_all.call_count
+    user_cache.close()
+
+
+def test_get_all_users_when_refresh_pages_through_users_and_updates_cache(
+    sdk, tmp_path
+):
+    user_cache = UserCache(str(tmp_path / "users.db"))
+    user_cache.replace_all([{"username": "old@example.com", "userUid": "1"}])
+    set_user_cache(sdk, user_cache)
+    _mock_user_pages(sdk, [{"username": "new@example.com", "userUid": "2"}])
+    get_all_users(sdk, refresh=True)
+    assert user_cache.get_all_users() == [
+        {"username": "new@example.com", "userUid": "2"}
+    ]
+    user_cache.close()
@@ -119,6 +119,10 @@ def cli_state(mocker, sdk, profile):
     mock_state.profile = profile
     mock_state.search_filters = []
     mock_state.assume_yes = False
+    mock_state.workers = None
+    mock_state.resume = None
+    mock_state.stats_file = None
+    mock_state.prefetch_users = None
     return mock_state
 
 
@@ -153,9 +157,26 @@ def setup_mock_accessor(mock_accessor, name=None, values_dict=None):
 def profile(mocker):
     mock = mocker.MagicMock(spec=Code42Profile)
     mock.name = "testcliprofile"
+    mock.rate_limit = None
+    mock.rate_limit_burst = None
     return mock
 
 
+@pytest.fixture(autouse=True)
+def bulk_journal_dir(mocker, tmp_path):
+    mocker.patch("code42cli.bulk.get_user_project_path", return_value=str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def cursor_store_dir(mocker, tmp_path):
+    mocker.patch(
+        "code42cli.cmds.search.cursor_store.get_user_project_path",
+        return_value=str(tmp_path),
+    )
+    return tmp_path
+
+
 @pytest.fixture(autouse=True)
 def mock_makedirs(mocker):
     return mocker.patch("os.makedirs")
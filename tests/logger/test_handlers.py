@@ -1,10 +1,14 @@
+import logging
 import ssl
+import threading
 from socket import IPPROTO_TCP
 from socket import IPPROTO_UDP
 from socket import SOCK_DGRAM
 from socket import SOCK_STREAM
 from socket import socket
 from socket import SocketKind
+from socket import timeout
+from unittest.mock import call
 
 import pytest
 
@@ -255,3 +259,282 @@ class TestNoPrioritySysLogHandler:
         handler.connect_socket()
         handler.close()
         assert global_close.call_count == 1
+
+
+def _create_record(message):
+    return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+
+def _create_queued_handler(socket_mocks, protocol, queue_size=100, **kwargs):
+    handler = NoPrioritySysLogHandler(
+        _TEST_HOST, _TEST_PORT, protocol, None, queue_size=queue_size, **kwargs
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.socket = socket_mocks.mock_socket
+    return handler
+
+
+def _block_first_send(send_method):
+    """Makes the first send wait until the returned event is set, so records queue up."""
+    sent_first = threading.Event()
+    release = threading.Event()
+
+    def send(*args):
+        if not sent_first.is_set():
+            sent_first.set()
+            release.wait(5)
+
+    send_method.side_effect = send
+    return sent_first, release
+
+
+class TestNoPrioritySysLogHandlerWithQueue:
+    @tls_and_tcp_test
+    def test_emit_sends_queued_records_in_one_sendall(self, socket_mocks, protocol):
+        handler = _create_queued_handler(socket_mocks, protocol)
+        sent_first, release = _block_first_send(socket_mocks.mock_socket.sendall)
+        handler.emit(_create_record("one"))
+        sent_first.wait(5)
+        for message in ("two", "three", "four"):
+            handler.emit(_create_record(message))
+        release.set()
+        handler.flush()
+        sent = [call[0][0] for call in socket_mocks.mock_socket.sendall.call_args_list]
+        assert sent == [b"one\n", b"two\nthree\nfour\n"]
+        assert handler.stats.records_sent == 4
+        assert handler.stats.batches_sent == 2
+        assert handler.stats.bytes_sent == len(b"one\ntwo\nthree\nfour\n")
+        handler.close()
+
+    def test_emit_when_batch_reaches_max_bytes_starts_new_batch(
+        self, mocker, socket_mocks
+    ):
+        mocker.patch("code42cli.logger.handlers.MAX_SEND_BATCH_BYTES", 8)
+        handler = _create_queued_handler(socket_mocks, ServerProtocol.TCP)
+        sent_first, release = _block_first_send(socket_mocks.mock_socket.sendall)
+        handler.emit(_create_record("one"))
+        sent_first.wait(5)
+        for message in ("two", "three", "four"):
+            handler.emit(_create_record(message))
+        release.set()
+        handler.flush()
+        sent = [call[0][0] for call in socket_mocks.mock_socket.sendall.call_args_list]
+        assert sent == [b"one\n", b"two\nthree\n", b"four\n"]
+        handler.close()
+
+    def test_emit_when_udp_sends_each_record_in_its_own_datagram(self, socket_mocks):
+        handler = _create_queued_handler(socket_mocks, ServerProtocol.UDP)
+        handler.emit(_create_record("one"))
+        handler.emit(_create_record("two"))
+        handler.flush()
+        assert socket_mocks.mock_socket.sendto.call_args_list == [
+            call(b"one\n", (_TEST_HOST, _TEST_PORT)),
+            call(b"two\n", (_TEST_HOST, _TEST_PORT)),
+        ]
+        assert not socket_mocks.mock_socket.sendall.call_count
+        handler.close()
+
+    def test_emit_when_queue_full_waits_and_records_backpressure(self, socket_mocks):
+        handler = _create_queued_handler(socket_mocks, ServerProtocol.TCP, queue_size=1)
+        sent_first, release = _block_first_send(socket_mocks.mock_socket.sendall)
+        handler.emit(_create_record("one"))
+        sent_first.wait(5)
+        handler.emit(_create_record("two"))
+        threading.Timer(0.05, release.set).start()
+        handler.emit(_create_record("three"))
+        handler.flush()
+        assert handler.stats.blocked_count == 1
+        assert handler.stats.blocked_seconds > 0
+        assert handler.stats.max_queue_depth == 1
+        assert handler.stats.records_sent == 3
+        handler.close()
+
+    def test_flush_when_connection_broke_raises_network_connection_error(
+        self, socket_mocks
+    ):
+        handler = _create_queued_handler(
+            socket_mocks, ServerProtocol.TCP, reconnect_attempts=0
+        )
+        socket_mocks.mock_socket.sendall.side_effect = ConnectionResetError()
+        handler.emit(_create_record("one"))
+        with pytest.raises(SyslogServerNetworkConnectionError):
+            handler.flush()
+        handler.close()
+
+    def test_emit_after_connection_broke_raises_network_connection_error(
+        self, socket_mocks
+    ):
+        handler = _create_queued_handler(
+            socket_mocks, ServerProtocol.TCP, reconnect_attempts=0
+        )
+        socket_mocks.mock_socket.sendall.side_effect = ConnectionResetError()
+        handler.emit(_create_record("one"))
+        handler._queue.join()
+        with pytest.raises(SyslogServerNetworkConnectionError):
+            handler.emit(_create_record("two"))
+        handler.close()
+
+    def test_emit_after_sending_failed_with_other_error_raises_network_connection_error(
+        self, socket_mocks, capsys
+    ):
+        handler = _create_queued_handler(socket_mocks, ServerProtocol.TCP)
+        error = ValueError("unexpected")
+        socket_mocks.mock_socket.sendall.side_effect = error
+        handler.emit(_create_record("one"))
+        handler._queue.join()
+        with pytest.raises(SyslogServerNetworkConnectionError) as err:
+            handler.emit(_create_record("two"))
+        assert err.value.__cause__ is error
+        with pytest.raises(SyslogServerNetworkConnectionError):
+            handler.flush()
+        assert "Logging error" not in capsys.readouterr().err
+        handler.close()
+
+    def test_close_sends_queued_records_and_stops_sender(self, socket_mocks):
+        handler = _create_queued_handler(socket_mocks, ServerProtocol.TCP)
+        sent_first, release = _block_first_send(socket_mocks.mock_socket.sendall)
+        handler.emit(_create_record("one"))
+        sent_first.wait(5)
+        handler.emit(_create_record("two"))
+        sender_thread = handler._sender_thread
+        release.set()
+        handler.close()
+        assert not sender_thread.is_alive()
+        assert handler.stats.records_sent == 2
+        assert socket_mocks.mock_socket.close.call_count == 1
+
+    def test_flush_when_nothing_queued_returns(self, socket_mocks):
+        handler = _create_queued_handler(socket_mocks, ServerProtocol.TCP)
+        handler.flush()
+        assert not socket_mocks.mock_socket.sendall.call_count
+
+
+@pytest.fixture
+def mock_sleep(mocker):
+    return mocker.patch("code42cli.logger.handlers.sleep")
+
+
+def _create_connected_handler(mocker, socket_mocks, protocol, **kwargs):
+    handler = NoPrioritySysLogHandler(_TEST_HOST, _TEST_PORT, protocol, None, **kwargs)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.socket = socket_mocks.mock_socket
+    new_socket = mocker.MagicMock(spec=ssl.SSLSocket)
+    mocker.patch.object(handler, "_create_socket", return_value=new_socket)
+    return handler, new_socket
+
+
+class TestNoPrioritySysLogHandlerReconnect:
+    @tls_and_tcp_test
+    def test_emit_when_connection_broke_reconnects_and_sends_record(
+        self, mocker, socket_mocks, mock_sleep, protocol
+    ):
+        handler, new_socket = _create_connected_handler(mocker, socket_mocks, protocol)
+        socket_mocks.mock_socket.sendall.side_effect = ConnectionResetError()
+        handler.emit(_create_record("one"))
+        handler._create_socket.assert_called_once_with(_TEST_HOST, _TEST_PORT, None)
+        new_socket.sendall.assert_called_once_with(b"one\n")
+        assert socket_mocks.mock_socket.close.call_count == 1
+        assert handler.socket is new_socket
+        assert handler.stats.reconnect_count == 1
+        assert not mock_sleep.call_count
+
+    @pytest.mark.parametrize(
+        "error",
+        [ssl.SSLEOFError(), ssl.SSLError(), timeout()],
+        ids=["ssl_eof", "ssl", "timeout"],
+    )
+    def test_emit_when_tls_connection_broke_reconnects_and_sends_record(
+        self, mocker, socket_mocks, mock_sleep, error
+    ):
+        handler, new_socket = _create_connected_handler(
+            mocker, socket_mocks, ServerProtocol.TLS_TCP
+        )
+        socket_mocks.mock_socket.sendall.side_effect = error
+        handler.emit(_create_record("one"))
+        new_socket.sendall.assert_called_once_with(b"one\n")
+        assert handler.stats.reconnect_count == 1
+
+    def test_emit_when_every_tls_reconnect_fails_raises_network_connection_error(
+        self, mocker, socket_mocks, mock_sleep
+    ):
+        handler, _ = _create_connected_handler(
+            mocker, socket_mocks, ServerProtocol.TLS_TCP, reconnect_attempts=2
+        )
+        handler._create_socket.side_effect = ssl.SSLError()
+        socket_mocks.mock_socket.sendall.side_effect = ssl.SSLEOFError()
+        with pytest.raises(SyslogServerNetworkConnectionError):
+            handler.emit(_create_record("one"))
+        assert handler._create_socket.call_count == 2
+
+    def test_emit_when_connection_broke_replays_records_sent_before(
+        self, mocker, socket_mocks, mock_sleep
+    ):
+        handler, new_socket = _create_connected_handler(
+            mocker, socket_mocks, ServerProtocol.TCP
+        )
+        handler.emit(_create_record("one"))
+        handler.emit(_create_record("two"))
+        socket_mocks.mock_socket.sendall.side_effect = BrokenPipeError()
+        handler.emit(_create_record("three"))
+        new_socket.sendall.assert_called_once_with(b"one\ntwo\nthree\n")
+        assert handler.stats.records_replayed == 2
+
+    def test_emit_replays_at_most_replay_buffer_size_records(
+        self, mocker, socket_mocks, mock_sleep
+    ):
+        handler, new_socket = _create_connected_handler(
+            mocker, socket_mocks, ServerProtocol.TCP, replay_buffer_size=1
+        )
+        handler.emit(_create_record("one"))
+        handler.emit(_create_record("two"))
+        socket_mocks.mock_socket.sendall.side_effect = BrokenPipeError()
+        handler.emit(_create_record("three"))
+        new_socket.sendall.assert_called_once_with(b"two\nthree\n")
+
+    def test_emit_when_reconnect_fails_retries_with_backoff(
+        self, mocker, socket_mocks, mock_sleep
+    ):
+        handler, new_socket = _create_connected_handler(
+            mocker, socket_mocks, ServerProtocol.TCP
+        )
+        handler._create_socket.side_effect = [
+            ConnectionRefusedError(),
+            ConnectionRefusedError(),
+            ConnectionRefusedError(),
+            new_socket,
+        ]
+        socket_mocks.mock_socket.sendall.side_effect = ConnectionResetError()
+        handler.emit(_create_record("one"))
+        assert [call[0][0] for call in mock_sleep.call_args_list] == [1, 2, 4]
+        new_socket.sendall.assert_called_once_with(b"one\n")
+        assert handler.stats.reconnect_count == 1
+
+    def test_emit_when_every_reconnect_fails_raises_network_connection_error(
+        self, mocker, socket_mocks, mock_sleep
+    ):
+        handler, _ = _create_connected_handler(
+            mocker, socket_mocks, ServerProtocol.TCP, reconnect_attempts=2
+        )
+        handler._create_socket.side_effect = ConnectionRefusedError()
+        socket_mocks.mock_socket.sendall.side_effect = ConnectionResetError()
+        with pytest.raises(SyslogServerNetworkConnectionError):
+            handler.emit(_create_record("one"))
+        assert handler._create_socket.call_count == 2
+        # Closing after giving up doesn't try to close the broken socket again.
+        handler.close()
+        assert socket_mocks.mock_socket.close.call_count == 1
+
+    def test_emit_when_queued_and_connection_broke_reconnects(
+        self, mocker, socket_mocks, mock_sleep
+    ):
+        handler, new_socket = _create_connected_handler(
+            mocker, socket_mocks, ServerProtocol.TCP, queue_size=100
+        )
+        socket_mocks.mock_socket.sendall.side_effect = ConnectionResetError()
+        handler.emit(_create_record("one"))
+        handler.flush()
+        new_socket.sendall.assert_called_once_with(b"one\n")
+        handler.emit(_create_record("two"))
+        handler.flush()
+        assert new_socket.sendall.call_args_list[1][0][0] == b"two\n"
+        handler.close()
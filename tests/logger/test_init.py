@@ -119,7 +119,7 @@ def test_get_logger_for_server_constructs_handler_with_expected_args(
         "example.com", ServerProtocol.TCP, SendToFileEventsOutputFormat.CEF, "cert"
     )
     no_priority_syslog_handler.assert_called_once_with(
-        "example.com", 514, ServerProtocol.TCP, "cert"
+        "example.com", 514, ServerProtocol.TCP, "cert", queue_size=None
     )
 
 
@@ -134,7 +134,7 @@ def test_get_logger_for_server_when_hostname_includes_port_constructs_handler_wi
         "example.com:999", ServerProtocol.TCP, SendToFileEventsOutputFormat.CEF, None
     )
     no_priority_syslog_handler.assert_called_once_with(
-        "example.com", 999, ServerProtocol.TCP, None,
+        "example.com", 999, ServerProtocol.TCP, None, queue_size=None
     )
 
 
@@ -1,13 +1,30 @@
+import json
 from collections import OrderedDict
+from datetime import datetime
 
+import click
 import pytest
+from click.testing import CliRunner
+from requests.exceptions import ConnectionError
 
 from code42cli import errors
+from code42cli import json_backend
 from code42cli import PRODUCT_NAME
+from code42cli.bulk import _create_bulk_processor
+from code42cli.bulk import BulkJournal
 from code42cli.bulk import BulkProcessor
+from code42cli.bulk import DEFAULT_WORKER_COUNT
 from code42cli.bulk import generate_template_cmd_factory
+from code42cli.bulk import MAX_ADAPTIVE_WORKER_COUNT
 from code42cli.bulk import run_bulk_process
+from code42cli.file_readers import CsvRowStream
+from code42cli.file_readers import FlatFileRowStream
 from code42cli.logger import get_view_error_details_message
+from code42cli.options import CLIState
+from code42cli.result_sinks import create_result_sink
+from code42cli.util import hash_event
+from code42cli.worker import RetryPolicy
+from code42cli.worker import Worker
 
 _NAMESPACE = "{}.bulk".format(PRODUCT_NAME)
 
@@ -32,6 +49,10 @@ def func_with_one_arg(sdk, profile, test1):
     pass
 
 
+def func_with_one_arg_and_no_sdk(test1):
+    pass
+
+
 def test_generate_template_cmd_factory_returns_expected_command():
     add_headers = ["foo", "bar"]
     remove_headers = ["test"]
@@ -77,10 +98,136 @@ def test_run_bulk_process_creates_processor(bulk_processor_factory):
     errors.ERRORED = False
     rows = [1, 2]
     run_bulk_process(func_with_one_arg, rows)
-    bulk_processor_factory.assert_called_once_with(func_with_one_arg, rows, None)
+    bulk_processor_factory.assert_called_once_with(
+        func_with_one_arg, rows, None, None, None, None
+    )
+
+
+@pytest.fixture
+def mock_ensure_max_connections(mocker):
+    return mocker.patch(f"{_NAMESPACE}.ensure_max_connections")
+
+
+def test_create_bulk_processor_when_no_context_uses_default_worker_count(
+    mocker, mock_ensure_max_connections
+):
+    mock_processor = mocker.patch(f"{_NAMESPACE}.BulkProcessor")
+    _create_bulk_processor(func_with_one_arg, [1], None)
+    assert mock_processor.call_args[1]["worker_count"] == DEFAULT_WORKER_COUNT
+
+
+def test_create_bulk_processor_uses_worker_count_from_cli_state(
+    mocker, cli_state, mock_ensure_max_connections
+):
+    mock_processor = mocker.patch(f"{_NAMESPACE}.BulkProcessor")
+    cli_state.workers = 12
+    with click.Context(click.Command("test"), obj=cli_state):
+        _create_bulk_processor(func_with_one_arg, [1], None)
+    assert mock_processor.call_args[1]["worker_count"] == 12
+
+
+def test_cli_state_workers_when_not_set_uses_profile_setting(mocker, profile):
+    profile.bulk_workers = "auto"
+    state = CLIState()
+    state.profile = profile
+    assert state.workers == "auto"
+
+
+def test_cli_state_workers_when_set_ignores_profile_setting(mocker, profile):
+    profile.bulk_workers = "auto"
+    state = CLIState()
+    state.profile = profile
+    state.workers = 3
+    assert state.workers == 3
+
+
+def test_create_bulk_processor_when_command_supports_resume_creates_journal(
+    mocker, cli_state, mock_ensure_max_connections, bulk_journal_dir
+):
+    mock_processor = mocker.patch(f"{_NAMESPACE}.BulkProcessor")
+    cli_state.resume = False
+    group = click.Group("code42")
+    ctx = click.Context(group, info_name="code42", obj=cli_state)
+    with click.Context(click.Command("add"), parent=ctx, info_name="add"):
+        _create_bulk_processor(func_with_one_arg, [1], None)
+    journal = mock_processor.call_args[1]["journal"]
+    assert journal.location == str(bulk_journal_dir / "add.jsonl")
+    journal.close()
+
+
+def test_create_bulk_processor_when_command_does_not_support_resume_does_not_create_journal(
+    mocker, cli_state, mock_ensure_max_connections
+):
+    mock_processor = mocker.patch(f"{_NAMESPACE}.BulkProcessor")
+    with click.Context(click.Command("test"), obj=cli_state):
+        _create_bulk_processor(func_with_one_arg, [1], None)
+    assert mock_processor.call_args[1]["journal"] is None
+
+
+class TestBulkJournal:
+    def test_has_succeeded_when_resuming_returns_true_only_for_succeeded_rows(
+        self, tmp_path
+    ):
+        location = str(tmp_path / "journal.jsonl")
+        journal = BulkJournal(location)
+        journal.record("row1", True, {"guid": "1"})
+        journal.record("row2", False)
+        journal.close()
+
+        resumed = BulkJournal(location, resume=True)
+        assert resumed.has_succeeded("row1")
+        assert resumed.get_result("row1") == {"guid": "1"}
+        assert not resumed.has_succeeded("row2")
+        resumed.close()
+
+    def test_has_succeeded_when_not_resuming_starts_over(self, tmp_path):
+        location = str(tmp_path / "journal.jsonl")
+        journal = BulkJournal(location)
+        journal.record("row1", True)
+        journal.close()
+
+        restarted = BulkJournal(location)
+        assert not restarted.has_succeeded("row1")
+        restarted.close()
+
+    def test_has_succeeded_when_row_later_failed_returns_false(self, tmp_path):
+        location = str(tmp_path / "journal.jsonl")
+        journal = BulkJournal(location)
+        journal.record("row1", True)
+        journal.record("row1", False)
+        journal.close()
+
+        resumed = BulkJournal(location, resume=True)
+        assert not resumed.has_succeeded("row1")
+        resumed.close()
+
+    def test_init_when_resuming_ignores_incomplete_last_line(self, tmp_path):
+        location = tmp_path / "journal.jsonl"
+        location.write_text('{"row": "row1", "status": "succeeded"}\n{"row": "ro')
+        resumed = BulkJournal(str(location), resume=True)
+        assert resumed.has_succeeded("row1")
+        resumed.close()
 
 
 class TestBulkProcessor:
+    def test_init_when_given_worker_count_creates_worker_with_that_many_threads(
+        self, mock_ensure_max_connections
+    ):
+        processor = BulkProcessor(func_with_one_arg, [1], worker_count=12)
+        worker = processor._BulkProcessor__worker
+        assert worker._thread_count == 12
+        assert worker._concurrency is None
+        mock_ensure_max_connections.assert_called_once_with(12)
+
+    def test_init_when_worker_count_is_auto_creates_adaptive_worker(
+        self, mock_ensure_max_connections
+    ):
+        processor = BulkProcessor(func_with_one_arg, [1], worker_count="auto")
+        worker = processor._BulkProcessor__worker
+        assert worker._thread_count == MAX_ADAPTIVE_WORKER_COUNT
+        assert worker._concurrency is not None
+        mock_ensure_max_connections.assert_called_once_with(MAX_ADAPTIVE_WORKER_COUNT)
+
     def test_run_when_reader_returns_ordered_dict_process_kwargs(self):
         processed_rows = []
 
@@ -200,3 +347,262 @@ class TestBulkProcessor:
         assert "row1" in processor._stats.results
         assert "row2" in processor._stats.results
         assert "row3" in processor._stats.results
+
+    def test_run_when_given_csv_row_stream_processes_each_row(self, runner):
+        processed_rows = []
+
+        def func_for_bulk(test1, test2):
+            processed_rows.append((test1, test2))
+
+        with runner.isolated_filesystem():
+            with open("test.csv", "w") as file:
+                file.write("test1,test2\n")
+                file.writelines(f"a{i},b{i}\n" for i in range(100))
+            with open("test.csv") as file:
+                stream = CsvRowStream(file, ["test1", "test2"])
+                processor = BulkProcessor(func_for_bulk, stream)
+                processor.run()
+
+        assert sorted(processed_rows) == sorted((f"a{i}", f"b{i}") for i in range(100))
+
+    def test_run_when_given_row_stream_fills_progress_bar_by_bytes(self, runner):
+        with runner.isolated_filesystem():
+            with open("test.txt", "w") as file:
+                file.writelines(f"row{i}\n" for i in range(50))
+            with open("test.txt") as file:
+                stream = FlatFileRowStream(file)
+                processor = BulkProcessor(func_with_one_arg_and_no_sdk, stream)
+                assert processor._progress_bar.length == stream.size
+                processor.run()
+                assert processor._progress_bar.pos == stream.size
+                assert processor._stats.total_processed == 50
+                assert str(processor._stats) == "50 succeeded, 0 failed"
+
+    def test_run_when_given_row_stream_and_row_is_retried_counts_its_bytes_once(
+        self, runner
+    ):
+        failed_rows = set()
+
+        def flaky_func(test):
+            if test not in failed_rows:
+                failed_rows.add(test)
+                raise ConnectionError()
+
+        with runner.isolated_filesystem():
+            with open("test.txt", "w") as file:
+                file.writelines(f"row{i}\n" for i in range(5))
+            with open("test.txt") as file:
+                stream = FlatFileRowStream(file)
+                worker = Worker(1, None, retry_policy=RetryPolicy(base_delay=0))
+                processor = BulkProcessor(flaky_func, stream, worker=worker)
+                positions = []
+                update = processor._progress_bar.update
+                processor._progress_bar.update = lambda n: positions.append(
+                    n
+                ) or update(n)
+                processor.run()
+                assert len(failed_rows) == 5
+                # One update per row, with nothing left for the end of the run to fill in.
+                assert len(positions) == 5
+                assert sum(positions) == stream.size
+
+    def test_run_when_given_row_stream_does_not_read_ahead_of_bounded_queue(
+        self, runner
+    ):
+        with runner.isolated_filesystem():
+            with open("test.txt", "w") as file:
+                file.writelines(f"row{i}\n" for i in range(1000))
+            with open("test.txt") as file:
+                stream = FlatFileRowStream(file)
+                positions = []
+
+                def func_for_bulk(test):
+                    positions.append(stream.position)
+
+                processor = BulkProcessor(func_for_bulk, stream, worker_count=1)
+                processor.run()
+
+        # With one worker, rows are read at most a few queue slots ahead of the one being processed.
+        assert positions[0] < stream.size / 10
+
+    def test_run_when_journal_has_succeeded_rows_skips_them(self, tmp_path):
+        location = str(tmp_path / "journal.jsonl")
+        processed_rows = []
+        failing_rows = ["row2"]
+
+        def func_for_bulk(test):
+            if test in failing_rows:
+                raise Exception()
+            processed_rows.append(test)
+            return test
+
+        rows = ["row1", "row2", "row3"]
+        processor = BulkProcessor(
+            func_for_bulk, rows, worker_count=1, journal=BulkJournal(location)
+        )
+        with pytest.raises(errors.LoggedCLIError):
+            processor.run()
+        assert processed_rows == ["row1", "row3"]
+
+        processed_rows.clear()
+        failing_rows.clear()
+        processor = BulkProcessor(
+            func_for_bulk,
+            rows,
+            worker_count=1,
+            journal=BulkJournal(location, resume=True),
+        )
+        results = processor.run()
+        assert processed_rows == ["row2"]
+        assert sorted(results) == ["row1", "row2", "row3"]
+
+    def test_run_when_journal_has_succeeded_rows_counts_them_as_succeeded(
+        self, tmp_path
+    ):
+        location = str(tmp_path / "journal.jsonl")
+        stats_location = tmp_path / "stats.json"
+        rows = ["row1", "row2", "row3"]
+        journal = BulkJournal(location)
+        journal.record(hash_event("row1"), True, "row1")
+        journal.close()
+
+        processor = BulkProcessor(
+            lambda test: test,
+            rows,
+            worker_count=1,
+            journal=BulkJournal(location, resume=True),
+            stats_file=str(stats_location),
+        )
+        processor.run()
+        assert str(processor._stats) == "3 succeeded, 0 failed out of 3"
+        stats = json.loads(stats_location.read_text())
+        assert stats["processed"] == 3
+        assert stats["succeeded"] == 3
+
+    def test_run_when_is_success_returns_false_journals_row_as_failed(self, tmp_path):
+        location = str(tmp_path / "journal.jsonl")
+        rows = [{"guid": "1"}, {"guid": "2"}]
+
+        def func_for_bulk(guid):
+            return {"guid": guid, "ok": guid == "1"}
+
+        processor = BulkProcessor(
+            func_for_bulk,
+            rows,
+            journal=BulkJournal(location),
+            is_success=lambda result: result["ok"],
+        )
+        processor.run()
+
+        resumed = BulkJournal(location, resume=True)
+        assert resumed.has_succeeded(hash_event({"guid": "1"}))
+        assert not resumed.has_succeeded(hash_event({"guid": "2"}))
+        resumed.close()
+
+    def test_run_when_row_has_values_json_cannot_serialize_journals_row(
+        self, mocker, tmp_path
+    ):
+        mocker.patch.object(json_backend, "_backend", json_backend.STDLIB)
+        location = str(tmp_path / "journal.jsonl")
+        purge_date = datetime(2020, 1, 2)
+        rows = [{"guid": "1", "purge_date": purge_date}]
+        processed_rows = []
+
+        def func_for_bulk(guid, purge_date):
+            processed_rows.append((guid, purge_date))
+            raise Exception()
+
+        journal = BulkJournal(location)
+        processor = BulkProcessor(func_for_bulk, rows, journal=journal)
+        with pytest.raises(errors.LoggedCLIError):
+            processor.run()
+
+        assert processed_rows == [("1", purge_date)]
+        assert journal.failed_count == 1
+
+    def test_run_when_row_succeeds_after_retry_journals_it_as_succeeded(
+        self, tmp_path, mock_remove
+    ):
+        location = str(tmp_path / "journal.jsonl")
+        attempts = []
+
+        def flaky_func(test):
+            attempts.append(test)
+            if len(attempts) == 1:
+                raise ConnectionError()
+
+        journal = BulkJournal(location)
+        worker = Worker(1, 1, retry_policy=RetryPolicy(base_delay=0))
+        processor = BulkProcessor(flaky_func, ["row1"], worker=worker, journal=journal)
+        processor.run()
+        assert attempts == ["row1", "row1"]
+        assert journal.failed_count == 0
+        mock_remove.assert_called_once_with(location)
+
+    def test_run_when_row_fails_after_retries_journals_it_as_failed_once(
+        self, tmp_path
+    ):
+        location = str(tmp_path / "journal.jsonl")
+
+        def failing_func(test):
+            raise ConnectionError()
+
+        journal = BulkJournal(location)
+        worker = Worker(1, 1, retry_policy=RetryPolicy(max_attempts=3, base_delay=0))
+        processor = BulkProcessor(
+            failing_func, ["row1"], worker=worker, journal=journal
+        )
+        with pytest.raises(errors.LoggedCLIError):
+            processor.run()
+        assert journal.failed_count == 1
+
+    def test_run_when_results_written_to_stdout_shows_progress_on_stderr(self):
+        @click.command()
+        def command():
+            sink = create_result_sink(click.get_text_stream("stdout"))
+            processor = BulkProcessor(
+                lambda test: {"row": test},
+                ["row1", "row2"],
+                progress_label="Processing",
+                result_sink=sink,
+            )
+            assert processor._progress_bar.file is click.get_text_stream("stderr")
+            processor.run()
+
+        result = CliRunner(mix_stderr=False).invoke(command)
+        assert result.exit_code == 0
+        lines = result.stdout.splitlines()
+        assert sorted(json.loads(line)["row"] for line in lines) == ["row1", "row2"]
+
+    def test_run_when_all_rows_succeed_deletes_journal(self, tmp_path, mock_remove):
+        location = str(tmp_path / "journal.jsonl")
+        processor = BulkProcessor(
+            func_with_one_arg_and_no_sdk, ["row1"], journal=BulkJournal(location)
+        )
+        processor.run()
+        mock_remove.assert_called_once_with(location)
+
+    def test_run_when_given_stats_file_writes_stats_as_json(self, tmp_path):
+        stats_file = tmp_path / "stats.json"
+
+        def func_for_bulk(test):
+            if test == "row2":
+                raise errors.Code42CLIError("bad row")
+
+        processor = BulkProcessor(
+            func_for_bulk, ["row1", "row2", "row3"], stats_file=str(stats_file)
+        )
+        with pytest.raises(errors.LoggedCLIError):
+            processor.run()
+
+        stats = json.loads(stats_file.read_text())
+        assert stats["total"] == 3
+        assert stats["failed"] == 1
+        assert stats["errors_by_type"] == {"Code42CLIError": 1}
+        assert stats["latency_seconds"]["count"] == 3
+
+    def test_show_stats_includes_latency_and_throughput_once_rows_complete(self):
+        processor = BulkProcessor(func_with_one_arg_and_no_sdk, ["row1"])
+        assert processor._show_stats(None) == "0 succeeded, 0 failed out of 1"
+        processor.run()
+        assert "p95" in processor._show_stats(None)
@@ -214,6 +214,25 @@ class TestConfigAccessor:
             ConfigAccessor.IGNORE_SSL_ERRORS_KEY
         ]
 
+    def test_update_profile_updates_bulk_workers(
+        self, config_parser_for_multiple_profiles
+    ):
+        accessor = ConfigAccessor(config_parser_for_multiple_profiles)
+        accessor.update_profile(_TEST_PROFILE_NAME, bulk_workers=10)
+        assert (
+            accessor.get_profile(_TEST_PROFILE_NAME)[ConfigAccessor.BULK_WORKERS_KEY]
+            == "10"
+        )
+
+    def test_update_profile_updates_rate_limit_and_burst(
+        self, config_parser_for_multiple_profiles
+    ):
+        accessor = ConfigAccessor(config_parser_for_multiple_profiles)
+        accessor.update_profile(_TEST_PROFILE_NAME, rate_limit=2.5, rate_limit_burst=5)
+        profile = accessor.get_profile(_TEST_PROFILE_NAME)
+        assert profile[ConfigAccessor.RATE_LIMIT_KEY] == "2.5"
+        assert profile[ConfigAccessor.RATE_LIMIT_BURST_KEY] == "5"
+
     def test_update_profile_does_not_update_when_given_none(
         self, config_parser_for_multiple_profiles
     ):
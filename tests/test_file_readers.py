@@ -4,7 +4,11 @@ import pytest
 from code42cli.click_ext.types import AutoDecodedFile
 from code42cli.click_ext.types import FileOrString
 from code42cli.errors import Code42CLIError
+from code42cli.file_readers import CsvRowStream
+from code42cli.file_readers import FlatFileRowStream
 from code42cli.file_readers import read_csv
+from code42cli.file_readers import read_csv_arg
+from code42cli.file_readers import read_flat_file_arg
 
 HEADERLESS_CSV = [
     "col1_val1,col2_val1,col3_val1\n",
@@ -100,3 +104,124 @@ def test_FileOrString_arg_handles_various_encodings_automatically(runner, encodi
 
         result_data = FileOrString().convert("@test1.json", None, None)
         assert result_data == test_data
+
+
+def test_csv_row_stream_reads_headered_rows_lazily(runner):
+    with runner.isolated_filesystem():
+        with open("test_csv.csv", "w") as csv:
+            csv.writelines(HEADERED_CSV)
+        with open("test_csv.csv") as csv:
+            stream = CsvRowStream(csv, HEADERS)
+            first_position = stream.position
+            rows = list(stream)
+            assert stream.position > first_position
+            assert stream.position == stream.size
+        assert rows == [
+            {"header1": "col1_val1", "header2": "col2_val1", "header3": "col3_val1"},
+            {"header1": "col1_val2", "header2": "col2_val2", "header3": "col3_val2"},
+        ]
+
+
+def test_csv_row_stream_reads_headerless_rows(runner):
+    with runner.isolated_filesystem():
+        with open("test_csv.csv", "w") as csv:
+            csv.writelines(HEADERLESS_CSV)
+        with open("test_csv.csv") as csv:
+            rows = list(CsvRowStream(csv, HEADERS))
+        assert rows[0]["header1"] == "col1_val1"
+        assert rows[1]["header3"] == "col3_val2"
+
+
+def test_csv_row_stream_regroup_replaces_rows_and_keeps_progress(runner):
+    with runner.isolated_filesystem():
+        with open("test_csv.csv", "w") as csv:
+            csv.writelines(HEADERED_CSV)
+        with open("test_csv.csv") as csv:
+            stream = CsvRowStream(csv, HEADERS)
+            regrouped = stream.regroup(lambda rows: [[row["header1"] for row in rows]])
+            assert regrouped is stream
+            assert list(stream) == [["col1_val1", "col1_val2"]]
+            assert stream.position == stream.size
+
+
+def test_csv_row_stream_when_missing_headers_raises_on_creation(runner):
+    with runner.isolated_filesystem():
+        with open("test_csv.csv", "w") as csv:
+            csv.writelines(HEADERED_CSV)
+        with open("test_csv.csv") as csv:
+            with pytest.raises(Code42CLIError):
+                CsvRowStream(csv, HEADERS + ["extra_header"])
+
+
+def test_csv_row_stream_when_no_data_rows_raises_on_creation(runner):
+    with runner.isolated_filesystem():
+        with open("test_csv.csv", "w") as csv:
+            csv.write("header1,header2,header3\n")
+        with open("test_csv.csv") as csv:
+            with pytest.raises(Code42CLIError) as err:
+                CsvRowStream(csv, HEADERS)
+        assert err.value.message == "CSV contains no data rows."
+
+
+def test_flat_file_row_stream_skips_header_comment_and_strips_rows(runner):
+    with runner.isolated_filesystem():
+        with open("test.txt", "w") as file:
+            file.write("# users\n user1 \nuser2\n")
+        with open("test.txt") as file:
+            assert list(FlatFileRowStream(file)) == ["user1", "user2"]
+
+
+def test_flat_file_row_stream_when_no_header_comment_includes_first_row(runner):
+    with runner.isolated_filesystem():
+        with open("test.txt", "w") as file:
+            file.write("user1\nuser2\n")
+        with open("test.txt") as file:
+            assert list(FlatFileRowStream(file)) == ["user1", "user2"]
+
+
+def _get_csv_rows_arg_value(runner, mocker, threshold, **kwargs):
+    mocker.patch("code42cli.file_readers.STREAMING_THRESHOLD_BYTES", threshold)
+    received = []
+
+    @click.command()
+    @read_csv_arg(HEADERS, **kwargs)
+    def command(csv_rows):
+        received.append(csv_rows)
+
+    with runner.isolated_filesystem():
+        with open("test_csv.csv", "w") as csv:
+            csv.writelines(HEADERED_CSV)
+        result = runner.invoke(command, ["test_csv.csv"])
+    assert result.exit_code == 0
+    return received[0]
+
+
+def test_read_csv_arg_when_file_is_small_reads_list(runner, mocker):
+    assert isinstance(_get_csv_rows_arg_value(runner, mocker, 1024), list)
+
+
+def test_read_csv_arg_when_file_is_larger_than_threshold_streams_rows(runner, mocker):
+    assert isinstance(_get_csv_rows_arg_value(runner, mocker, 10), CsvRowStream)
+
+
+def test_read_csv_arg_when_stream_is_false_reads_list(runner, mocker):
+    value = _get_csv_rows_arg_value(runner, mocker, 10, stream=False)
+    assert isinstance(value, list)
+
+
+def test_read_flat_file_arg_when_file_is_larger_than_threshold_streams_rows(
+    runner, mocker
+):
+    mocker.patch("code42cli.file_readers.STREAMING_THRESHOLD_BYTES", 10)
+    received = []
+
+    @click.command()
+    @read_flat_file_arg
+    def command(file_rows):
+        received.append(list(file_rows))
+
+    with runner.isolated_filesystem():
+        with open("test.txt", "w") as file:
+            file.write("# users\nuser1\nuser2\nuser3\n")
+        runner.invoke(command, ["test.txt"])
+    assert received == [["user1", "user2", "user3"]]
@@ -0,0 +1,124 @@
+import json
+from collections import OrderedDict
+from datetime import datetime
+
+import pytest
+
+import code42cli.json_backend as json_backend
+
+TEST_EVENT = OrderedDict(
+    [
+        ("eventId", "0_1d71796f-af5b-4231-9d8e-df6434da4663_912339407325443353_0"),
+        ("fileName", "résumé 😀.docx"),
+        ("filePath", "C:/Users/test\\Documents/"),
+        ("fileSize", 346),
+        ("riskScore", 1.5),
+        ("exposure", ["RemovableMedia", "ApplicationRead"]),
+        ("outsideActiveHours", False),
+        ("syncDestination", None),
+        ("control", "\x00\x1f\x7f\t\n\"'"),
+    ]
+)
+
+
+@pytest.fixture(params=json_backend.get_available_backends())
+def backend(request):
+    previous = json_backend.get_backend()
+    json_backend.set_backend(request.param)
+    yield request.param
+    json_backend.set_backend(previous)
+
+
+def _without_whitespace(text):
+    return json.dumps(json.loads(text), separators=(",", ":"))
+
+
+def test_get_available_backends_always_includes_stdlib_last():
+    assert json_backend.get_available_backends()[-1] == json_backend.STDLIB
+
+
+def test_set_backend_when_not_installed_raises_value_error(mocker):
+    mocker.patch.dict(json_backend._available, {json_backend.UJSON: False})
+    with pytest.raises(ValueError):
+        json_backend.set_backend(json_backend.UJSON)
+
+
+def test_set_backend_when_none_uses_fastest_available_backend(backend):
+    json_backend.set_backend()
+    assert json_backend.get_backend() == json_backend.get_available_backends()[0]
+
+
+def test_dumps_produces_same_json_as_stdlib(backend):
+    expected = json.dumps(TEST_EVENT, separators=(",", ":"))
+    assert _without_whitespace(json_backend.dumps(TEST_EVENT)) == expected
+
+
+def test_dumps_escapes_non_ascii_characters_like_stdlib(backend):
+    result = json_backend.dumps(TEST_EVENT)
+    assert result.isascii()
+    assert "\\u00e9" in result
+    assert "\\ud83d\\ude00" in result
+    assert "\\u007f" in result
+
+
+def test_dumps_keeps_key_order(backend):
+    data = OrderedDict([("b", 1), ("a", 2), ("c", 3)])
+    assert list(json.loads(json_backend.dumps(data))) == ["b", "a", "c"]
+
+
+def test_dumps_when_sort_keys_sorts_keys(backend):
+    data = OrderedDict([("b", 1), ("a", 2), ("c", 3)])
+    result = json_backend.dumps(data, sort_keys=True)
+    assert list(json.loads(result)) == ["a", "b", "c"]
+
+
+def test_dumps_when_indent_matches_stdlib(backend):
+    assert json_backend.dumps(TEST_EVENT, indent=4) == json.dumps(TEST_EVENT, indent=4)
+
+
+def test_dumps_when_value_too_large_for_backend_falls_back_to_stdlib(backend):
+    data = {"id": 2 ** 70}
+    assert json.loads(json_backend.dumps(data)) == data
+
+
+def test_dumps_uses_default_for_unsupported_types(backend):
+    data = {"value": {1, 2}}
+    assert json.loads(json_backend.dumps(data, default=sorted)) == {"value": [1, 2]}
+
+
+def test_loads_returns_same_value_as_stdlib(backend):
+    text = json.dumps(TEST_EVENT)
+    assert json_backend.loads(text) == json.loads(text)
+
+
+def test_loads_when_invalid_json_raises_value_error(backend):
+    with pytest.raises(ValueError):
+        json_backend.loads("{not json")
+
+
+def test_dumps_canonical_produces_same_json_as_compact_sorted_stdlib(backend):
+    expected = json.dumps(TEST_EVENT, sort_keys=True, separators=(",", ":"))
+    assert json_backend.dumps_canonical(TEST_EVENT) == expected
+
+
+@pytest.mark.parametrize(
+    "value", [1e-05, 2.5e-07, 0.0001, 1e16, 1.5e300, 123456789.125, -0.0, 5e-324]
+)
+def test_dumps_canonical_serializes_floats_like_stdlib(backend, value):
+    obj = {"nested": [{"value": value, "name": "test"}]}
+    expected = json.dumps(obj, sort_keys=True, separators=(",", ":"))
+    assert json_backend.dumps_canonical(obj) == expected
+
+
+def test_dumps_canonical_when_keys_are_not_str_produces_same_json_as_stdlib(backend):
+    obj = {2: "two", 10: "ten"}
+    expected = json.dumps(obj, sort_keys=True, separators=(",", ":"))
+    assert json_backend.dumps_canonical(obj) == expected
+
+
+def test_dumps_canonical_when_values_are_not_json_serializes_them_as_str(backend):
+    row = {"guid": "123", "purge_date": datetime(2020, 1, 2, 3, 4, 5)}
+    assert (
+        json_backend.dumps_canonical(row)
+        == '{"guid":"123","purge_date":"2020-01-02 03:04:05"}'
+    )
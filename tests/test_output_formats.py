@@ -316,6 +316,43 @@ class TestOutputFormatter:
             pass
         mock_to_table.assert_called_once_with("TEST", None)
 
+    def test_echo_formatted_stream_when_few_items_echoes_without_pager(self, mocker):
+        echo_via_pager = mocker.patch("click.echo_via_pager")
+        echo = mocker.patch("click.echo")
+        formatter = output_formats_module.OutputFormatter(
+            output_formats_module.OutputFormat.RAW
+        )
+        formatter.echo_formatted_stream(iter([{"a": 1}, {"a": 2}]))
+        assert not echo_via_pager.call_count
+        assert echo.call_count == 2
+
+    def test_echo_formatted_stream_when_many_items_pages_them_lazily(self, mocker):
+        echo_via_pager = mocker.patch("click.echo_via_pager")
+        formatter = output_formats_module.OutputFormatter(
+            output_formats_module.OutputFormat.RAW
+        )
+        consumed = []
+
+        def items():
+            for i in range(20):
+                consumed.append(i)
+                yield {"a": i}
+
+        formatter.echo_formatted_stream(items())
+        # Only enough items to decide whether to page are read before paging starts.
+        assert len(consumed) == output_formats_module.OUTPUT_VIA_PAGER_THRESHOLD + 1
+        assert len(list(echo_via_pager.call_args[0][0])) == 20
+
+    def test_echo_formatted_stream_when_table_format_formats_whole_list(
+        self, mocker, mock_to_table
+    ):
+        mocker.patch("click.echo")
+        formatter = output_formats_module.OutputFormatter(
+            output_formats_module.OutputFormat.TABLE
+        )
+        formatter.echo_formatted_stream(iter([{"a": 1}, {"a": 2}]))
+        mock_to_table.assert_called_once_with([{"a": 1}, {"a": 2}], None)
+
 
 class TestFileEventsOutputFormatter:
     def test_init_sets_format_func_to_dynamic_csv_function_when_csv_option_is_passed(
@@ -69,6 +69,34 @@ class TestCode42Profile:
         mock_profile = create_mock_profile()
         assert mock_profile.ignore_ssl_errors
 
+    def test_bulk_workers_when_not_set_returns_none(self):
+        mock_profile = create_mock_profile()
+        assert mock_profile.bulk_workers is None
+
+    def test_bulk_workers_returns_expected_value(self):
+        mock_profile = create_mock_profile()
+        mock_profile._profile[ConfigAccessor.BULK_WORKERS_KEY] = "10"
+        assert mock_profile.bulk_workers == "10"
+
+    def test_rate_limit_when_not_set_returns_none(self):
+        mock_profile = create_mock_profile()
+        assert mock_profile.rate_limit is None
+        assert mock_profile.rate_limit_burst is None
+
+    def test_rate_limit_returns_expected_values(self):
+        mock_profile = create_mock_profile()
+        mock_profile._profile[ConfigAccessor.RATE_LIMIT_KEY] = "2.5"
+        mock_profile._profile[ConfigAccessor.RATE_LIMIT_BURST_KEY] = "5"
+        assert mock_profile.rate_limit == 2.5
+        assert mock_profile.rate_limit_burst == 5
+
+    def test_rate_limit_when_zero_returns_none(self):
+        mock_profile = create_mock_profile()
+        mock_profile._profile[ConfigAccessor.RATE_LIMIT_KEY] = "0"
+        mock_profile._profile[ConfigAccessor.RATE_LIMIT_BURST_KEY] = "0"
+        assert mock_profile.rate_limit is None
+        assert mock_profile.rate_limit_burst is None
+
 
 def test_get_profile_returns_expected_profile(config_accessor):
     mock_section = MockSection("testprofilename")
@@ -0,0 +1,67 @@
+import time
+from threading import Thread
+
+import pytest
+from requests import PreparedRequest
+from requests.adapters import HTTPAdapter
+
+from code42cli.rate_limiter import RateLimitedHTTPAdapter
+from code42cli.rate_limiter import TokenBucket
+
+
+class TestTokenBucket:
+    def test_init_when_rate_is_not_positive_raises_value_error(self):
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+    def test_burst_defaults_to_one_seconds_worth_of_tokens(self):
+        assert TokenBucket(2.5).burst == 3
+        assert TokenBucket(0.5).burst == 1
+
+    def test_acquire_within_burst_does_not_wait(self):
+        bucket = TokenBucket(1, burst=5)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        assert time.monotonic() - start < 0.1
+
+    def test_acquire_beyond_burst_waits_for_tokens_to_refill(self):
+        bucket = TokenBucket(20, burst=1)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        # The first token is available immediately, the other four refill at 20 per second.
+        assert time.monotonic() - start >= 0.18
+
+    def test_acquire_limits_rate_across_threads(self):
+        bucket = TokenBucket(50, burst=1)
+
+        def acquire_many():
+            for _ in range(5):
+                bucket.acquire()
+
+        threads = [Thread(target=acquire_many) for _ in range(4)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # 20 acquisitions with a burst of 1 at 50 per second take at least 19 / 50 seconds.
+        assert time.monotonic() - start >= 0.36
+
+
+class TestRateLimitedHTTPAdapter:
+    def test_send_acquires_token_before_sending(self, mocker):
+        send = mocker.patch.object(HTTPAdapter, "send")
+        bucket = mocker.MagicMock(spec=TokenBucket)
+        adapter = RateLimitedHTTPAdapter(bucket)
+        request = PreparedRequest()
+        adapter.send(request)
+        bucket.acquire.assert_called_once_with()
+        send.assert_called_once_with(request)
+
+    def test_send_when_no_rate_limiter_sends(self, mocker):
+        send = mocker.patch.object(HTTPAdapter, "send")
+        adapter = RateLimitedHTTPAdapter()
+        adapter.send(PreparedRequest())
+        assert send.call_count == 1
@@ -0,0 +1,92 @@
+import io
+import json
+
+import pytest
+from pandas import DataFrame
+
+from code42cli.result_sinks import create_result_sink
+from code42cli.result_sinks import CsvResultSink
+from code42cli.result_sinks import JsonLinesResultSink
+from code42cli.result_sinks import ListResultSink
+from code42cli.result_sinks import ResultSink
+from code42cli.result_sinks import to_records
+
+
+class NamedStringIO(io.StringIO):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+
+def test_list_result_sink_keeps_results_until_reset():
+    sink = ListResultSink()
+    sink.write("a")
+    sink.write("b")
+    assert sink.results == ["a", "b"]
+    sink.reset()
+    assert sink.results == []
+
+
+def test_json_lines_result_sink_writes_a_line_per_record():
+    file = io.StringIO()
+    sink = JsonLinesResultSink(file)
+    sink.write({"guid": "1"})
+    sink.write([{"guid": "2"}, {"guid": "3"}])
+    lines = file.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"guid": "1"},
+        {"guid": "2"},
+        {"guid": "3"},
+    ]
+    assert sink.results is None
+
+
+def test_csv_result_sink_writes_header_once_from_first_record():
+    file = io.StringIO()
+    sink = CsvResultSink(file)
+    sink.write({"guid": "1", "deactivated": "True"})
+    sink.write({"guid": "2", "deactivated": "False", "extra": "ignored"})
+    assert file.getvalue().splitlines() == [
+        "guid,deactivated",
+        "1,True",
+        "2,False",
+    ]
+
+
+def test_result_sink_without_write_cannot_be_created():
+    class IncompleteResultSink(ResultSink):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteResultSink()
+
+
+def test_to_records_when_given_dataframe_converts_nan_to_none():
+    df = DataFrame.from_records([{"guid": "1", "name": float("nan")}])
+    assert to_records(df) == [{"guid": "1", "name": None}]
+
+
+def test_to_records_when_given_none_returns_empty_list():
+    assert to_records(None) == []
+
+
+def test_create_result_sink_when_file_name_ends_in_csv_creates_csv_sink():
+    assert isinstance(create_result_sink(NamedStringIO("out.CSV")), CsvResultSink)
+
+
+def test_create_result_sink_when_file_is_stdout_creates_json_lines_sink():
+    sink = create_result_sink(NamedStringIO("<stdout>"))
+    assert isinstance(sink, JsonLinesResultSink)
+
+
+def test_file_result_sinks_when_file_is_stdout_write_to_stdout():
+    stdout = NamedStringIO("<stdout>")
+    assert JsonLinesResultSink(stdout).writes_to_stdout
+    assert CsvResultSink(stdout).writes_to_stdout
+
+
+def test_file_result_sinks_when_file_is_not_stdout_do_not_write_to_stdout():
+    file = NamedStringIO("results.csv")
+    assert not JsonLinesResultSink(file).writes_to_stdout
+    assert not CsvResultSink(file).writes_to_stdout
+    assert not ListResultSink().writes_to_stdout
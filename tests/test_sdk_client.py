@@ -15,7 +15,10 @@ from code42cli.errors import Code42CLIError
 from code42cli.errors import LoggedCLIError
 from code42cli.main import cli
 from code42cli.options import CLIState
+from code42cli.rate_limiter import RateLimitedHTTPAdapter
 from code42cli.sdk_client import create_sdk
+from code42cli.sdk_client import ensure_max_connections
+from code42cli.sdk_client import set_rate_limit
 
 
 @pytest.fixture
@@ -158,3 +161,45 @@ def test_totp_option_when_passed_is_passed_to_sdk_initialization(
     mock_py42.assert_called_once_with(
         profile.authority_url, profile.username, "password", totp=totp
     )
+
+
+def test_ensure_max_connections_when_more_than_current_mounts_larger_pool(mocker):
+    mocker.patch("code42cli.sdk_client._max_connections", 4)
+    mock_session = mocker.patch("py42.services._connection.ROOT_SESSION")
+    ensure_max_connections(20)
+    adapter = mock_session.mount.call_args[0][1]
+    assert adapter._pool_maxsize == 20
+    assert isinstance(adapter, RateLimitedHTTPAdapter)
+    assert mock_session.mount.call_count == 2
+
+
+def test_ensure_max_connections_when_not_more_than_current_does_nothing(mocker):
+    mocker.patch("code42cli.sdk_client._max_connections", 20)
+    mock_session = mocker.patch("py42.services._connection.ROOT_SESSION")
+    ensure_max_connections(10)
+    assert not mock_session.mount.call_count
+
+
+def test_set_rate_limit_mounts_adapter_with_token_bucket(mocker):
+    mocker.patch("code42cli.sdk_client._rate_limiter", None)
+    mock_session = mocker.patch("py42.services._connection.ROOT_SESSION")
+    set_rate_limit(5, 10)
+    adapter = mock_session.mount.call_args[0][1]
+    assert adapter.rate_limiter.rate == 5
+    assert adapter.rate_limiter.burst == 10
+
+
+def test_set_rate_limit_when_none_and_not_limited_does_nothing(mocker):
+    mocker.patch("code42cli.sdk_client._rate_limiter", None)
+    mock_session = mocker.patch("py42.services._connection.ROOT_SESSION")
+    set_rate_limit(None)
+    assert not mock_session.mount.call_count
+
+
+def test_create_sdk_applies_profile_rate_limit(
+    mock_sdk_factory, mock_profile_with_password, mocker
+):
+    mock_set_rate_limit = mocker.patch("code42cli.sdk_client.set_rate_limit")
+    mock_profile_with_password._profile["rate-limit"] = "3"
+    create_sdk(mock_profile_with_password, False)
+    mock_set_rate_limit.assert_called_once_with(3.0, None)
@@ -0,0 +1,68 @@
+import pytest
+
+from code42cli.user_cache import UserCache
+
+USERS = [
+    {"username": "Test.User@example.com", "userUid": "123"},
+    {"username": "other@example.com", "userUid": "456"},
+]
+
+
+@pytest.fixture
+def user_cache(tmp_path):
+    cache = UserCache(str(tmp_path / "users.db"))
+    yield cache
+    cache.close()
+
+
+def test_get_user_id_when_user_not_cached_returns_none(user_cache):
+    assert user_cache.get_user_id("test.user@example.com") is None
+
+
+def test_get_user_id_after_add_users_returns_uid_ignoring_case(user_cache):
+    user_cache.add_users(USERS)
+    assert user_cache.get_user_id("test.user@EXAMPLE.com") == "123"
+
+
+def test_get_user_id_when_user_expired_returns_none(tmp_path):
+    user_cache = UserCache(str(tmp_path / "users.db"), ttl=-1)
+    user_cache.add_users(USERS)
+    assert user_cache.get_user_id("other@example.com") is None
+    user_cache.close()
+
+
+def test_get_all_users_when_never_fully_refreshed_returns_none(user_cache):
+    user_cache.add_users(USERS)
+    assert user_cache.get_all_users() is None
+
+
+def test_get_all_users_after_replace_all_returns_users(user_cache):
+    user_cache.add_users([{"username": "removed@example.com", "userUid": "789"}])
+    user_cache.replace_all(USERS)
+    assert user_cache.get_all_users() == USERS
+    assert user_cache.last_full_refresh is not None
+
+
+def test_get_all_users_when_full_refresh_expired_returns_none(tmp_path):
+    user_cache = UserCache(str(tmp_path / "users.db"), ttl=-1)
+    user_cache.replace_all(USERS)
+    assert user_cache.get_all_users() is None
+    user_cache.close()
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "users.db")
+    first = UserCache(path)
+    first.replace_all(USERS)
+    first.close()
+    second = UserCache(path)
+    assert second.get_user_id("other@example.com") == "456"
+    assert second.get_all_users() == USERS
+    second.close()
+
+
+def test_clear_removes_users_and_full_refresh_time(user_cache):
+    user_cache.replace_all(USERS)
+    user_cache.clear()
+    assert user_cache.count() == 0
+    assert user_cache.last_full_refresh is None
@@ -1,11 +1,18 @@
+from collections import OrderedDict
+
 import pytest
 
+import code42cli.json_backend as json_backend
 from code42cli import PRODUCT_NAME
 from code42cli.util import _PADDING_SIZE
 from code42cli.util import does_user_agree
+from code42cli.util import EVENT_HASH_VERSION_PREFIX
 from code42cli.util import find_format_width
 from code42cli.util import format_string_list_to_columns
 from code42cli.util import get_url_parts
+from code42cli.util import hash_event
+from code42cli.util import hash_event_v1
+from code42cli.util import is_current_event_hash
 
 TEST_HEADER = {"key1": "Column 1", "key2": "Column 10", "key3": "Column 100"}
 
@@ -170,3 +177,70 @@ def test_url_parts():
     server, port = get_url_parts("127.0.0.1")
     assert server == "127.0.0.1"
     assert port is None
+
+
+TEST_EVENT = OrderedDict(
+    [
+        ("type$", "audit_log::logged_in/1"),
+        ("actorName", "tëster@example.com"),
+        ("timestamp", "2020-01-01T12:00:00.000Z"),
+        ("count", 2 ** 70),
+        ("query", {"groups": [{"term": "md5", "value": None}]}),
+    ]
+)
+
+
+@pytest.fixture(params=json_backend.get_available_backends())
+def json_backend_name(request):
+    previous = json_backend.get_backend()
+    json_backend.set_backend(request.param)
+    yield request.param
+    json_backend.set_backend(previous)
+
+
+def test_hash_event_returns_versioned_hash():
+    event_hash = hash_event(TEST_EVENT)
+    assert event_hash.startswith(EVENT_HASH_VERSION_PREFIX)
+    assert len(event_hash) == len(EVENT_HASH_VERSION_PREFIX) + 32
+
+
+def test_hash_event_does_not_depend_on_key_order():
+    reordered = OrderedDict(reversed(list(TEST_EVENT.items())))
+    assert hash_event(reordered) == hash_event(TEST_EVENT)
+
+
+def test_hash_event_when_events_differ_returns_different_hashes():
+    other = dict(TEST_EVENT, timestamp="2020-01-01T12:00:00.001Z")
+    assert hash_event(other) != hash_event(TEST_EVENT)
+
+
+def test_hash_event_returns_same_hash_with_each_json_backend(json_backend_name):
+    json_backend.set_backend(json_backend.STDLIB)
+    expected = hash_event(TEST_EVENT)
+    json_backend.set_backend(json_backend_name)
+    assert hash_event(TEST_EVENT) == expected
+
+
+def test_hash_event_when_event_has_exponent_floats_returns_same_hash_with_each_json_backend(
+    json_backend_name,
+):
+    event = dict(TEST_EVENT, riskScore=1e-05, fileSize=1e16)
+    json_backend.set_backend(json_backend.STDLIB)
+    expected = hash_event(event)
+    json_backend.set_backend(json_backend_name)
+    assert hash_event(event) == expected
+
+
+def test_hash_event_when_given_str_hashes_it():
+    assert hash_event("row") == hash_event("row")
+    assert hash_event("row") != hash_event("other row")
+
+
+def test_hash_event_v1_returns_legacy_md5_hash():
+    event = {"b": 1, "a": "test"}
+    assert hash_event_v1(event) == "6ba02d9523709446cc9b5c186ae0aecf"
+
+
+def test_is_current_event_hash():
+    assert is_current_event_hash(hash_event(TEST_EVENT))
+    assert not is_current_event_hash(hash_event_v1(TEST_EVENT))
@@ -1,15 +1,203 @@
 import time
+from email.utils import formatdate
 
+import pytest
+from py42.exceptions import Py42HTTPError
+from requests import HTTPError
+from requests import Response
+from requests.exceptions import ConnectionError
+
+from code42cli.errors import Code42CLIError
+from code42cli.errors import PartialFailureError
+from code42cli.result_sinks import ResultSink
+from code42cli.worker import AdaptiveConcurrency
+from code42cli.worker import LatencyHistogram
+from code42cli.worker import RetryPolicy
 from code42cli.worker import Worker
 from code42cli.worker import WorkerStats
 
 
+def create_http_error(mocker, status_code, headers=None):
+    response = mocker.MagicMock(spec=Response)
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.request = mocker.MagicMock()
+    error = mocker.MagicMock(spec=HTTPError)
+    error.response = response
+    return Py42HTTPError(error)
+
+
 class TestWorkerStats:
     def test_successes_when_should_be_negative_returns_zero(self):
         stats = WorkerStats(100)
         stats._total_errors = 101
         assert not stats.total_successes
 
+    def test_separate_instances_do_not_share_counters_or_results(self):
+        stats_a = WorkerStats(10)
+        stats_b = WorkerStats(10)
+        stats_a.increment_total_processed()
+        stats_a.increment_total_errors()
+        stats_a.add_result("result")
+        assert stats_b.total_processed == 0
+        assert stats_b.total_errors == 0
+        assert stats_b.results == []
+
+    def test_add_result_when_none_does_not_store_result(self):
+        stats = WorkerStats(1)
+        stats.add_result(None)
+        assert stats.results == []
+
+    def test_add_result_writes_to_result_sink(self, mocker):
+        sink = mocker.MagicMock(spec=ResultSink)
+        stats = WorkerStats(1, result_sink=sink)
+        stats.add_result({"a": 1})
+        sink.write.assert_called_once_with({"a": 1})
+
+    def test_record_error_counts_errors_by_type_and_status(self, mocker):
+        stats = WorkerStats(3)
+        stats.record_error(create_http_error(mocker, 429))
+        stats.record_error(create_http_error(mocker, 429))
+        stats.record_error(Code42CLIError("bad row"))
+        result = stats.to_dict()
+        assert stats.total_errors == 3
+        assert result["errors_by_type"] == {"Py42HTTPError": 2, "Code42CLIError": 1}
+        assert result["errors_by_status"] == {"429": 2}
+
+    def test_record_latency_tracks_throughput_and_completions_per_second(self):
+        stats = WorkerStats(2)
+        stats.record_latency(0.5)
+        stats.record_latency(0.5)
+        result = stats.to_dict()
+        assert result["latency_seconds"]["count"] == 2
+        assert result["elapsed_seconds"] >= 0.5
+        assert 0 < result["throughput_per_second"] <= 4
+        assert result["completed_per_second"] == [{"second": 0, "completed": 2}]
+
+    def test_describe_performance_when_no_tasks_completed_returns_empty_str(self):
+        assert WorkerStats(1).describe_performance() == ""
+
+    def test_describe_performance_includes_percentiles_and_throughput(self):
+        stats = WorkerStats(1)
+        stats.record_latency(0.2)
+        description = stats.describe_performance()
+        assert "p50 0.20s" in description
+        assert "p99 0.20s" in description
+        assert "/s" in description
+
+
+class TestLatencyHistogram:
+    def test_percentile_when_empty_returns_none(self):
+        assert LatencyHistogram().percentile(50) is None
+
+    def test_percentile_estimates_within_ten_percent(self):
+        histogram = LatencyHistogram()
+        for i in range(1, 101):
+            histogram.add(i / 100)
+        assert histogram.percentile(50) == pytest.approx(0.5, rel=0.1)
+        assert histogram.percentile(95) == pytest.approx(0.95, rel=0.1)
+        assert histogram.percentile(99) == pytest.approx(0.99, rel=0.1)
+
+    def test_percentile_never_exceeds_max(self):
+        histogram = LatencyHistogram()
+        histogram.add(0.0123)
+        assert histogram.percentile(99) == 0.0123
+
+    def test_to_dict_includes_bucket_counts(self):
+        histogram = LatencyHistogram()
+        histogram.add(0.0001)
+        histogram.add(0.0002)
+        histogram.add(1)
+        result = histogram.to_dict()
+        assert result["count"] == 3
+        assert result["max"] == 1
+        assert [bucket["count"] for bucket in result["buckets"]] == [2, 1]
+
+
+class TestRetryPolicy:
+    @pytest.mark.parametrize("status_code", [429, 502, 503, 504])
+    def test_get_delay_when_status_is_retryable_returns_delay_within_backoff(
+        self, mocker, status_code
+    ):
+        policy = RetryPolicy(max_attempts=5, base_delay=2, max_delay=5)
+        err = create_http_error(mocker, status_code)
+        assert 0 <= policy.get_delay(err, 1) <= 2
+        assert 0 <= policy.get_delay(err, 2) <= 4
+        assert 0 <= policy.get_delay(err, 3) <= 5
+
+    @pytest.mark.parametrize("status_code", [400, 401, 404, 500])
+    def test_get_delay_when_status_is_not_retryable_returns_none(
+        self, mocker, status_code
+    ):
+        assert (
+            RetryPolicy().get_delay(create_http_error(mocker, status_code), 1) is None
+        )
+
+    def test_get_delay_when_attempts_exhausted_returns_none(self, mocker):
+        policy = RetryPolicy(max_attempts=2)
+        assert policy.get_delay(create_http_error(mocker, 503), 2) is None
+
+    def test_get_delay_when_connection_error_returns_delay(self):
+        assert RetryPolicy().get_delay(ConnectionError(), 1) is not None
+
+    def test_get_delay_when_error_is_not_http_returns_none(self):
+        assert RetryPolicy().get_delay(ValueError(), 1) is None
+
+    def test_get_delay_when_retry_after_is_seconds_waits_at_least_that_long(
+        self, mocker
+    ):
+        err = create_http_error(mocker, 429, headers={"Retry-After": "7"})
+        assert RetryPolicy(base_delay=1).get_delay(err, 1) == 7
+
+    def test_get_delay_when_retry_after_is_http_date_waits_until_then(self, mocker):
+        retry_at = formatdate(time.time() + 60, usegmt=True)
+        err = create_http_error(mocker, 503, headers={"Retry-After": retry_at})
+        assert 55 <= RetryPolicy(base_delay=1).get_delay(err, 1) <= 61
+
+    def test_get_delay_when_retry_after_is_invalid_uses_backoff(self, mocker):
+        err = create_http_error(mocker, 503, headers={"Retry-After": "soon"})
+        assert 0 <= RetryPolicy(base_delay=1).get_delay(err, 1) <= 1
+
+
+class TestAdaptiveConcurrency:
+    def _complete(self, concurrency, count, latency, throttled=False):
+        for _ in range(count):
+            concurrency.acquire()
+            concurrency.release(latency, throttled=throttled)
+
+    def test_limit_starts_at_initial(self):
+        assert AdaptiveConcurrency(10, initial=3).limit == 3
+
+    def test_limit_when_initial_exceeds_maximum_starts_at_maximum(self):
+        assert AdaptiveConcurrency(2, initial=3).limit == 2
+
+    def test_limit_increases_while_latency_stays_flat(self):
+        concurrency = AdaptiveConcurrency(10, initial=2, window=5)
+        self._complete(concurrency, 15, 0.1)
+        assert concurrency.limit == 5
+
+    def test_limit_does_not_exceed_maximum(self):
+        concurrency = AdaptiveConcurrency(3, initial=2, window=5)
+        self._complete(concurrency, 50, 0.1)
+        assert concurrency.limit == 3
+
+    def test_limit_decreases_when_latency_rises(self):
+        concurrency = AdaptiveConcurrency(10, initial=2, window=5)
+        self._complete(concurrency, 10, 0.1)
+        assert concurrency.limit == 4
+        self._complete(concurrency, 5, 1.0)
+        assert concurrency.limit == 3
+
+    def test_limit_halves_when_throttled(self):
+        concurrency = AdaptiveConcurrency(10, initial=8)
+        self._complete(concurrency, 1, 0.1, throttled=True)
+        assert concurrency.limit == 4
+
+    def test_limit_never_drops_below_one(self):
+        concurrency = AdaptiveConcurrency(10, initial=1)
+        self._complete(concurrency, 3, 0.1, throttled=True)
+        assert concurrency.limit == 1
+
 
 class TestWorker:
     def test_is_async(self):
@@ -25,3 +213,254 @@ class TestWorker:
         demo_ls.append(1)
         worker.wait()
         assert demo_ls == [1, 2]
+
+    def test_wait_when_no_tasks_returns_immediately(self):
+        worker = Worker(5, 0)
+        start = time.perf_counter()
+        worker.wait()
+        assert time.perf_counter() - start < 0.1
+
+    def test_wait_returns_as_soon_as_last_task_completes(self):
+        # Benchmarks the per-process overhead of waiting on a small bulk job, which previously
+        # polled every 0.5 seconds.
+        worker = Worker(5, 10)
+        start = time.perf_counter()
+        for _ in range(10):
+            worker.do_async(lambda: time.sleep(0.01))
+        worker.wait()
+        elapsed = time.perf_counter() - start
+        assert worker.stats.total_processed == 10
+        assert elapsed < 0.25
+
+    def test_wait_when_task_raises_still_returns(self):
+        worker = Worker(2, 1)
+
+        def raise_error():
+            raise Exception()
+
+        worker.do_async(raise_error)
+        worker.wait()
+        assert worker.stats.total_errors == 1
+        assert worker.stats.total_processed == 1
+
+    def test_shutdown_stops_worker_threads(self):
+        worker = Worker(3, 2)
+        worker.do_async(lambda: None)
+        worker.do_async(lambda: None)
+        threads = list(worker._threads)
+        worker.shutdown()
+        assert len(threads) == 3
+        assert not any(thread.is_alive() for thread in threads)
+        assert worker.stats.total_processed == 2
+
+    def test_do_async_after_shutdown_restarts_threads(self):
+        worker = Worker(2, 2)
+        results = []
+        worker.do_async(lambda: results.append(1))
+        worker.shutdown()
+        worker.do_async(lambda: results.append(2))
+        worker.wait()
+        worker.shutdown()
+        assert results == [1, 2]
+
+    def test_context_manager_shuts_down_threads(self):
+        with Worker(2, 1) as worker:
+            worker.do_async(lambda: None)
+            threads = list(worker._threads)
+        assert not any(thread.is_alive() for thread in threads)
+
+    def test_adaptive_worker_lowers_concurrency_when_server_throttles(self, mocker):
+        worker = Worker(8, 1, adaptive=True)
+        worker._concurrency._limit = 8
+        error = create_http_error(mocker, 429)
+
+        def throttled_func():
+            raise error
+
+        worker.do_async(throttled_func)
+        worker.wait()
+        assert worker._concurrency.limit == 4
+        assert worker.stats.total_errors == 1
+
+    def test_adaptive_worker_when_server_error_is_not_throttling_keeps_concurrency(
+        self, mocker
+    ):
+        worker = Worker(8, 1, adaptive=True)
+        worker._concurrency._limit = 8
+        error = create_http_error(mocker, 500)
+
+        def failing_func():
+            raise error
+
+        worker.do_async(failing_func)
+        worker.wait()
+        assert worker._concurrency.limit == 8
+
+    def test_adaptive_worker_processes_all_tasks(self):
+        worker = Worker(4, 20, adaptive=True)
+        results = []
+        for i in range(20):
+            worker.do_async(results.append, i)
+        worker.wait()
+        assert sorted(results) == list(range(20))
+
+    def test_do_async_when_queue_is_full_blocks_until_a_task_starts(self):
+        worker = Worker(1, 3, max_queued=1)
+        started = []
+
+        def slow_func(i):
+            started.append(i)
+            time.sleep(0.1)
+
+        worker.do_async(slow_func, 1)
+        time.sleep(0.02)
+        worker.do_async(slow_func, 2)
+        start = time.time()
+        worker.do_async(slow_func, 3)
+        assert time.time() - start >= 0.05
+        worker.wait()
+        assert started == [1, 2, 3]
+
+    def test_do_async_records_latency_of_each_task(self):
+        worker = Worker(2, 3)
+        for _ in range(3):
+            worker.do_async(lambda: time.sleep(0.01))
+        worker.wait()
+        assert worker.stats.latencies.count == 3
+        assert worker.stats.latencies.percentile(50) >= 0.009
+
+    def test_do_async_when_task_fails_with_transient_error_retries_it(self, mocker):
+        worker = Worker(1, 1, retry_policy=RetryPolicy(base_delay=0.01))
+        attempts = []
+        error = create_http_error(mocker, 503)
+
+        def flaky_func():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise error
+            return "done"
+
+        worker.do_async(flaky_func)
+        worker.wait()
+        assert len(attempts) == 3
+        assert worker.stats.total_retries == 2
+        assert worker.stats.total_errors == 0
+        assert worker.stats.total_processed == 1
+        assert worker.stats.results == ["done"]
+        assert worker.stats.to_dict()["retries_by_status"] == {"503": 2}
+
+    def test_do_async_when_retries_exhausted_counts_error_once(self, mocker):
+        worker = Worker(1, 1, retry_policy=RetryPolicy(max_attempts=2, base_delay=0))
+        error = create_http_error(mocker, 429)
+
+        def failing_func():
+            raise error
+
+        worker.do_async(failing_func)
+        worker.wait()
+        assert worker.stats.total_retries == 1
+        assert worker.stats.total_errors == 1
+        assert worker.stats.total_processed == 1
+
+    def test_do_async_task_with_failure_handler_when_retry_succeeds_does_not_call_handler(
+        self, mocker
+    ):
+        worker = Worker(1, 1, retry_policy=RetryPolicy(base_delay=0))
+        on_failure = mocker.MagicMock()
+        attempts = []
+
+        def flaky_func():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise ConnectionError()
+
+        worker.do_async_task(flaky_func, on_failure=on_failure)
+        worker.wait()
+        assert len(attempts) == 2
+        assert not on_failure.call_count
+
+    def test_do_async_task_with_failure_handler_when_retries_exhausted_calls_handler_once(
+        self, mocker
+    ):
+        worker = Worker(1, 1, retry_policy=RetryPolicy(max_attempts=3, base_delay=0))
+        on_failure = mocker.MagicMock()
+        error = create_http_error(mocker, 503)
+
+        def failing_func():
+            raise error
+
+        worker.do_async_task(failing_func, on_failure=on_failure)
+        worker.wait()
+        on_failure.assert_called_once_with(error)
+
+    def test_do_async_task_with_failure_handler_when_handler_raises_keeps_processing(
+        self, mocker
+    ):
+        worker = Worker(1, 2)
+        on_failure = mocker.MagicMock(side_effect=Exception())
+
+        def failing_func():
+            raise Code42CLIError("failed")
+
+        worker.do_async_task(failing_func, on_failure=on_failure)
+        worker.do_async(lambda: "done")
+        worker.wait()
+        assert on_failure.call_count == 1
+        assert worker.stats.results == ["done"]
+        assert worker.stats.total_processed == 2
+
+    def test_do_async_task_counts_task_as_item_count_items(self, mocker):
+        bar = mocker.MagicMock()
+        worker = Worker(1, 5, bar=bar)
+        worker.do_async_task(lambda ids: ids, (["1", "2", "3"],), item_count=3)
+        worker.do_async_task(lambda: None, item_count=2)
+        worker.wait()
+        assert worker.stats.total_processed == 5
+        assert worker.stats.total_successes == 5
+        assert [call[0][0] for call in bar.update.call_args_list] == [3, 2]
+
+    def test_do_async_task_when_task_fails_counts_each_item_as_failed(self, mocker):
+        worker = Worker(1, 3)
+
+        def failing_func():
+            raise Code42CLIError("failed")
+
+        worker.do_async_task(failing_func, item_count=3)
+        worker.wait()
+        assert worker.stats.total_processed == 3
+        assert worker.stats.total_errors == 3
+        assert worker.stats.to_dict()["errors_by_type"] == {"Code42CLIError": 3}
+
+    def test_do_async_task_when_task_partially_fails_counts_only_failed_items(self):
+        worker = Worker(1, 3)
+
+        def partially_failing_func():
+            raise PartialFailureError("1 failed", 1)
+
+        worker.do_async_task(partially_failing_func, item_count=3)
+        worker.wait()
+        assert worker.stats.total_processed == 3
+        assert worker.stats.total_errors == 1
+        assert worker.stats.total_successes == 2
+
+    def test_do_async_when_retry_is_waiting_other_tasks_keep_running(self, mocker):
+        worker = Worker(1, 3)
+        worker._retry_policy = mocker.MagicMock(spec=RetryPolicy)
+        worker._retry_policy.get_delay.side_effect = [0.3, None]
+        completed = []
+        error = create_http_error(mocker, 429)
+
+        def throttled_once():
+            if "retry" not in completed:
+                completed.append("retry")
+                raise error
+            completed.append("throttled")
+
+        worker.do_async(throttled_once)
+        worker.do_async(completed.append, "second")
+        worker.do_async(completed.append, "third")
+        start = time.time()
+        worker.wait()
+        assert time.time() - start >= 0.25
+        assert completed == ["retry", "second", "third", "throttled"]
+        worker.shutdown()
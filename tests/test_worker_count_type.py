@@ -0,0 +1,30 @@
+import pytest
+from click.exceptions import BadParameter
+
+from code42cli.click_ext.types import WorkerCount
+
+
+class TestWorkerCount:
+    wc = WorkerCount()
+
+    def convert(self, val):
+        return self.wc.convert(val, ctx=None, param=None)
+
+    def test_convert_when_given_int_str_returns_int(self):
+        assert self.convert("10") == 10
+
+    def test_convert_when_given_int_returns_int(self):
+        assert self.convert(3) == 3
+
+    @pytest.mark.parametrize("value", ["auto", "AUTO", " Auto "])
+    def test_convert_when_given_auto_returns_auto(self, value):
+        assert self.convert(value) == WorkerCount.AUTO
+
+    @pytest.mark.parametrize("value", ["0", "-1", 0])
+    def test_convert_when_less_than_one_raises_bad_parameter(self, value):
+        with pytest.raises(BadParameter):
+            self.convert(value)
+
+    def test_convert_when_not_int_or_auto_raises_bad_parameter(self):
+        with pytest.raises(BadParameter):
+            self.convert("many")